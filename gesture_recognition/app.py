@@ -25,40 +25,51 @@ Functions:
     # Initializes SportMode for gesture-to-action mapping.
     # Receives video frames from the robot, annotates them, overlays battery status, and writes to shared memory.
     # Detects gesture changes and triggers corresponding robot actions in a separate thread.
+    # In velocity mode, streams hand position and orientation to VelocityMode instead.
 Classes:
 --------
 - SportMode:
     # Manages robot actions mapped to hand gestures.
     # Stores initial robot position and yaw.
     # Provides methods to update initial state and trigger robot movements.
-Global Variables:
------------------
-- robot_state: Stores the latest robot state received from the robot.
-- battery_level: Stores the latest battery level received from the robot.
-Handlers:
----------
-- HighStateHandler(msg):
-    # Updates global robot_state with the latest received message.
-- BmsStateHandler(msg):
-    # Updates global battery_level with the latest received message.
+- VelocityMode:
+    # Maps hand position and orientation to (vx, vy, vyaw) velocity commands.
+    # Sends SportClient.Move at a fixed rate from a RecurrentThread with smoothing, rate limiting and a watchdog.
+    # Measures loop jitter and send latency and reports them periodically.
+- ControlArbiter:
+    # Grants control authority to the wireless controller or to the gestures, with a deadline per grant.
+    # The controller wins over gestures; gestures get control back once the controller hold expires.
+    # Forwards only the commands of the source holding authority to SportClient.
+State Subscribers:
+------------------
+- LatestValueSubscriber("rt/sportmodestate") and LatestValueSubscriber("rt/lowstate"):
+    # Keep only the newest robot state and low-level state, read on demand from the main loop.
+- BatteryLevel(low_state):
+    # Returns the battery state of charge from a LowState_ message, or -1 if none was received yet.
 Main Execution:
 ---------------
 - Checks DEBUG environment variable to select mode.
 - In debug mode, uses the computer's webcam.
 - In normal mode, connects to the robot and starts gesture recognition and control loop.
+- Checks CONTROL_MODE environment variable ("gesture" or "velocity") to select how gestures drive the robot.
 Usage:
 ------
 Run the script directly to start gesture recognition and robot control.
 Set the DEBUG environment variable to use the computer's webcam for testing.
+Set CONTROL_MODE=velocity to steer the robot continuously with the open hand (VELOCITY_RATE_HZ sets the send rate).
+Set SPORT_LEASE=1 to take the sport service lease; it is renewed by the SDK's shared LeaseManager thread.
 """
-from unitreesdk2.unitree_sdk2py.core.channel import ChannelSubscriber, ChannelFactoryInitialize
+from unitreesdk2.unitree_sdk2py.core.channel import LatestValueSubscriber, ChannelSubscriber, ChannelFactoryInitialize
 from unitreesdk2.unitree_sdk2py.idl.default import unitree_go_msg_dds__SportModeState_
-from unitreesdk2.unitree_sdk2py.idl.unitree_go.msg.dds_ import SportModeState_, LowState_, BmsState_
+from unitreesdk2.unitree_sdk2py.idl.unitree_go.msg.dds_ import SportModeState_, LowState_, BmsState_, WirelessController_
 from unitreesdk2.unitree_sdk2py.go2.sport.sport_client import SportClient
 from unitreesdk2.unitree_sdk2py.go2.video.video_client import VideoClient
+from unitreesdk2.unitree_sdk2py.utils.thread import RecurrentThread
+from unitreesdk2.unitree_sdk2py.utils.hz_sample import HZSample
+from unitreesdk2.unitree_sdk2py.utils.wireless_controller import WirelessControllerState
 from hand_reader import HandReader, DogState
 
-import sys, os, time, cv2
+import sys, os, time, cv2, math, enum
 import numpy as np
 import mmap
 import threading
@@ -68,6 +79,27 @@ import threading
 FRAME_PATH = "/stream/frame.raw"
 FRAMESIZE_FILE_PATH = "/stream/framesize.txt"
 
+# Velocity mode
+VELOCITY_RATE_MIN_HZ = 20.0   # Slowest allowed Move rate
+VELOCITY_RATE_MAX_HZ = 50.0   # Fastest allowed Move rate
+VELOCITY_MAX = (0.6, 0.4, 1.0)  # Max (vx [m/s], vy [m/s], vyaw [rad/s])
+VELOCITY_ACCEL = (1.5, 1.0, 3.0)  # Max change per second of (vx, vy, vyaw)
+VELOCITY_SMOOTHING = 0.3      # Exponential smoothing factor for the hand target (0..1, higher is faster)
+VELOCITY_DEADZONE = 0.1       # Normalized hand offset ignored around the image center
+VELOCITY_HAND_TIMEOUT = 0.3   # Seconds without a hand before the watchdog forces zero velocity
+VELOCITY_REPORT_SEC = 5.0     # Seconds between jitter / latency reports
+
+# Sport service lease
+LEASE_WAIT_TIMEOUT = 3.0  # Seconds to wait for the lease before continuing without it
+
+# Control arbitration
+ARBITER_JOYSTICK_HOLD = 3.0    # Seconds the wireless controller keeps authority after its last activity
+ARBITER_GESTURE_HOLD = 1.0     # Seconds a gesture keeps authority after its last decision
+ARBITER_STICK_DEADZONE = 0.05  # Stick deflection below this is not controller activity
+# Controller key -> SportClient method forwarded through the arbiter, e.g. {"F1": "Hello"}.
+# Empty by default: the robot already executes the remote natively, the arbiter only keeps gestures out.
+JOYSTICK_ACTIONS = {}
+
 
 ### DEBUG MODE
 
@@ -144,8 +176,9 @@ class SportMode:
         dog_moves (dict): Mapping of hand gesture states to robot movement methods.
 
     Methods:
-        __init__():
+        __init__(enable_lease=False):
             Initializes the SportMode instance, sets up the sport client, and maps gestures to robot actions.
+            With enable_lease the client holds the sport lease, renewed in the background without a thread of its own.
 
         GetInitState(robot_state: SportModeState_):
             Sets the initial position and yaw of the robot based on the provided robot state.
@@ -153,16 +186,22 @@ class SportMode:
         move_dog(move):
             Executes the corresponding robot movement based on the detected hand gesture, unless the gesture is Zero or Empty.
     """
-    def __init__(self) -> None:
+    def __init__(self, enable_lease: bool = False) -> None:
         # Initial position and yaw
         self.px0 = 0  # Initial x position of the robot
         self.py0 = 0  # Initial y position of the robot
         self.yaw0 = 0  # Initial yaw (rotation) of the robot
 
-        self.client = SportClient()  # Create a sport client for robot control
+        self.client = SportClient(enable_lease)  # Create a sport client for robot control
         self.client.SetTimeout(10.0)  # Set client timeout to 10 seconds
         self.client.Init()  # Initialize the sport client connection
 
+        if enable_lease:  # Commands carry the lease id once it is applied
+            if self.client.WaitLeaseApplied(LEASE_WAIT_TIMEOUT):
+                print(f"Lease applicato, id: {self.client.GetLeaseId()}")
+            else:
+                print("Lease non ancora applicato, continuo senza")
+
         # Map hand gesture states to corresponding robot movement methods
         self.dog_moves = {
             DogState.HandOpen: self.client.Hello,       # Open hand gesture triggers Hello action
@@ -185,24 +224,282 @@ class SportMode:
             self.dog_moves.get(move)()  # Call the mapped movement method
 
 
-# Initialize the global robot_state variable with a default SportModeState_ object
-robot_state = unitree_go_msg_dds__SportModeState_()
+class VelocityMode:
+    """
+    VelocityMode streams continuous velocity commands to the robot based on the open hand.
 
-# Handler function for receiving and updating the robot's high-level state
-def HighStateHandler(msg: SportModeState_):
-    global robot_state  # Declare robot_state as global to modify it
-    robot_state = msg   # Update the global robot_state with the received message
+    The frame loop feeds the latest hand landmarks with update_hand(); a RecurrentThread sends
+    SportClient.Move at a fixed rate, independent of the camera frame rate.
 
-# Initialize the global battery_level variable with a default value
-battery_level = -1
+    Mapping (normalized image coordinates, frame already flipped):
+        - vx: palm height with respect to the image center (hand up moves forward).
+        - vy: palm horizontal offset with respect to the image center (hand right moves right).
+        - vyaw: hand roll, angle of the wrist -> middle finger base vector (tilt right turns right).
+    Only the open hand steers the robot; any other gesture or no hand sets the target to zero.
 
-# Handler function for receiving and updating the robot's battery state
-def BmsStateHandler(msg: LowState_):
-    global battery_level  # Declare battery_level as global to modify it
-    battery_state: BmsState_ = msg.bms_state  # Extract the battery state from the message
-    battery_level = int(battery_state.soc)    # Update battery_level with the state of charge (soc) as an integer
+    Attributes:
+        client (SportClient): Client used to send Move commands.
+        period (float): Send period in seconds.
+        target (list): Raw velocity target computed from the last hand update.
+        smoothed (list): Exponentially smoothed target.
+        command (list): Rate limited command actually sent to the robot.
+        last_hand_time (float): Monotonic time of the last valid hand update (watchdog reference).
 
-def useDogCamera(internet_card):
+    Methods:
+        Start():
+            Starts the fixed rate send thread.
+        Stop():
+            Stops the send thread and sends a final zero velocity command.
+        update_hand(hand_landmarks, dog_state):
+            Computes a new velocity target from the hand landmarks.
+        send_velocity():
+            Thread body: watchdog, smoothing, rate limiting, Move call and timing statistics.
+
+    With an arbiter, hand updates request gesture authority and Move is only sent while the gestures
+    hold it; on losing it a single zero Move is sent and the filters are reset.
+    """
+    def __init__(self, client: SportClient, rate: float = VELOCITY_RATE_MIN_HZ, arbiter=None) -> None:
+        rate = min(max(rate, VELOCITY_RATE_MIN_HZ), VELOCITY_RATE_MAX_HZ)  # Keep the rate in the supported range
+        self.client = client  # Sport client used for Move
+        self.period = 1.0 / rate  # Send period in seconds
+        self.arbiter = arbiter  # Optional ControlArbiter deciding whether the hand may drive
+        self.has_authority = False  # Whether the last tick was allowed to send
+
+        self.lock = threading.Lock()  # Protects target and last_hand_time
+        self.target = [0.0, 0.0, 0.0]  # Raw target from the hand (vx, vy, vyaw)
+        self.last_hand_time = 0.0  # Time of the last valid hand update
+        self.smoothed = [0.0, 0.0, 0.0]  # Smoothed target
+        self.command = [0.0, 0.0, 0.0]  # Command sent to the robot
+
+        # Timing statistics for the current report window
+        self.last_tick = None  # Time of the previous tick
+        self.ticks = 0  # Number of ticks in the window
+        self.jitter_sum = 0.0  # Sum of |tick interval - period|
+        self.jitter_max = 0.0  # Max |tick interval - period|
+        self.latency_sum = 0.0  # Sum of Move call durations
+        self.latency_max = 0.0  # Max Move call duration
+        self.send_errors = 0  # Number of failed Move calls
+        self.report_time = time.perf_counter()  # Start of the report window
+
+        self.thread = RecurrentThread(self.period, target=self.send_velocity, name="velocity_mode")
+
+    def Start(self):
+        self.thread.Start()  # Start sending at the fixed rate
+
+    def Stop(self):
+        self.thread.Wait(self.period * 2)  # Ask the loop to quit
+        self.client.Move(0.0, 0.0, 0.0)  # Final zero command, does not wait for a reply
+        self.client.StopMove()  # Make sure the robot does not keep the last velocity
+
+    def update_hand(self, hand_landmarks, dog_state):
+        # Compute the raw target from the hand; called from the frame loop
+        if (hand_landmarks is None or dog_state != DogState.HandOpen
+                or (self.arbiter is not None and not self.arbiter.Request(ControlSource.Gesture))):
+            with self.lock:
+                self.target = [0.0, 0.0, 0.0]  # Closed hand or other gesture: stop
+            return
+
+        wrist = hand_landmarks[0]  # Wrist landmark
+        middle = hand_landmarks[9]  # Middle finger base (palm center)
+
+        offset_x = middle.x - 0.5  # Horizontal offset from the image center (right is positive)
+        offset_y = 0.5 - middle.y  # Vertical offset from the image center (up is positive)
+        roll = math.atan2(middle.x - wrist.x, wrist.y - middle.y)  # Hand tilt, 0 when the hand points up
+
+        target = [
+            self.__Scale(offset_y * 2.0, VELOCITY_MAX[0]),  # Hand up -> forward
+            -self.__Scale(offset_x * 2.0, VELOCITY_MAX[1]),  # Hand right -> move right (negative y)
+            -self.__Scale(roll / (math.pi / 2.0), VELOCITY_MAX[2]),  # Tilt right -> turn right (negative yaw)
+        ]
+
+        with self.lock:
+            self.target = target
+            self.last_hand_time = time.monotonic()  # Feed the watchdog
+
+    def send_velocity(self):
+        # Fixed rate loop body, runs in the RecurrentThread
+        now = time.perf_counter()
+        if self.last_tick is not None:
+            jitter = abs((now - self.last_tick) - self.period)  # Deviation from the nominal period
+            self.jitter_sum += jitter
+            self.jitter_max = max(self.jitter_max, jitter)
+        self.last_tick = now
+
+        with self.lock:
+            target = self.target
+            hand_age = time.monotonic() - self.last_hand_time
+
+        if self.arbiter is not None and not self.arbiter.Holds(ControlSource.Gesture):
+            if self.has_authority:  # Authority lost: stop once, then stay silent
+                self.has_authority = False
+                self.smoothed = [0.0, 0.0, 0.0]
+                self.command = [0.0, 0.0, 0.0]
+                self.client.Move(0.0, 0.0, 0.0)
+            if now - self.report_time >= VELOCITY_REPORT_SEC:
+                self.__Report(now)
+            return
+        self.has_authority = True
+
+        if hand_age > VELOCITY_HAND_TIMEOUT:  # Watchdog: hand lost or frames stalled
+            target = [0.0, 0.0, 0.0]
+            self.smoothed = [0.0, 0.0, 0.0]  # Do not keep stale momentum in the filter
+
+        for i in range(3):
+            self.smoothed[i] += VELOCITY_SMOOTHING * (target[i] - self.smoothed[i])  # Exponential smoothing
+            step = VELOCITY_ACCEL[i] * self.period  # Max change allowed this tick
+            delta = min(max(self.smoothed[i] - self.command[i], -step), step)  # Rate limiting
+            self.command[i] += delta
+
+        start = time.perf_counter()
+        code = self.client.Move(self.command[0], self.command[1], self.command[2])  # Fire and forget
+        latency = time.perf_counter() - start
+        if code != 0:
+            self.send_errors += 1
+
+        self.ticks += 1
+        self.latency_sum += latency
+        self.latency_max = max(self.latency_max, latency)
+
+        if now - self.report_time >= VELOCITY_REPORT_SEC:
+            self.__Report(now)
+
+    def __Report(self, now):
+        # Print jitter and send latency for the last window, then reset it
+        ticks = max(self.ticks, 1)
+        print(f"[VelocityMode] rate: {self.ticks / (now - self.report_time):.1f} Hz (target {1.0 / self.period:.1f}), "
+              f"jitter avg/max: {self.jitter_sum / ticks * 1000:.2f}/{self.jitter_max * 1000:.2f} ms, "
+              f"send latency avg/max: {self.latency_sum / ticks * 1000:.3f}/{self.latency_max * 1000:.3f} ms, "
+              f"errors: {self.send_errors}, cmd: ({self.command[0]:.2f}, {self.command[1]:.2f}, {self.command[2]:.2f})")
+        lease = self.client.GetLeaseRenewalStats()  # None without a lease
+        if lease is not None and lease["count"]:
+            print(f"[VelocityMode] lease renewals: {lease['count']}, "
+                  f"rtt p50/p99: {lease['p50'] * 1000:.2f}/{lease['p99'] * 1000:.2f} ms")
+        self.ticks = 0
+        self.jitter_sum = self.jitter_max = 0.0
+        self.latency_sum = self.latency_max = 0.0
+        self.send_errors = 0
+        self.report_time = now
+
+    @staticmethod
+    def __Scale(value, limit):
+        # Apply the deadzone to a normalized value in [-1, 1] and scale it to the limit
+        value = min(max(value, -1.0), 1.0)
+        if abs(value) < VELOCITY_DEADZONE:
+            return 0.0
+        value = (abs(value) - VELOCITY_DEADZONE) / (1.0 - VELOCITY_DEADZONE) * math.copysign(1.0, value)
+        return value * limit
+
+
+
+class ControlSource(enum.Enum):
+    Joystick = 0  # Wireless controller (rt/wirelesscontroller)
+    Gesture = 1   # Hand gesture decisions from the frame loop
+
+
+class ControlArbiter:
+    """
+    ControlArbiter decides who controls the robot: the wireless controller or the hand gestures.
+
+    Authority is held by one source until a deadline. Every activity of the holder extends it, the
+    controller (any key held or a stick out of the deadzone) for ARBITER_JOYSTICK_HOLD seconds and a
+    gesture decision for ARBITER_GESTURE_HOLD seconds. The controller takes authority from the gestures
+    at once; the gestures only get it when nobody holds it or the deadline has passed. Every decision is
+    a few comparisons under a lock, O(1) per message.
+
+    Attributes:
+        client (SportClient): Client the winning commands are forwarded to.
+        controller (WirelessControllerState): Latest controller keys and sticks.
+        owner (ControlSource): Source holding authority, None before the first grant.
+        deadline (float): Monotonic time at which the authority of owner expires.
+        handoffs (int): Number of authority changes between sources.
+        meter (HZSample): Controller message rate and decision latency.
+
+    Methods:
+        Start():
+            Subscribes to rt/wirelesscontroller.
+        Request(source):
+            Grants or extends authority for source, returns whether source holds it.
+        Holds(source):
+            Whether source holds authority right now.
+        Forward(source, command, *args):
+            Runs command(*args) in a worker thread if source wins and no command is running.
+    """
+    priority = {ControlSource.Joystick: 1, ControlSource.Gesture: 0}
+    hold = {ControlSource.Joystick: ARBITER_JOYSTICK_HOLD, ControlSource.Gesture: ARBITER_GESTURE_HOLD}
+
+    def __init__(self, client: SportClient, joystick_actions: dict = JOYSTICK_ACTIONS) -> None:
+        self.client = client
+        self.lock = threading.Lock()  # Protects owner and deadline
+        self.owner = None
+        self.deadline = 0.0
+        self.handoffs = 0
+        self.worker = None  # Thread running the last forwarded command
+        self.worker_lock = threading.Lock()  # Makes the busy check and the worker start of Forward atomic
+        self.meter = HZSample()
+
+        self.controller = WirelessControllerState()
+        for key, method in joystick_actions.items():
+            self.controller.OnPressed(key, lambda state, edges, method=method:
+                                      self.Forward(ControlSource.Joystick, getattr(self.client, method)))
+        self.sub = None
+
+    def Start(self):
+        self.sub = ChannelSubscriber("rt/wirelesscontroller", WirelessController_)
+        self.sub.Init(self.__OnController, 10)
+
+    def Request(self, source: ControlSource):
+        # Grant, extend or refuse authority for source
+        now = time.monotonic()
+        with self.lock:
+            owner = self.owner
+            if owner is not source and owner is not None and now < self.deadline \
+                    and self.priority[source] <= self.priority[owner]:
+                return False
+            self.owner = source
+            self.deadline = now + self.hold[source]
+            if owner is not None and owner is not source:
+                self.handoffs += 1
+        if owner is not None and owner is not source:
+            print(f"[ControlArbiter] authority {owner.name} -> {source.name}")
+        return True
+
+    def Holds(self, source: ControlSource):
+        now = time.monotonic()
+        with self.lock:
+            return self.owner is source and now < self.deadline
+
+    def Forward(self, source: ControlSource, command, *args):
+        # Forward a blocking SportClient call for source, dropped if a call is running or it loses.
+        # The busy check comes first so a dropped command does not take or extend authority
+        with self.worker_lock:
+            if self.worker is not None and self.worker.is_alive():
+                return False
+            if not self.Request(source):
+                return False
+            self.worker = threading.Thread(target=command, args=args, daemon=True)
+            self.worker.start()
+        return True
+
+    def __OnController(self, msg: WirelessController_):
+        # Channel handler: key edges dispatch the joystick actions, any activity requests authority
+        start = time.perf_counter()
+        self.controller.Update(msg)
+        if msg.keys or max(abs(msg.lx), abs(msg.ly), abs(msg.rx), abs(msg.ry)) > ARBITER_STICK_DEADZONE:
+            self.Request(ControlSource.Joystick)
+        self.meter.SampleLatency(time.perf_counter() - start)
+
+
+# Time to wait for the first robot state before falling back to a default one
+STATE_WAIT_TIMEOUT = 1.0
+
+# Battery level from the latest low-level state message
+def BatteryLevel(low_state: LowState_):
+    if low_state is None:
+        return -1  # No low-level state received yet
+    battery_state: BmsState_ = low_state.bms_state  # Extract the battery state from the message
+    return int(battery_state.soc)  # State of charge (soc) as an integer
+
+def useDogCamera(internet_card, control_mode="gesture", velocity_rate=VELOCITY_RATE_MIN_HZ, enable_lease=False):
     """
     Initializes and manages the connection to the Unitree robot's camera and state channels, 
     processes live video frames for hand gesture recognition, and controls robot movement based on detected gestures.
@@ -216,6 +513,14 @@ def useDogCamera(internet_card):
         - Continuously captures video frames, processes them for hand gesture recognition, and overlays battery status.
         - Writes annotated frames to shared memory for external access.
         - Detects changes in hand gesture state and triggers robot movement in a separate thread accordingly.
+        - Arbitrates between the wireless controller and the gestures; gestures are ignored while the controller is in use.
+        - In velocity mode, feeds the hand landmarks to VelocityMode, which streams Move commands at a fixed rate.
+
+    Args:
+        internet_card (str): Network interface connected to the robot.
+        control_mode (str): "gesture" for discrete tricks, "velocity" for continuous hand steering.
+        velocity_rate (float): Move send rate in Hz for velocity mode (clamped to 20-50 Hz).
+        enable_lease (bool): Hold the sport service lease while controlling the robot.
 
     Raises:
         SystemExit: If unable to connect to the robot or initialize the camera.
@@ -223,7 +528,7 @@ def useDogCamera(internet_card):
 
     Side Effects:
         - Writes frame size and frame data to files specified by FRAMESIZE_FILE_PATH and FRAME_PATH.
-        - Updates global battery_level variable.
+        - Reads the newest battery level from the low-level state subscriber on every frame.
         - Prints status and error messages to the console.
         - Starts threads to control robot movement based on hand gesture recognition.
     """
@@ -234,105 +539,123 @@ def useDogCamera(internet_card):
         sys.exit(1)  # Exit if unable to connect
 
     # Connection to sport node
-    sub = ChannelSubscriber("rt/sportmodestate", SportModeState_)  # Subscribe to sport mode state channel
-    sub.Init(HighStateHandler, 10)  # Initialize subscription with handler
+    sub = LatestValueSubscriber("rt/sportmodestate", SportModeState_)  # Keep the newest sport mode state
+    sub.Init()
 
     # Connection to low level node
-    sub_battery = ChannelSubscriber("rt/lowstate", LowState_)  # Subscribe to low-level state channel
-    sub_battery.Init(BmsStateHandler, 10)  # Initialize subscription with handler
+    sub_battery = LatestValueSubscriber("rt/lowstate", LowState_)  # Keep the newest low-level state
+    sub_battery.Init()
 
-    time.sleep(1)  # Wait to ensure connections are established
+    # Wait for the first robot state instead of sleeping a fixed time
+    latest = sub.WaitNewer(STATE_WAIT_TIMEOUT, 0)
+    robot_state = latest[1] if latest is not None else unitree_go_msg_dds__SportModeState_()
 
-    sport = SportMode()  # Initialize sport mode controller
+    sport = SportMode(enable_lease)  # Initialize sport mode controller
     sport.GetInitState(robot_state)  # Retrieve initial robot state
     print("Sport mode avviata con successo !!!")  # Print confirmation
 
+    arbiter = ControlArbiter(sport.client)  # Wireless controller vs gesture authority
+    arbiter.Start()
+
     dog_state = DogState.Empty  # Set initial dog state to empty
 
-    try:
-        client = VideoClient()  # Initialize video client for robot's camera
-        client.SetTimeout(3.0)  # Set timeout for video client
-        client.Init()  # Initialize video client connection
-    except Exception as e:
-        print(f"C'è stato un problema con la telecamera del cane...\nErrore: {e}")
-        sys.exit(2)  # Exit if camera initialization fails
-
-    hand_reader = HandReader()  # Initialize hand gesture reader
-
-    # get sample image
-    code = -1
-    while code != 0:
-        code, data = client.GetImageSample()  # Attempt to retrieve a valid image sample
-        print("errore immagine")  # Print error if retrieval fails
-
-    # Convert to numpy image
-    image_data = np.frombuffer(bytes(data), dtype=np.uint8)  # Convert image data to numpy array
-    image = cv2.imdecode(image_data, cv2.IMREAD_COLOR)  # Decode image as color
-
-    height, width = image.shape[:2]  # Extract image dimensions
-    frame_size = width * height * 3  # Calculate frame size in bytes (BGR)
-
-    with open(FRAMESIZE_FILE_PATH, "w") as f:
-        f.write(f"{width} {height}")  # Write frame size to file
-
-    with open(FRAME_PATH, "wb") as f:
-        f.write(b'\x00' * frame_size)  # Create binary file for frame, initialize with zeros
-
-    with open(FRAME_PATH, "r+b") as f:
-        mm = mmap.mmap(f.fileno(), frame_size, access=mmap.ACCESS_WRITE)  # Open frame file with memory mapping
-
-        t = None  # Thread for robot movement
-
-        global battery_level
-        while True:
-            # Get Image data from Go2 robot
-            code, data = client.GetImageSample()  # Retrieve image data from robot's camera
-            if code != 0:
-                print("Get image sample error. code:", code)  # Print error if retrieval fails
-                continue
-
-            try:
-                # Convert to numpy image
-                image_data = np.frombuffer(bytes(data), dtype=np.uint8)  # Convert image data to numpy array
-                image = cv2.imdecode(image_data, cv2.IMREAD_COLOR)  # Decode image as color
-
-                frame = cv2.flip(image, 1)  # Flip image horizontally
-                annotated_frame = hand_reader.Start(frame)  # Annotate frame using hand gesture reader
-
-                # Determine battery level color coding
-                if battery_level < 25:
-                    battery_color = (0, 0, 255)  # Red for low battery
-                elif battery_level < 60:
-                    battery_color = (0, 165, 255)  # Orange for medium battery
-                else:
-                    battery_color = (0, 255, 0)  # Green for high battery
-
-                # Overlay battery percentage on the frame
-                cv2.putText(annotated_frame, str(battery_level) + '%', (width-100, 50),
-                        cv2.FONT_HERSHEY_SIMPLEX, 1, battery_color, 2, cv2.LINE_AA)
-
-                # write frame
-                mm.seek(0)  # Move to start of memory-mapped file
-                mm.write(annotated_frame.tobytes())  # Write annotated frame to shared memory
-
-                # If the detected dog state changes, start a new thread to move the robot accordingly
-                if(dog_state != hand_reader.dog_state):
-                    dog_state = hand_reader.dog_state
-
-                    if t is None or not t.is_alive():  # Start new thread if previous is not alive
-                        t = threading.Thread(target=sport.move_dog, args=(dog_state,))
-                        t.daemon = True  # Set thread as daemon
-                        t.start()
-            except cv2.error as e:
-                print(e)  # Handle OpenCV errors gracefully
-                continue
+    velocity = None  # Continuous velocity controller (velocity mode only)
+    if control_mode == "velocity":
+        velocity = VelocityMode(sport.client, velocity_rate, arbiter)  # Stream Move commands from the hand
+        velocity.Start()
+        print(f"Velocity mode avviata a {1.0 / velocity.period:.0f} Hz")
+
+    try:  # Any exit (Ctrl-C, errors, sys.exit) goes through the finally below and stops the robot
+        try:
+            client = VideoClient()  # Initialize video client for robot's camera
+            client.SetTimeout(3.0)  # Set timeout for video client
+            client.Init()  # Initialize video client connection
+        except Exception as e:
+            print(f"C'è stato un problema con la telecamera del cane...\nErrore: {e}")
+            sys.exit(2)  # Exit if camera initialization fails
+
+        hand_reader = HandReader()  # Initialize hand gesture reader
+
+        # get sample image
+        code = -1
+        while code != 0:
+            code, data = client.GetImageSample()  # Attempt to retrieve a valid image sample
+            print("errore immagine")  # Print error if retrieval fails
+
+        # Convert to numpy image
+        image_data = np.frombuffer(bytes(data), dtype=np.uint8)  # Convert image data to numpy array
+        image = cv2.imdecode(image_data, cv2.IMREAD_COLOR)  # Decode image as color
+
+        height, width = image.shape[:2]  # Extract image dimensions
+        frame_size = width * height * 3  # Calculate frame size in bytes (BGR)
+
+        with open(FRAMESIZE_FILE_PATH, "w") as f:
+            f.write(f"{width} {height}")  # Write frame size to file
+
+        with open(FRAME_PATH, "wb") as f:
+            f.write(b'\x00' * frame_size)  # Create binary file for frame, initialize with zeros
+
+        with open(FRAME_PATH, "r+b") as f:
+            mm = mmap.mmap(f.fileno(), frame_size, access=mmap.ACCESS_WRITE)  # Open frame file with memory mapping
+
+            while True:
+                # Get Image data from Go2 robot
+                code, data = client.GetImageSample()  # Retrieve image data from robot's camera
+                if code != 0:
+                    print("Get image sample error. code:", code)  # Print error if retrieval fails
+                    continue
+
+                try:
+                    # Convert to numpy image
+                    image_data = np.frombuffer(bytes(data), dtype=np.uint8)  # Convert image data to numpy array
+                    image = cv2.imdecode(image_data, cv2.IMREAD_COLOR)  # Decode image as color
+
+                    frame = cv2.flip(image, 1)  # Flip image horizontally
+                    annotated_frame = hand_reader.Start(frame)  # Annotate frame using hand gesture reader
+
+                    # Determine battery level color coding
+                    battery_level = BatteryLevel(sub_battery.Get())
+                    if battery_level < 25:
+                        battery_color = (0, 0, 255)  # Red for low battery
+                    elif battery_level < 60:
+                        battery_color = (0, 165, 255)  # Orange for medium battery
+                    else:
+                        battery_color = (0, 255, 0)  # Green for high battery
+
+                    # Overlay battery percentage on the frame
+                    cv2.putText(annotated_frame, str(battery_level) + '%', (width-100, 50),
+                            cv2.FONT_HERSHEY_SIMPLEX, 1, battery_color, 2, cv2.LINE_AA)
+
+                    # write frame
+                    mm.seek(0)  # Move to start of memory-mapped file
+                    mm.write(annotated_frame.tobytes())  # Write annotated frame to shared memory
+
+                    # In velocity mode the hand steers the robot continuously
+                    if velocity is not None:
+                        velocity.update_hand(hand_reader.hand_landmarks, hand_reader.dog_state)
+
+                    # If the detected dog state changes, let the arbiter move the robot in a worker thread
+                    elif(dog_state != hand_reader.dog_state):
+                        dog_state = hand_reader.dog_state
+
+                        if dog_state not in (DogState.Zero, DogState.Empty):  # Only real gestures ask for authority
+                            arbiter.Forward(ControlSource.Gesture, sport.move_dog, dog_state)
+                except cv2.error as e:
+                    print(e)  # Handle OpenCV errors gracefully
+                    continue
+    finally:
+        if velocity is not None:
+            velocity.Stop()  # Ctrl-C or any error: stop the send loop and the robot
 
 
 if __name__ == "__main__":  # Entry point for the script
     debug = int(os.getenv("DEBUG", 0))  # Get DEBUG environment variable (default to 0 if not set)
     internet_card = "eth0"  # Set default network interface for robot connection
+    control_mode = os.getenv("CONTROL_MODE", "gesture")  # "gesture" (tricks) or "velocity" (continuous steering)
+    velocity_rate = float(os.getenv("VELOCITY_RATE_HZ", VELOCITY_RATE_MIN_HZ))  # Move send rate for velocity mode
+    enable_lease = int(os.getenv("SPORT_LEASE", 0)) != 0  # Hold the sport service lease
 
     if debug:  # If debug mode is enabled
         useComputerCamera()  # Use the computer's webcam for gesture recognition
     else:  # If not in debug mode
-        useDogCamera(internet_card)  # Connect to the robot and use its camera for gesture recognition
+        useDogCamera(internet_card, control_mode, velocity_rate, enable_lease)  # Connect to the robot and use its camera for gesture recognition
@@ -52,6 +52,7 @@ class HandReader():
     annotates images with gesture information and hand landmarks, and tracks gesture changes.
     Attributes:
         dog_state (DogState): Current state of the recognized gesture.
+        hand_landmarks (list): Landmarks of the first detected hand, or None if no hand is visible.
         count (int): Counter for gesture changes.
         lastGesture (str): Name of the last recognized gesture.
         mp_hands: MediaPipe Hands solution module.
@@ -94,6 +95,7 @@ class HandReader():
 
         Attributes:
             dog_state (DogState): The current state of the dog, initially set to empty.
+            hand_landmarks (list): Landmarks of the first detected hand, initially None.
             count (int): Counter for the number of gesture changes detected.
             lastGesture (str): The last recognized gesture.
             mp_hands: MediaPipe Hands solution for hand tracking.
@@ -104,6 +106,7 @@ class HandReader():
             recognizer: Gesture recognizer instance for detecting hand gestures.
         """
         self.dog_state = DogState.Empty # Set initial state to empty
+        self.hand_landmarks = None  # Landmarks of the first detected hand (None if no hand)
         self.count = 0  # Counter for gesture changes
         self.lastGesture = "ciao"  # Stores the last recognized gesture
 
@@ -195,9 +198,11 @@ class HandReader():
             - If a gesture is detected:
                 - Retrieves the gesture with the highest confidence and hand landmarks.
                 - Annotates the frame with gesture and hand landmarks.
+                - Stores the landmarks of the first hand in `hand_landmarks`.
             - If no gesture is detected:
                 - Annotates the frame with a "No gesture detected" message.
                 - Updates internal state variables (`lastGesture` and `dog_state`) if necessary.
+                - Clears `hand_landmarks`.
         """
         frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)  # Convert from BGR to RGB
         mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=frame_rgb)  # Create MediaPipe image object
@@ -206,8 +211,10 @@ class HandReader():
         if recognition_result.gestures:  # If gestures are recognized
             top_gesture = recognition_result.gestures[0][0]  # Get gesture with highest confidence
             hand_landmarks = recognition_result.hand_landmarks  # Get hand landmarks
+            self.hand_landmarks = hand_landmarks[0] if hand_landmarks else None  # Keep first hand for velocity control
             annotated_frame = self.display_single_image_with_gesture_and_hand_landmarks(frame, (top_gesture, hand_landmarks))
         else:  # No gesture detected
+            self.hand_landmarks = None  # No hand to follow
             annotated_frame = frame.copy()
             cv2.putText(annotated_frame, "No gesture detected", (30, 50),
                     cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2, cv2.LINE_AA)
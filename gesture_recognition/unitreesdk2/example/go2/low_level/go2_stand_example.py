@@ -1,13 +1,13 @@
 import time
 import sys
+import numpy as np
 
 from unitree_sdk2py.core.channel import ChannelPublisher, ChannelFactoryInitialize
 from unitree_sdk2py.core.channel import ChannelSubscriber, ChannelFactoryInitialize
-from unitree_sdk2py.idl.default import unitree_go_msg_dds__LowCmd_
 from unitree_sdk2py.idl.default import unitree_go_msg_dds__LowState_
 from unitree_sdk2py.idl.unitree_go.msg.dds_ import LowCmd_
 from unitree_sdk2py.idl.unitree_go.msg.dds_ import LowState_
-from unitree_sdk2py.utils.crc import CRC
+from unitree_sdk2py.utils.lowcmd import LowCmdBuffer
 from unitree_sdk2py.utils.thread import RecurrentThread
 import unitree_legged_const as go2
 from unitree_sdk2py.comm.motion_switcher.motion_switcher_client import MotionSwitcherClient
@@ -23,17 +23,18 @@ class Custom:
         self.motiontime = 0
         self.dt = 0.002  # 0.001~0.01
 
-        self.low_cmd = unitree_go_msg_dds__LowCmd_()  
+        # packed LowCmd_ image, motor fields are numpy views (see LowCmdBuffer)
+        self.low_cmd = LowCmdBuffer()
         self.low_state = None  
 
-        self._targetPos_1 = [0.0, 1.36, -2.65, 0.0, 1.36, -2.65,
-                             -0.2, 1.36, -2.65, 0.2, 1.36, -2.65]
-        self._targetPos_2 = [0.0, 0.67, -1.3, 0.0, 0.67, -1.3,
-                             0.0, 0.67, -1.3, 0.0, 0.67, -1.3]
-        self._targetPos_3 = [-0.35, 1.36, -2.65, 0.35, 1.36, -2.65,
-                             -0.5, 1.36, -2.65, 0.5, 1.36, -2.65]
+        self._targetPos_1 = np.array([0.0, 1.36, -2.65, 0.0, 1.36, -2.65,
+                                      -0.2, 1.36, -2.65, 0.2, 1.36, -2.65])
+        self._targetPos_2 = np.array([0.0, 0.67, -1.3, 0.0, 0.67, -1.3,
+                                      0.0, 0.67, -1.3, 0.0, 0.67, -1.3])
+        self._targetPos_3 = np.array([-0.35, 1.36, -2.65, 0.35, 1.36, -2.65,
+                                      -0.5, 1.36, -2.65, 0.5, 1.36, -2.65])
 
-        self.startPos = [0.0] * 12
+        self.startPos = np.zeros(12)
         self.duration_1 = 500
         self.duration_2 = 500
         self.duration_3 = 1000
@@ -49,8 +50,6 @@ class Custom:
         # thread handling
         self.lowCmdWriteThreadPtr = None
 
-        self.crc = CRC()
-
     # Public methods
     def Init(self):
         self.InitLowCmd()
@@ -86,17 +85,22 @@ class Custom:
 
     # Private methods
     def InitLowCmd(self):
-        self.low_cmd.head[0]=0xFE
-        self.low_cmd.head[1]=0xEF
-        self.low_cmd.level_flag = 0xFF
-        self.low_cmd.gpio = 0
-        for i in range(20):
-            self.low_cmd.motor_cmd[i].mode = 0x01  # (PMSM) mode
-            self.low_cmd.motor_cmd[i].q= go2.PosStopF
-            self.low_cmd.motor_cmd[i].kp = 0
-            self.low_cmd.motor_cmd[i].dq = go2.VelStopF
-            self.low_cmd.motor_cmd[i].kd = 0
-            self.low_cmd.motor_cmd[i].tau = 0
+        self.low_cmd.data["head"] = [0xFE, 0xEF]
+        self.low_cmd.data["level_flag"] = 0xFF
+        self.low_cmd.data["gpio"] = 0
+        self.low_cmd.mode[:] = 0x01  # (PMSM) mode
+        self.low_cmd.q[:] = go2.PosStopF
+        self.low_cmd.kp[:] = 0
+        self.low_cmd.dq[:] = go2.VelStopF
+        self.low_cmd.kd[:] = 0
+        self.low_cmd.tau[:] = 0
+
+    def SetLegCmd(self, q: np.ndarray):
+        self.low_cmd.q[:12] = q
+        self.low_cmd.dq[:12] = 0
+        self.low_cmd.kp[:12] = self.Kp
+        self.low_cmd.kd[:12] = self.Kd
+        self.low_cmd.tau[:12] = 0
 
     def LowStateMessageHandler(self, msg: LowState_):
         self.low_state = msg
@@ -107,52 +111,31 @@ class Custom:
     def LowCmdWrite(self):
 
         if self.firstRun:
-            for i in range(12):
-                self.startPos[i] = self.low_state.motor_state[i].q
+            self.startPos[:] = [self.low_state.motor_state[i].q for i in range(12)]
             self.firstRun = False
 
         self.percent_1 += 1.0 / self.duration_1
         self.percent_1 = min(self.percent_1, 1)
         if self.percent_1 < 1:
-            for i in range(12):
-                self.low_cmd.motor_cmd[i].q = (1 - self.percent_1) * self.startPos[i] + self.percent_1 * self._targetPos_1[i]
-                self.low_cmd.motor_cmd[i].dq = 0
-                self.low_cmd.motor_cmd[i].kp = self.Kp
-                self.low_cmd.motor_cmd[i].kd = self.Kd
-                self.low_cmd.motor_cmd[i].tau = 0
+            self.SetLegCmd((1 - self.percent_1) * self.startPos + self.percent_1 * self._targetPos_1)
 
         if (self.percent_1 == 1) and (self.percent_2 <= 1):
             self.percent_2 += 1.0 / self.duration_2
             self.percent_2 = min(self.percent_2, 1)
-            for i in range(12):
-                self.low_cmd.motor_cmd[i].q = (1 - self.percent_2) * self._targetPos_1[i] + self.percent_2 * self._targetPos_2[i]
-                self.low_cmd.motor_cmd[i].dq = 0
-                self.low_cmd.motor_cmd[i].kp = self.Kp
-                self.low_cmd.motor_cmd[i].kd = self.Kd
-                self.low_cmd.motor_cmd[i].tau = 0
+            self.SetLegCmd((1 - self.percent_2) * self._targetPos_1 + self.percent_2 * self._targetPos_2)
 
         if (self.percent_1 == 1) and (self.percent_2 == 1) and (self.percent_3 < 1):
             self.percent_3 += 1.0 / self.duration_3
             self.percent_3 = min(self.percent_3, 1)
-            for i in range(12):
-                self.low_cmd.motor_cmd[i].q = self._targetPos_2[i] 
-                self.low_cmd.motor_cmd[i].dq = 0
-                self.low_cmd.motor_cmd[i].kp = self.Kp
-                self.low_cmd.motor_cmd[i].kd = self.Kd
-                self.low_cmd.motor_cmd[i].tau = 0
+            self.SetLegCmd(self._targetPos_2)
 
         if (self.percent_1 == 1) and (self.percent_2 == 1) and (self.percent_3 == 1) and (self.percent_4 <= 1):
             self.percent_4 += 1.0 / self.duration_4
             self.percent_4 = min(self.percent_4, 1)
-            for i in range(12):
-                self.low_cmd.motor_cmd[i].q = (1 - self.percent_4) * self._targetPos_2[i] + self.percent_4 * self._targetPos_3[i]
-                self.low_cmd.motor_cmd[i].dq = 0
-                self.low_cmd.motor_cmd[i].kp = self.Kp
-                self.low_cmd.motor_cmd[i].kd = self.Kd
-                self.low_cmd.motor_cmd[i].tau = 0
-
-        self.low_cmd.crc = self.crc.Crc(self.low_cmd)
-        self.lowcmd_publisher.Write(self.low_cmd)
+            self.SetLegCmd((1 - self.percent_4) * self._targetPos_2 + self.percent_4 * self._targetPos_3)
+
+        # crc over the packed buffer, then the persistent LowCmd_ is refreshed and published
+        self.lowcmd_publisher.Write(self.low_cmd.ToLowCmd())
 
 if __name__ == '__main__':
 
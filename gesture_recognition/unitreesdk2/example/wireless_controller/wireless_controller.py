@@ -2,43 +2,20 @@ import time
 import sys
 from unitree_sdk2py.core.channel import ChannelSubscriber, ChannelFactoryInitialize
 
-from unitree_sdk2py.idl.default import unitree_go_msg_dds__WirelessController_
 from unitree_sdk2py.idl.unitree_go.msg.dds_ import WirelessController_
+from unitree_sdk2py.utils.wireless_controller import WirelessControllerState, KeyNames
 
 
-key_state = [
-    ["R1", 0],
-    ["L1", 0],
-    ["start", 0],
-    ["select", 0],
-    ["R2", 0],
-    ["L2", 0],
-    ["F1", 0],
-    ["F2", 0],
-    ["A", 0],
-    ["B", 0],
-    ["X", 0],
-    ["Y", 0],
-    ["up", 0],
-    ["right", 0],
-    ["down", 0],
-    ["left", 0],
-]
+state = WirelessControllerState()
 
 
-def WirelessControllerHandler(msg: WirelessController_):
-    global key_state
-    print("lx: ", msg.lx)
-    print("lx: ", msg.ly)
-    print("lx: ", msg.rx)
-    print("lx: ", msg.ry)
-    print("keys: ", msg.keys)
+def KeyPressed(state: WirelessControllerState, edges: int):
+    print("pressed: ", KeyNames(edges))
+    print("keys: ", state.GetKeys(), "axes (lx, ly, rx, ry): ", state.axes)
 
-    #Update key state
-    for i in range(16):
-        key_state[i][1] = (msg.keys & (1 << i)) >> i
 
-    print(key_state)
+def KeyReleased(state: WirelessControllerState, edges: int):
+    print("released: ", KeyNames(edges))
 
 
 
@@ -49,7 +26,10 @@ if __name__ == "__main__":
         ChannelFactoryInitialize(0)
         
     sub = ChannelSubscriber("rt/wirelesscontroller", WirelessController_)
-    sub.Init(WirelessControllerHandler, 10)
+    # print on key edges only, every other message just updates the state
+    state.OnPressed(0xFFFF, KeyPressed)
+    state.OnReleased(0xFFFF, KeyReleased)
+    sub.Init(state.Update, 10)
     
     while True:
         time.sleep(10.0)
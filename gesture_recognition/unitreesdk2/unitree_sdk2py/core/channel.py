@@ -1,19 +1,22 @@
-import time
+import sys
+from enum import Enum
 from typing import Any, Callable
-from threading import Thread, Event
+from threading import Thread, Event, Lock, Condition
 
 from cyclonedds.domain import Domain, DomainParticipant
 from cyclonedds.internal import dds_c_t
 from cyclonedds.pub import DataWriter
 from cyclonedds.sub import DataReader
 from cyclonedds.topic import Topic
-from cyclonedds.qos import Qos
+from cyclonedds.qos import Qos, Policy
 from cyclonedds.core import DDSException, Listener
 from cyclonedds.util import duration
 from cyclonedds.internal import dds_c_t, InvalidSample
 
 # for channel config
-from .channel_config import ChannelConfigAutoDetermine, ChannelConfigHasInterface
+from .channel_config import ChannelConfigCreate
+from .channel_dispatcher import ChannelDispatcher
+from .channel_qos import ChannelQosResolve
 
 # for singleton
 from ..utils.singleton import Singleton
@@ -21,8 +24,38 @@ from ..utils.bqueue import BQueue
 
 
 """
-" class ChannelReader
+" max samples taken from the reader in one call
 """
+CHANNEL_TAKE_MAX = 32
+
+"""
+" reader history of dispatched channels without own qos. samples wait in the reader
+" until the dispatcher takes them, the default KeepLast(1) would drop bursts
+"""
+CHANNEL_DISPATCH_HISTORY = 64
+
+
+"""
+" Enum ChannelDeliverMode
+" EACH: handler(sample) for every sample, in order.
+" BATCH: handler(samples) once per drained burst, samples in order.
+" LATEST: handler(sample) with the newest sample of the burst only.
+"""
+class ChannelDeliverMode(Enum):
+    EACH = 0
+    BATCH = 1
+    LATEST = 2
+
+
+"""
+" Enum ChannelBackend
+" DDS: cyclonedds domain, the default.
+" LOOPBACK: in-process only, samples are passed by reference (tests, simulation, benchmarks).
+"""
+class ChannelBackend(Enum):
+    DDS = 0
+    LOOPBACK = 1
+
 
 """
 " class Channel
@@ -40,19 +73,41 @@ class Channel:
             self.__queueEnable = False
             self.__threadEvent = None
             self.__threadReader = None
+            self.__deliverMode = ChannelDeliverMode.EACH
+            self.__takeMax = CHANNEL_TAKE_MAX
+            self.__dispatcher = None
+            self.__matchedCount = 0
+            self.__matched = Condition()
+            self.__droppedCount = 0
         
-        def Init(self, participant: DomainParticipant, topic: Topic, qos: Qos = None, handler: Callable = None, queueLen: int = 0):
+        def Init(self, participant: DomainParticipant, topic: Topic, qos: Qos = None, handler: Callable = None, queueLen: int = 0,
+                 deliverMode: ChannelDeliverMode = ChannelDeliverMode.EACH, takeMax: int = CHANNEL_TAKE_MAX,
+                 dispatcher: ChannelDispatcher = None, priority: int = 0):
             if handler is None:
-                self.__reader = DataReader(participant, topic, qos)
+                self.__reader = DataReader(participant, topic, qos, Listener(on_subscription_matched=self.__OnSubscriptionMatched))
+            elif dispatcher is not None:
+                # served by the shared dispatcher: no listener, no queue, no own thread
+                self.__handler = handler
+                self.__deliverMode = deliverMode
+                self.__takeMax = max(1, takeMax)
+                self.__dispatcher = dispatcher
+                if qos is None:
+                    qos = Qos(Policy.History.KeepLast(CHANNEL_DISPATCH_HISTORY))
+                self.__reader = DataReader(participant, topic, qos, Listener(on_subscription_matched=self.__OnSubscriptionMatched))
+                dispatcher.Register(self.__reader, self.__OnDispatch, priority)
             else:
                 self.__handler = handler
+                self.__deliverMode = deliverMode
+                self.__takeMax = max(1, takeMax)
                 if queueLen > 0:
                     self.__queueEnable = True
-                    self.__queue = BQueue(queueLen)
+                    # LATEST keeps one pending sample: a deeper queue would hand stale samples to the handler
+                    self.__queue = BQueue(1 if deliverMode == ChannelDeliverMode.LATEST else queueLen)
                     self.__threadEvent = Event()
                     self.__threadReader = Thread(target=self.__ChannelReaderThreadFunc, name="ch_reader", daemon=True)
                     self.__threadReader.start()
-                self.__reader = DataReader(participant, topic, qos, Listener(on_data_available=self.__OnDataAvailable))
+                self.__reader = DataReader(participant, topic, qos, Listener(on_data_available=self.__OnDataAvailable,
+                                                                             on_subscription_matched=self.__OnSubscriptionMatched))
 
         def Read(self, timeout: float = None):
             sample = None
@@ -70,7 +125,19 @@ class Channel:
 
             return sample
 
+        def WaitMatched(self, timeout: float = None):
+            # True once a writer is matched, False on timeout
+            with self.__matched:
+                return self.__matched.wait_for(lambda: self.__matchedCount > 0, timeout)
+
+        def GetDroppedCount(self):
+            return self.__droppedCount
+
         def Close(self):
+            if self.__dispatcher is not None and self.__reader is not None:
+                self.__dispatcher.Unregister(self.__reader)
+                self.__dispatcher = None
+
             if self.__reader is not None:
                 del self.__reader
 
@@ -80,39 +147,103 @@ class Channel:
                 self.__queue.Clear()
                 self.__threadReader.join()
 
+        def __OnSubscriptionMatched(self, reader: DataReader, status: dds_c_t.subscription_matched_status):
+            with self.__matched:
+                self.__matchedCount = status.current_count
+                self.__matched.notify_all()
+
         def __OnDataAvailable(self, reader: DataReader):
-            samples = []
-            try:
-                samples = reader.take(1)
-            except DDSException as e:
-                print("[Reader] catch DDSException error. msg:", e.msg)
-                return
-            except TimeoutError as e:
-                print("[Reader] take sample timeout")
-                return
-            except:
-                print("[Reader] take sample error")
-                return
+            # drain the reader with bulk takes, one listener call may cover a burst of samples
+            self.__Deliver(self.__Take(reader, True))
 
-            if samples is None:
-                return
+        def __OnDispatch(self, reader: DataReader):
+            # one batch per dispatcher round, the dispatcher comes back while data is left
+            self.__Deliver(self.__Take(reader, False))
 
-            # check invalid sample        
-            sample = samples[0]
-            if isinstance(sample, InvalidSample):
+        def __Take(self, reader: DataReader, drain: bool):
+            samples = []
+            takeMax = self.__takeMax
+            while True:
+                try:
+                    taken = reader.take(takeMax)
+                except DDSException as e:
+                    print("[Reader] catch DDSException error. msg:", e.msg)
+                    break
+                except TimeoutError as e:
+                    print("[Reader] take sample timeout")
+                    break
+                except:
+                    print("[Reader] take sample error")
+                    break
+
+                if not taken:
+                    break
+
+                # check invalid sample
+                for sample in taken:
+                    if not isinstance(sample, InvalidSample):
+                        samples.append(sample)
+
+                if not drain or len(taken) < takeMax:
+                    break
+
+            return samples
+
+        def __Deliver(self, samples: list):
+            if not samples:
                 return
 
-            # do sample
-            if self.__queueEnable:
-                self.__queue.Put(sample)
+            # do sample. the samples are taken already: a handler that raises is logged and
+            # the rest of the batch is still delivered
+            mode = self.__deliverMode
+            handler = self.__handler
+            if mode == ChannelDeliverMode.EACH:
+                if self.__queueEnable:
+                    for sample in samples:
+                        if not self.__queue.Put(sample):
+                            self.__Dropped(1)
+                else:
+                    for sample in samples:
+                        try:
+                            handler(sample)
+                        except:
+                            self.__HandlerError()
+            elif mode == ChannelDeliverMode.BATCH:
+                if self.__queueEnable:
+                    if not self.__queue.Put(samples):
+                        self.__Dropped(len(samples))
+                else:
+                    try:
+                        handler(samples)
+                    except:
+                        self.__HandlerError()
             else:
-                self.__handler(sample)
+                if self.__queueEnable:
+                    self.__queue.Put(samples[-1], True)
+                else:
+                    try:
+                        handler(samples[-1])
+                    except:
+                        self.__HandlerError()
+
+        def __HandlerError(self):
+            info = sys.exc_info()
+            print(f"[Reader] handler raise exception: name={info[0].__name__}, args={str(info[1].args)}")
+
+        def __Dropped(self, count: int):
+            # the listener must not block, samples that find the queue full are lost.
+            # listener calls of one reader are serialized, no lock needed
+            self.__droppedCount += count
+            print("[Reader] queue full, samples dropped:", count)
 
         def __ChannelReaderThreadFunc(self):
             while not self.__threadEvent.is_set():
                 sample = self.__queue.Get()
                 if sample is not None:
-                    self.__handler(sample)
+                    try:
+                        self.__handler(sample)
+                    except:
+                        self.__HandlerError()
 
     """
     " internal class __Writer
@@ -120,27 +251,24 @@ class Channel:
     class __Writer:
         def __init__(self):
             self.__writer = None
+            self.__writeLock = Lock()
             self.__publication_matched_count = 0
+            self.__matched = Condition()
         
         def Init(self, participant: DomainParticipant, topic: Topic, qos: Qos = None):
             self.__writer = DataWriter(participant, topic, qos, Listener(on_publication_matched=self.__OnPublicationMatched))
-            time.sleep(0.2)
 
         def Write(self, sample: Any, timeout: float = None):
-            waitsec = 0.0 if timeout is None else timeout
-
-            # check publication_matched_count
-            while waitsec > 0.0 and self.__publication_matched_count == 0:
-                time.sleep(0.1)
-                waitsec = waitsec - 0.1
-            #   print(time.time())
-
-            # check waitsec
-            if timeout is not None and waitsec <= 0.0:
-                return False
+            # with a timeout, wait until a reader is matched. the listener wakes us on match
+            if timeout is not None and self.__publication_matched_count == 0:
+                if not self.WaitMatched(timeout):
+                    return False
 
+            # write holds the gil while delivering to local readers; concurrent writes on the
+            # same writer deadlock against a listener waiting for the gil, so serialize them
             try:
-                self.__writer.write(sample)
+                with self.__writeLock:
+                    self.__writer.write(sample)
             except DDSException as e:
                 print("[Writer] catch DDSException error. msg:", e.msg)
                 return False
@@ -149,13 +277,20 @@ class Channel:
                 return False
 
             return True
+
+        def WaitMatched(self, timeout: float = None):
+            # True once a reader is matched, False on timeout
+            with self.__matched:
+                return self.__matched.wait_for(lambda: self.__publication_matched_count > 0, timeout)
         
         def Close(self):
             if self.__writer is not None:
                 del self.__writer
         
         def __OnPublicationMatched(self, writer: DataWriter, status: dds_c_t.publication_matched_status):
-            self.__publication_matched_count = status.current_count
+            with self.__matched:
+                self.__publication_matched_count = status.current_count
+                self.__matched.notify_all()
 
 
     # channel __init__
@@ -165,11 +300,15 @@ class Channel:
         self.__participant = participant
         self.__topic = Topic(self.__participant, name, type, qos)
 
-    def SetWriter(self, qos: Qos = None):
-        self.__writer.Init(self.__participant, self.__topic, qos)
+    # qos: None, a Qos or a qos profile name (see channel_qos)
+    def SetWriter(self, qos: Any = None):
+        self.__writer.Init(self.__participant, self.__topic, ChannelQosResolve(qos))
 
-    def SetReader(self, qos: Qos = None, handler: Callable = None, queueLen: int = 0):
-        self.__reader.Init(self.__participant, self.__topic, qos, handler, queueLen)
+    def SetReader(self, qos: Any = None, handler: Callable = None, queueLen: int = 0,
+                  deliverMode: ChannelDeliverMode = ChannelDeliverMode.EACH, takeMax: int = CHANNEL_TAKE_MAX,
+                  dispatcher: ChannelDispatcher = None, priority: int = 0):
+        self.__reader.Init(self.__participant, self.__topic, ChannelQosResolve(qos), handler, queueLen, deliverMode, takeMax,
+                           dispatcher, priority)
         
     def Write(self, sample: Any, timeout: float = None):
         return self.__writer.Write(sample, timeout)
@@ -177,6 +316,18 @@ class Channel:
     def Read(self, timeout: float = None):
         return self.__reader.Read(timeout)
 
+    def WaitWriterMatched(self, timeout: float = None):
+        # our writer has a matched reader
+        return self.__writer.WaitMatched(timeout)
+
+    def WaitReaderMatched(self, timeout: float = None):
+        # our reader has a matched writer
+        return self.__reader.WaitMatched(timeout)
+
+    def GetDroppedCount(self):
+        # samples lost because the reader queue was full
+        return self.__reader.GetDroppedCount()
+
     def CloseReader(self):
         self.__reader.Close()
 
@@ -191,17 +342,24 @@ class ChannelFactory(Singleton):
     __domain = None
     __participant = None
     __qos = None
+    __dispatcher = None
+    __dispatchThreads = 1
+    __loopback = None
 
     def __init__(self):
         super().__init__()
 
-    def Init(self, id: int, networkInterface: str = None, qos: Qos = None):
-        config = None
-        # choose config
-        if networkInterface is None:
-            config = ChannelConfigAutoDetermine
-        else:
-            config = ChannelConfigHasInterface.replace('$__IF_NAME__$', networkInterface)
+    def Init(self, id: int, networkInterface: str = None, qos: Qos = None, dispatchThreads: int = 1, config: str = None,
+             backend: ChannelBackend = ChannelBackend.DDS):
+        if backend == ChannelBackend.LOOPBACK:
+            # imported here, the loopback backend builds on this module
+            from .channel_loopback import LoopbackBus
+            self.__loopback = LoopbackBus()
+            return True
+
+        # choose config. a given config (see ChannelConfigCreate) already names its interface
+        if config is None:
+            config = ChannelConfigCreate(networkInterface)
 
         try:
             self.__domain = Domain(id, config)
@@ -222,20 +380,35 @@ class ChannelFactory(Singleton):
             return False
 
         self.__qos = qos
+        self.__dispatchThreads = max(1, dispatchThreads)
 
         return True
 
+    def GetDispatcher(self):
+        # shared dispatcher, threads are started on demand as readers register
+        if self.__loopback is not None:
+            return None
+        if self.__dispatcher is None:
+            self.__dispatcher = ChannelDispatcher(self.__participant, self.__dispatchThreads)
+        return self.__dispatcher
+
     def CreateChannel(self, name: str, type: Any):
+        if self.__loopback is not None:
+            from .channel_loopback import LoopbackChannel
+            return LoopbackChannel(self.__loopback, name, type)
         return Channel(self.__participant, name, type, self.__qos)
 
-    def CreateSendChannel(self, name: str, type: Any):
+    def CreateSendChannel(self, name: str, type: Any, qos: Any = None):
         channel = self.CreateChannel(name, type)
-        channel.SetWriter(None)
+        channel.SetWriter(qos)
         return channel
 
-    def CreateRecvChannel(self, name: str, type: Any, handler: Callable = None, queueLen: int = 0):
+    def CreateRecvChannel(self, name: str, type: Any, handler: Callable = None, queueLen: int = 0,
+                          deliverMode: ChannelDeliverMode = ChannelDeliverMode.EACH, takeMax: int = CHANNEL_TAKE_MAX,
+                          dispatch: bool = False, priority: int = 0, qos: Any = None):
         channel = self.CreateChannel(name, type)
-        channel.SetReader(None, handler, queueLen)
+        dispatcher = self.GetDispatcher() if dispatch else None
+        channel.SetReader(qos, handler, queueLen, deliverMode, takeMax, dispatcher, priority)
         return channel
 
 
@@ -248,9 +421,9 @@ class ChannelPublisher:
         self.__channel = factory.CreateChannel(name, type)
         self.__inited = False
 
-    def Init(self):
+    def Init(self, qos: Any = None):
         if not self.__inited:
-            self.__channel.SetWriter(None)
+            self.__channel.SetWriter(qos)
             self.__inited = True
 
     def Close(self):
@@ -260,6 +433,10 @@ class ChannelPublisher:
     def Write(self, sample: Any, timeout: float = None):
         return self.__channel.Write(sample, timeout)
 
+    def WaitMatched(self, timeout: float = None):
+        # True once a subscriber is matched, False on timeout
+        return self.__channel.WaitWriterMatched(timeout)
+
 """
 " class ChannelSubscriber
 """
@@ -269,9 +446,13 @@ class ChannelSubscriber:
         self.__channel = factory.CreateChannel(name, type)
         self.__inited = False
 
-    def Init(self, handler: Callable = None, queueLen: int = 0):
+    def Init(self, handler: Callable = None, queueLen: int = 0,
+             deliverMode: ChannelDeliverMode = ChannelDeliverMode.EACH, takeMax: int = CHANNEL_TAKE_MAX,
+             dispatch: bool = False, priority: int = 0, qos: Any = None):
+        # dispatch: handler runs on the shared dispatcher thread(s) instead of a listener/queue thread
         if not self.__inited:
-            self.__channel.SetReader(None, handler, queueLen)
+            dispatcher = ChannelFactory().GetDispatcher() if dispatch else None
+            self.__channel.SetReader(qos, handler, queueLen, deliverMode, takeMax, dispatcher, priority)
             self.__inited = True
 
     def Close(self):
@@ -281,10 +462,70 @@ class ChannelSubscriber:
     def Read(self, timeout: int = None):
         return self.__channel.Read(timeout)
 
+"""
+" class LatestValueSubscriber
+" keeps only the newest sample of a topic. the dds listener stores it directly,
+" no queue and no handler thread. every stored sample gets a sequence number.
+"""
+class LatestValueSubscriber:
+    def __init__(self, name: str, type: Any):
+        factory = ChannelFactory()
+        self.__channel = factory.CreateChannel(name, type)
+        self.__inited = False
+        self.__latest = (0, None)
+        self.__waiters = 0
+        self.__condition = Condition()
+
+    def Init(self, takeMax: int = CHANNEL_TAKE_MAX, qos: Any = None):
+        if not self.__inited:
+            self.__channel.SetReader(qos, self.__Store, 0, ChannelDeliverMode.LATEST, takeMax)
+            self.__inited = True
+
+    def Close(self):
+        self.__channel.CloseReader()
+        self.__inited = False
+        with self.__condition:
+            self.__condition.notify_all()
+
+    def Get(self):
+        return self.__latest[1]
+
+    def GetSeq(self):
+        return self.__latest[0]
+
+    def GetIfNewer(self, seq: int):
+        # (seq, sample) if a sample newer than seq was stored, else None
+        latest = self.__latest
+        if latest[0] > seq:
+            return latest
+        return None
+
+    def WaitNewer(self, timeout: float = None, seq: int = None):
+        # wait for a sample newer than seq (default: the newest at call time). (seq, sample) or None on timeout
+        if seq is None:
+            seq = self.__latest[0]
+
+        with self.__condition:
+            self.__waiters += 1
+            try:
+                if self.__condition.wait_for(lambda: self.__latest[0] > seq, timeout):
+                    return self.__latest
+                return None
+            finally:
+                self.__waiters -= 1
+
+    def __Store(self, sample: Any):
+        # only the listener writes; replacing the tuple is atomic for readers
+        self.__latest = (self.__latest[0] + 1, sample)
+        if self.__waiters:
+            with self.__condition:
+                self.__condition.notify_all()
+
 """
 " function ChannelFactoryInitialize. used to intialize channel everenment.
 """
-def ChannelFactoryInitialize(id: int = 0, networkInterface: str = None):
+def ChannelFactoryInitialize(id: int = 0, networkInterface: str = None, dispatchThreads: int = 1, config: str = None,
+                             backend: ChannelBackend = ChannelBackend.DDS):
     factory = ChannelFactory()
-    if not factory.Init(id, networkInterface):
+    if not factory.Init(id, networkInterface, None, dispatchThreads, config, backend):
         raise Exception("channel factory init error.")
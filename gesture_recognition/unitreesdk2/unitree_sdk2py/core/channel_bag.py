@@ -0,0 +1,382 @@
+import time
+import struct
+import importlib
+from typing import Any, List, Tuple
+from threading import Thread, Condition
+
+from .channel import ChannelPublisher, ChannelSubscriber, ChannelDeliverMode
+from .channel_qos import ChannelQosCreate
+
+
+"""
+" bag file layout, all integers little endian. append-only, a crashed recording
+" loses at most the chunk in flight: without index the reader scans chunk by chunk.
+"
+" header: magic, u16 topic count, per topic: u16 len + topic name, u16 len + type path
+" chunk:  b"CHNK", u32 record count, u32 record bytes, u64 first ns, u64 last ns, records
+" record: u16 topic index, u64 receive time ns, u32 len, cdr data
+"
+" every sample gets its own local receive time, also within a batch. source timestamps
+" are not used: they come from the writer's host clock, which need not agree with ours
+" or between topics, and the replayer paces by these times.
+" index:  b"INDX", u32 chunk count, per chunk: u64 offset, u64 first ns, u64 last ns, u32 count
+" footer: u64 index offset, end magic
+"""
+CHANNEL_BAG_MAGIC = b"UTBAG\x00\x01\x00"
+CHANNEL_BAG_END_MAGIC = b"UTBAGEND"
+
+"""
+" a chunk is written once it holds CHANNEL_BAG_CHUNK_SIZE bytes or is
+" CHANNEL_BAG_FLUSH_INTERVAL seconds old
+"""
+CHANNEL_BAG_CHUNK_SIZE = 1 << 20
+CHANNEL_BAG_FLUSH_INTERVAL = 0.5
+
+"""
+" the recorder thread moves pending samples into the chunk this often, so the
+" pending list stays short at video rates
+"""
+CHANNEL_BAG_WAKE_INTERVAL = 0.05
+
+"""
+" recorder reader history. best effort matches every writer, a reliable reader
+" would not match best effort telemetry writers
+"""
+CHANNEL_BAG_HISTORY = 64
+
+"""
+" max seconds the replayer waits for subscribers to match before the first sample
+"""
+CHANNEL_BAG_MATCH_TIMEOUT = 1.0
+
+_chunkHeader = struct.Struct("<4sIIQQ")
+_recordHeader = struct.Struct("<HQI")
+_indexHeader = struct.Struct("<4sI")
+_indexEntry = struct.Struct("<QQQI")
+_footer = struct.Struct("<Q8s")
+_u16 = struct.Struct("<H")
+
+
+def _TypePath(type: Any):
+    return type.__module__ + ":" + type.__qualname__
+
+
+def _TypeFromPath(path: str):
+    module, name = path.split(":", 1)
+    type = importlib.import_module(module)
+    for part in name.split("."):
+        type = getattr(type, part)
+    return type
+
+
+def _PackString(s: str):
+    data = s.encode("utf-8")
+    return _u16.pack(len(data)) + data
+
+
+"""
+" class ChannelRecorder
+" subscribes to (topic name, type) pairs and appends the cdr serialized samples
+" with their receive time to a bag file. the listeners serialize and append to a
+" list (samples may be reused by in-process writers), chunking and buffered bulk
+" writes happen on the recorder thread.
+"""
+class ChannelRecorder:
+    def __init__(self, path: str, topics: List[Tuple[str, Any]], chunkSize: int = CHANNEL_BAG_CHUNK_SIZE,
+                 flushInterval: float = CHANNEL_BAG_FLUSH_INTERVAL):
+        self.__path = path
+        self.__topics = list(topics)
+        self.__chunkSize = chunkSize
+        self.__flushInterval = flushInterval
+        self.__file = None
+        self.__subscribers = []
+        self.__pending = []
+        self.__condition = Condition()
+        self.__running = False
+        self.__thread = None
+        self.__index = []
+        self.__recordCount = 0
+        self.__byteCount = 0
+
+    def Start(self):
+        self.__file = open(self.__path, "wb")
+
+        header = [CHANNEL_BAG_MAGIC, _u16.pack(len(self.__topics))]
+        for name, type in self.__topics:
+            header.append(_PackString(name))
+            header.append(_PackString(_TypePath(type)))
+        self.__file.write(b"".join(header))
+
+        self.__running = True
+        self.__thread = Thread(target=self.__RecordThreadFunc, name="ch_recorder", daemon=True)
+        self.__thread.start()
+
+        qos = ChannelQosCreate(False, CHANNEL_BAG_HISTORY)
+        for i, (name, type) in enumerate(self.__topics):
+            sub = ChannelSubscriber(name, type)
+            sub.Init(self.__MakeHandler(i), deliverMode=ChannelDeliverMode.BATCH, qos=qos)
+            self.__subscribers.append(sub)
+
+    def Stop(self):
+        # closes the subscribers, writes what is pending, the index and the footer
+        for sub in self.__subscribers:
+            sub.Close()
+        self.__subscribers = []
+
+        with self.__condition:
+            self.__running = False
+            self.__condition.notify()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+
+        if self.__file is not None:
+            offset = self.__file.tell()
+            index = [_indexHeader.pack(b"INDX", len(self.__index))]
+            for entry in self.__index:
+                index.append(_indexEntry.pack(*entry))
+            index.append(_footer.pack(offset, CHANNEL_BAG_END_MAGIC))
+            self.__file.write(b"".join(index))
+            self.__file.close()
+            self.__file = None
+
+    def GetRecordCount(self):
+        return self.__recordCount
+
+    def GetByteCount(self):
+        return self.__byteCount
+
+    def __MakeHandler(self, topicIndex: int):
+        def Handler(samples: list):
+            self.__Append(topicIndex, samples)
+        return Handler
+
+    def __Append(self, topicIndex: int, samples: list):
+        records = [(time.time_ns(), sample.serialize()) for sample in samples]
+        with self.__condition:
+            self.__pending.append((topicIndex, records))
+
+    def __RecordThreadFunc(self):
+        chunk = []
+        chunkBytes = 0
+        chunkCount = 0
+        chunkFirst = 0
+        chunkLast = 0
+        chunkStart = time.monotonic()
+
+        while True:
+            with self.__condition:
+                if self.__running:
+                    self.__condition.wait(CHANNEL_BAG_WAKE_INTERVAL)
+                batches = self.__pending
+                self.__pending = []
+                running = self.__running
+
+            for topicIndex, records in batches:
+                if chunkCount == 0:
+                    chunkFirst = records[0][0]
+                    chunkLast = chunkFirst
+                    chunkStart = time.monotonic()
+                # listeners of different topics stamp before they append, batches may overlap by a little
+                chunkLast = max(chunkLast, records[-1][0])
+                for stamp, data in records:
+                    chunk.append(_recordHeader.pack(topicIndex, stamp, len(data)))
+                    chunk.append(data)
+                    chunkBytes += _recordHeader.size + len(data)
+                    chunkCount += 1
+
+                if chunkBytes >= self.__chunkSize:
+                    self.__WriteChunk(chunk, chunkBytes, chunkCount, chunkFirst, chunkLast)
+                    chunk = []
+                    chunkBytes = 0
+                    chunkCount = 0
+
+            if chunkCount and (not running or time.monotonic() - chunkStart >= self.__flushInterval):
+                self.__WriteChunk(chunk, chunkBytes, chunkCount, chunkFirst, chunkLast)
+                chunk = []
+                chunkBytes = 0
+                chunkCount = 0
+
+            if not running:
+                break
+
+    def __WriteChunk(self, chunk: list, chunkBytes: int, chunkCount: int, first: int, last: int):
+        offset = self.__file.tell()
+        self.__file.write(_chunkHeader.pack(b"CHNK", chunkCount, chunkBytes, first, last) + b"".join(chunk))
+        self.__file.flush()
+        self.__index.append((offset, first, last, chunkCount))
+        self.__recordCount += chunkCount
+        self.__byteCount += chunkBytes
+
+
+"""
+" class ChannelBagReader
+" reads a bag file. uses the index when the recording was stopped cleanly,
+" otherwise scans the chunks and stops at a truncated one.
+"""
+class ChannelBagReader:
+    def __init__(self, path: str):
+        self.__path = path
+        self.__file = None
+        self.__topics = []
+        self.__chunks = []
+
+    def Open(self):
+        self.__file = open(self.__path, "rb")
+
+        if self.__file.read(len(CHANNEL_BAG_MAGIC)) != CHANNEL_BAG_MAGIC:
+            raise Exception("not a bag file: " + self.__path)
+
+        count = _u16.unpack(self.__file.read(_u16.size))[0]
+        for _ in range(count):
+            name = self.__ReadString()
+            typePath = self.__ReadString()
+            self.__topics.append((name, typePath))
+
+        self.__chunks = self.__ReadIndex()
+        if self.__chunks is None:
+            self.__chunks = self.__ScanChunks(self.__file.tell())
+
+    def Close(self):
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+    def GetTopics(self):
+        # [(topic name, type path)]
+        return list(self.__topics)
+
+    def GetType(self, topicIndex: int):
+        return _TypeFromPath(self.__topics[topicIndex][1])
+
+    def GetRecordCount(self):
+        return sum(chunk[3] for chunk in self.__chunks)
+
+    def GetTimeRange(self):
+        # (first ns, last ns) or None for an empty bag
+        if not self.__chunks:
+            return None
+        return self.__chunks[0][1], self.__chunks[-1][2]
+
+    def Records(self):
+        # yields (topic index, receive time ns, cdr data) in recording order
+        for offset, first, last, count in self.__chunks:
+            self.__file.seek(offset)
+            _, count, size, _, _ = _chunkHeader.unpack(self.__file.read(_chunkHeader.size))
+            data = self.__file.read(size)
+            pos = 0
+            for _ in range(count):
+                topicIndex, stamp, length = _recordHeader.unpack_from(data, pos)
+                pos += _recordHeader.size
+                yield topicIndex, stamp, data[pos:pos + length]
+                pos += length
+
+    def __ReadString(self):
+        length = _u16.unpack(self.__file.read(_u16.size))[0]
+        return self.__file.read(length).decode("utf-8")
+
+    def __ReadIndex(self):
+        start = self.__file.tell()
+        end = self.__file.seek(0, 2)
+        if end - start < _footer.size:
+            self.__file.seek(start)
+            return None
+
+        self.__file.seek(end - _footer.size)
+        offset, magic = _footer.unpack(self.__file.read(_footer.size))
+        if magic != CHANNEL_BAG_END_MAGIC:
+            self.__file.seek(start)
+            return None
+
+        self.__file.seek(offset)
+        _, count = _indexHeader.unpack(self.__file.read(_indexHeader.size))
+        data = self.__file.read(count * _indexEntry.size)
+        return [_indexEntry.unpack_from(data, i * _indexEntry.size) for i in range(count)]
+
+    def __ScanChunks(self, offset: int):
+        end = self.__file.seek(0, 2)
+        chunks = []
+        while offset + _chunkHeader.size <= end:
+            self.__file.seek(offset)
+            tag, count, size, first, last = _chunkHeader.unpack(self.__file.read(_chunkHeader.size))
+            if tag != b"CHNK" or offset + _chunkHeader.size + size > end:
+                break
+            chunks.append((offset, first, last, count))
+            offset += _chunkHeader.size + size
+        return chunks
+
+
+"""
+" class ChannelReplayer
+" republishes a bag. rate 1.0 is real time, 2.0 twice as fast, 0 as fast as possible.
+" topics restricts the replay to these topic names, prefix is put before every name.
+" publishing starts once every publisher matched a subscriber, or after matchTimeout.
+"""
+class ChannelReplayer:
+    def __init__(self, path: str, rate: float = 1.0, topics: List[str] = None, prefix: str = "",
+                 matchTimeout: float = CHANNEL_BAG_MATCH_TIMEOUT):
+        self.__path = path
+        self.__matchTimeout = matchTimeout
+        self.__rate = rate
+        self.__topics = None if topics is None else set(topics)
+        self.__prefix = prefix
+        self.__stop = False
+        self.__publishCount = 0
+
+    def Run(self):
+        # blocks until the bag is replayed or Stop is called, returns the published sample count
+        reader = ChannelBagReader(self.__path)
+        reader.Open()
+        try:
+            publishers = []
+            for i, (name, typePath) in enumerate(reader.GetTopics()):
+                if self.__topics is not None and name not in self.__topics:
+                    publishers.append(None)
+                    continue
+                type = reader.GetType(i)
+                pub = ChannelPublisher(self.__prefix + name, type)
+                pub.Init()
+                publishers.append((pub, type))
+
+            # samples written before discovery matched the subscribers would be lost.
+            # matchTimeout bounds the wait for all publishers together
+            deadline = time.monotonic() + self.__matchTimeout
+            for i, entry in enumerate(publishers):
+                if entry is not None and not entry[0].WaitMatched(max(0.0, deadline - time.monotonic())):
+                    print("[ChannelReplayer] no subscriber matched. topic:", reader.GetTopics()[i][0])
+
+            self.__publishCount = 0
+            startStamp = None
+            startTime = time.monotonic()
+            for topicIndex, stamp, data in reader.Records():
+                if self.__stop:
+                    break
+
+                entry = publishers[topicIndex]
+                if entry is None:
+                    continue
+
+                if startStamp is None:
+                    startStamp = stamp
+                elif self.__rate > 0:
+                    delay = startTime + (stamp - startStamp) / 1e9 / self.__rate - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+
+                pub, type = entry
+                pub.Write(type.deserialize(data))
+                self.__publishCount += 1
+
+            for entry in publishers:
+                if entry is not None:
+                    entry[0].Close()
+        finally:
+            reader.Close()
+
+        return self.__publishCount
+
+    def Stop(self):
+        self.__stop = True
+
+    def GetPublishCount(self):
+        return self.__publishCount
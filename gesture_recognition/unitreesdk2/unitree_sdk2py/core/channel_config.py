@@ -1,25 +1,82 @@
-ChannelConfigHasInterface = '''<?xml version="1.0" encoding="UTF-8" ?>
-    <CycloneDDS>
-        <Domain Id="any">
-            <General>
-                <Interfaces>
-                    <NetworkInterface name="$__IF_NAME__$" priority="default" multicast="default"/>
-                </Interfaces>
-            </General>
-            <Tracing>
-                <Verbosity>config</Verbosity>
-            <OutputFile>/tmp/cdds.LOG</OutputFile>
-        </Tracing>
-        </Domain>
-    </CycloneDDS>'''
-
-ChannelConfigAutoDetermine = '''<?xml version="1.0" encoding="UTF-8" ?>
-    <CycloneDDS>
-        <Domain Id="any">
-            <General>
-                <Interfaces>
-                    <NetworkInterface autodetermine=\"true\" priority=\"default\" multicast=\"default\" />
-                </Interfaces>
-            </General>
-        </Domain>
-    </CycloneDDS>'''
+import os
+
+"""
+" iceoryx RouDi management segment, exists while the RouDi daemon runs
+"""
+CHANNEL_CONFIG_ROUDI_SEGMENT = "/dev/shm/iceoryx_mgmt"
+
+
+"""
+" function ChannelConfigSharedMemoryAvailable
+" true if the loaded cyclonedds is linked with iceoryx and RouDi is running.
+"""
+def ChannelConfigSharedMemoryAvailable():
+    if not os.path.exists(CHANNEL_CONFIG_ROUDI_SEGMENT):
+        return False
+
+    try:
+        # libddsc is loaded with cyclonedds, look for the iceoryx library next to it
+        import cyclonedds.core
+        with open("/proc/self/maps") as f:
+            return "iceoryx" in f.read()
+    except OSError:
+        return False
+
+
+"""
+" function ChannelConfigCreate
+" builds a cyclonedds xml config.
+" networkInterface: interface name, None to let cyclonedds choose.
+" traceFile: write the cyclonedds trace (at traceVerbosity) to this file, None disables tracing.
+" socketReceiveBufferSize/socketSendBufferSize: minimum socket buffer sizes in bytes.
+" maxMessageSize/fragmentSize: rtps message and fragment sizes in bytes, for large samples
+"     such as video frames and point clouds.
+" sharedMemory: use the iceoryx shared memory transport for same host peers. None enables it
+"     when available, see ChannelConfigSharedMemoryAvailable.
+"""
+def ChannelConfigCreate(networkInterface: str = None, traceFile: str = None, traceVerbosity: str = "config",
+                        socketReceiveBufferSize: int = None, socketSendBufferSize: int = None,
+                        maxMessageSize: int = None, fragmentSize: int = None, sharedMemory: bool = False):
+    general = []
+    if networkInterface is None:
+        general.append('<Interfaces><NetworkInterface autodetermine="true" priority="default" multicast="default"/></Interfaces>')
+    else:
+        general.append('<Interfaces><NetworkInterface name="' + networkInterface + '" priority="default" multicast="default"/></Interfaces>')
+
+    if maxMessageSize is not None:
+        general.append('<MaxMessageSize>' + str(int(maxMessageSize)) + 'B</MaxMessageSize>')
+
+    if fragmentSize is not None:
+        general.append('<FragmentSize>' + str(int(fragmentSize)) + 'B</FragmentSize>')
+
+    internal = []
+    if socketReceiveBufferSize is not None:
+        internal.append('<SocketReceiveBufferSize min="' + str(int(socketReceiveBufferSize)) + 'B"/>')
+
+    if socketSendBufferSize is not None:
+        internal.append('<SocketSendBufferSize min="' + str(int(socketSendBufferSize)) + 'B"/>')
+
+    if sharedMemory is None:
+        sharedMemory = ChannelConfigSharedMemoryAvailable()
+
+    sections = ['<General>' + ''.join(general) + '</General>']
+
+    if internal:
+        sections.append('<Internal>' + ''.join(internal) + '</Internal>')
+
+    if sharedMemory:
+        sections.append('<SharedMemory><Enable>true</Enable></SharedMemory>')
+
+    if traceFile is not None:
+        sections.append('<Tracing><Verbosity>' + traceVerbosity + '</Verbosity><OutputFile>' + traceFile + '</OutputFile></Tracing>')
+
+    return ('<?xml version="1.0" encoding="UTF-8" ?>'
+            '<CycloneDDS><Domain Id="any">' + ''.join(sections) + '</Domain></CycloneDDS>')
+
+
+"""
+" presets kept for compatibility. tracing is off, pass traceFile to ChannelConfigCreate to get it back
+"""
+ChannelConfigHasInterface = ChannelConfigCreate("$__IF_NAME__$")
+
+ChannelConfigAutoDetermine = ChannelConfigCreate()
@@ -0,0 +1,178 @@
+import sys
+import time
+from typing import Callable
+from threading import Thread, RLock
+
+from cyclonedds.core import DDSException, WaitSet, ReadCondition, GuardCondition, SampleState, ViewState, InstanceState
+from cyclonedds.domain import DomainParticipant
+from cyclonedds.sub import DataReader
+from cyclonedds.util import duration
+
+
+"""
+" read condition mask: any sample still held by the reader
+"""
+CHANNEL_DISPATCH_MASK = SampleState.Any | ViewState.Any | InstanceState.Any
+
+"""
+" rounds run back to back before the worker waits again, and the pause taken when they
+" are used up or a callback raised: a reader whose callback leaves samples behind (or
+" fails to take them) keeps its condition triggered
+"""
+CHANNEL_DISPATCH_MAX_ROUNDS = 64
+CHANNEL_DISPATCH_BACKOFF = 0.001
+
+
+"""
+" class ChannelDispatcher
+" serves many readers from one thread (or a small pool) instead of one listener
+" plus queue thread per reader. each reader is pinned to one dispatch thread, which
+" waits on a WaitSet of read conditions and keeps per reader order.
+" one round calls every triggered reader once, higher priority first and rotating
+" between readers of equal priority. a reader callback takes at most one batch per
+" call, so a flooding topic cannot starve the others sharing its thread. a callback
+" that raised is left out of the rest of the rounds and retried after a short backoff,
+" its samples stay in the reader.
+"""
+class ChannelDispatcher:
+
+    """
+    " internal class __Entry
+    """
+    class __Entry:
+        def __init__(self, reader: DataReader, callback: Callable, priority: int):
+            self.reader = reader
+            self.callback = callback
+            self.priority = priority
+            self.condition = ReadCondition(reader, CHANNEL_DISPATCH_MASK)
+
+    """
+    " internal class __Worker
+    """
+    class __Worker:
+        def __init__(self, participant: DomainParticipant, name: str):
+            self.__waitSet = WaitSet(participant)
+            self.__guard = GuardCondition(participant)
+            self.__waitSet.attach(self.__guard)
+            self.__lock = RLock()
+            self.__entries = []
+            self.__groups = ()
+            self.__quit = False
+            self.__thread = Thread(target=self.__WorkerThreadFunc, name=name, daemon=True)
+            self.__thread.start()
+
+        def Size(self):
+            return len(self.__entries)
+
+        def Add(self, entry):
+            with self.__lock:
+                self.__waitSet.attach(entry.condition)
+                self.__entries.append(entry)
+                self.__Regroup()
+            self.__guard.set(True)
+
+        def Remove(self, reader: DataReader):
+            # the lock is held for a whole round, so no callback for the reader runs after this returns
+            with self.__lock:
+                for i, entry in enumerate(self.__entries):
+                    if entry.reader is reader:
+                        self.__waitSet.detach(entry.condition)
+                        del self.__entries[i]
+                        self.__Regroup()
+                        return True
+            return False
+
+        def Close(self):
+            self.__quit = True
+            self.__guard.set(True)
+            self.__thread.join()
+
+        def __Regroup(self):
+            # readers grouped by priority, highest first. groups are lists so rounds can rotate them
+            priorities = sorted(set(entry.priority for entry in self.__entries), reverse=True)
+            self.__groups = tuple([entry for entry in self.__entries if entry.priority == p] for p in priorities)
+
+        def __WorkerThreadFunc(self):
+            waitTime = duration(infinite=True)
+            while not self.__quit:
+                try:
+                    self.__waitSet.wait(waitTime)
+                except DDSException as e:
+                    print("[ChannelDispatcher] catch DDSException msg:", e.msg)
+                    continue
+
+                if self.__guard.read():
+                    self.__guard.set(False)
+
+                # rounds until no reader has data left, at most CHANNEL_DISPATCH_MAX_ROUNDS
+                busy = True
+                rounds = 0
+                failed = set()
+                while busy and not self.__quit and rounds < CHANNEL_DISPATCH_MAX_ROUNDS:
+                    with self.__lock:
+                        busy = self.__Round(failed)
+                    rounds += 1
+
+                # still busy or failing: back off instead of spinning on conditions that stay triggered
+                if busy or failed:
+                    time.sleep(CHANNEL_DISPATCH_BACKOFF)
+
+        def __Round(self, failed: set):
+            # failed: ids of entries whose callback raised, skipped until the next wait
+            busy = False
+            for group in self.__groups:
+                for entry in group:
+                    if id(entry) in failed or not entry.condition.triggered:
+                        continue
+                    busy = True
+                    try:
+                        entry.callback(entry.reader)
+                    except:
+                        info = sys.exc_info()
+                        print(f"[ChannelDispatcher] callback raise exception: name={info[0].__name__}, args={str(info[1].args)}")
+                        failed.add(id(entry))
+
+                # next round starts with the next reader of equal priority
+                if len(group) > 1:
+                    group.append(group.pop(0))
+            return busy
+
+
+    def __init__(self, participant: DomainParticipant, threadCount: int = 1):
+        self.__participant = participant
+        self.__threadCount = max(1, threadCount)
+        self.__workers = []
+        self.__readers = {}
+        self.__lock = RLock()
+
+    def Register(self, reader: DataReader, callback: Callable, priority: int = 0):
+        # callback(reader) is called from a dispatch thread whenever the reader holds samples
+        with self.__lock:
+            if id(reader) in self.__readers:
+                return
+
+            if len(self.__workers) < self.__threadCount:
+                worker = self.__Worker(self.__participant, "ch_dispatch_" + str(len(self.__workers)))
+                self.__workers.append(worker)
+            else:
+                worker = min(self.__workers, key=lambda w: w.Size())
+
+            worker.Add(self.__Entry(reader, callback, priority))
+            self.__readers[id(reader)] = worker
+
+    def Unregister(self, reader: DataReader):
+        with self.__lock:
+            worker = self.__readers.pop(id(reader), None)
+            if worker is None:
+                return False
+            return worker.Remove(reader)
+
+    def GetThreadCount(self):
+        return len(self.__workers)
+
+    def Close(self):
+        with self.__lock:
+            for worker in self.__workers:
+                worker.Close()
+            self.__workers = []
+            self.__readers = {}
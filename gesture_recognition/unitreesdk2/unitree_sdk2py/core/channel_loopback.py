@@ -0,0 +1,195 @@
+from typing import Any, Callable
+from threading import Thread, Event, Lock, Condition
+
+from cyclonedds.qos import Qos, Policy
+
+from .channel import ChannelDeliverMode, CHANNEL_TAKE_MAX
+from .channel_qos import ChannelQosResolve
+from ..utils.bqueue import BQueue
+
+
+"""
+" history of loopback readers without handler, when the qos has no KeepLast depth.
+" dds readers default to KeepLast(1)
+"""
+CHANNEL_LOOPBACK_HISTORY = 1
+CHANNEL_LOOPBACK_KEEP_ALL = 1 << 16
+
+
+"""
+" class LoopbackBus
+" in-process transport: topic name -> readers. samples are passed by reference,
+" nothing is serialized or copied.
+"""
+class LoopbackBus:
+    def __init__(self):
+        self.__lock = Lock()
+        self.__matched = Condition(self.__lock)
+        self.__readers = {}
+
+    def AddReader(self, name: str, reader):
+        with self.__lock:
+            self.__readers[name] = self.__readers.get(name, ()) + (reader,)
+            self.__matched.notify_all()
+
+    def RemoveReader(self, name: str, reader):
+        with self.__lock:
+            readers = tuple(r for r in self.__readers.get(name, ()) if r is not reader)
+            if readers:
+                self.__readers[name] = readers
+            else:
+                self.__readers.pop(name, None)
+
+    def GetReaders(self, name: str):
+        # tuples are replaced, never changed, so writers can iterate without the lock
+        return self.__readers.get(name, ())
+
+    def WaitReaders(self, name: str, timeout: float):
+        with self.__lock:
+            return self.__matched.wait_for(lambda: name in self.__readers, timeout)
+
+
+"""
+" class LoopbackChannel
+" same interface and semantics as Channel. handlers without queue run in the
+" writer's thread, like dds local delivery.
+"""
+class LoopbackChannel:
+
+    """
+    " internal class __Reader
+    """
+    class __Reader:
+        def __init__(self):
+            self.__handler = None
+            self.__queue = None
+            self.__queueEnable = False
+            self.__threadEvent = None
+            self.__threadReader = None
+            self.__deliverMode = ChannelDeliverMode.EACH
+            self.__history = None
+            self.__droppedCount = 0
+            self.__droppedLock = Lock()
+
+        def Init(self, qos: Qos = None, handler: Callable = None, queueLen: int = 0,
+                 deliverMode: ChannelDeliverMode = ChannelDeliverMode.EACH):
+            if handler is None:
+                self.__history = BQueue(self.__HistoryDepth(qos))
+            else:
+                self.__handler = handler
+                self.__deliverMode = deliverMode
+                if queueLen > 0:
+                    self.__queueEnable = True
+                    # LATEST keeps one pending sample: a deeper queue would hand stale samples to the handler
+                    self.__queue = BQueue(1 if deliverMode == ChannelDeliverMode.LATEST else queueLen)
+                    self.__threadEvent = Event()
+                    self.__threadReader = Thread(target=self.__ChannelReaderThreadFunc, name="ch_reader", daemon=True)
+                    self.__threadReader.start()
+
+        def Read(self, timeout: float = None):
+            if self.__history is None:
+                return None
+
+            sample = self.__history.Get(timeout)
+            if sample is None:
+                print("[Reader] take sample timeout")
+            return sample
+
+        def Close(self):
+            if self.__queueEnable:
+                self.__threadEvent.set()
+                self.__queue.Interrupt()
+                self.__queue.Clear()
+                self.__threadReader.join()
+
+        def Deliver(self, sample: Any):
+            if self.__history is not None:
+                self.__history.Put(sample, True)
+                return
+
+            mode = self.__deliverMode
+            if mode == ChannelDeliverMode.BATCH:
+                sample = [sample]
+
+            if self.__queueEnable:
+                if not self.__queue.Put(sample, mode == ChannelDeliverMode.LATEST) and mode != ChannelDeliverMode.LATEST:
+                    # writers of any thread deliver here
+                    with self.__droppedLock:
+                        self.__droppedCount += 1
+                    print("[Reader] queue full, samples dropped:", 1)
+            else:
+                self.__handler(sample)
+
+        def GetDroppedCount(self):
+            with self.__droppedLock:
+                return self.__droppedCount
+
+        def __HistoryDepth(self, qos: Qos):
+            history = None if qos is None else qos[Policy.History]
+            if history is None:
+                return CHANNEL_LOOPBACK_HISTORY
+            return getattr(history, "depth", CHANNEL_LOOPBACK_KEEP_ALL)
+
+        def __ChannelReaderThreadFunc(self):
+            while not self.__threadEvent.is_set():
+                sample = self.__queue.Get()
+                if sample is not None:
+                    self.__handler(sample)
+
+
+    # channel __init__
+    def __init__(self, bus: LoopbackBus, name: str, type: Any):
+        self.__bus = bus
+        self.__name = name
+        self.__reader = None
+
+    def SetWriter(self, qos: Any = None):
+        pass
+
+    def SetReader(self, qos: Any = None, handler: Callable = None, queueLen: int = 0,
+                  deliverMode: ChannelDeliverMode = ChannelDeliverMode.EACH, takeMax: int = CHANNEL_TAKE_MAX,
+                  dispatcher: Any = None, priority: int = 0):
+        # takeMax, dispatcher and priority have no meaning without a dds reader cache
+        self.__reader = self.__Reader()
+        self.__reader.Init(ChannelQosResolve(qos), handler, queueLen, deliverMode)
+        self.__bus.AddReader(self.__name, self.__reader)
+
+    def Write(self, sample: Any, timeout: float = None):
+        readers = self.__bus.GetReaders(self.__name)
+
+        # like dds: with a timeout, wait for a matched reader and fail without one
+        if timeout is not None and not readers:
+            if not self.__bus.WaitReaders(self.__name, timeout):
+                return False
+            readers = self.__bus.GetReaders(self.__name)
+
+        for reader in readers:
+            reader.Deliver(sample)
+
+        return True
+
+    def Read(self, timeout: float = None):
+        if self.__reader is None:
+            return None
+        return self.__reader.Read(timeout)
+
+    def WaitWriterMatched(self, timeout: float = None):
+        return self.__bus.WaitReaders(self.__name, timeout)
+
+    def WaitReaderMatched(self, timeout: float = None):
+        # no discovery in-process, every writer reaches the reader at once
+        return self.__reader is not None
+
+    def GetDroppedCount(self):
+        if self.__reader is None:
+            return 0
+        return self.__reader.GetDroppedCount()
+
+    def CloseReader(self):
+        if self.__reader is not None:
+            self.__bus.RemoveReader(self.__name, self.__reader)
+            self.__reader.Close()
+            self.__reader = None
+
+    def CloseWriter(self):
+        pass
@@ -0,0 +1,70 @@
+from typing import Any
+
+from cyclonedds.qos import Qos, Policy
+from cyclonedds.util import duration
+
+"""
+" names of the preset qos profiles
+" sensor: high rate telemetry, only the newest sample matters. BestEffort/KeepLast(1)
+" command: commands that must not be lost. Reliable/KeepLast(10)
+" rpc: rpc requests and responses, bursts of calls are kept. Reliable/KeepLast(32)
+"""
+CHANNEL_QOS_SENSOR = "sensor"
+CHANNEL_QOS_COMMAND = "command"
+CHANNEL_QOS_RPC = "rpc"
+
+
+"""
+" function ChannelQosCreate
+" deadline and latencyBudget in seconds, None keeps the dds default.
+" maxBlockingTime is how long a reliable write may block on full resources.
+"""
+def ChannelQosCreate(reliable: bool, depth: int, deadline: float = None, latencyBudget: float = None,
+                     maxBlockingTime: float = 0.1):
+    policies = [Policy.History.KeepLast(max(1, depth))]
+
+    if reliable:
+        policies.append(Policy.Reliability.Reliable(duration(seconds=maxBlockingTime)))
+    else:
+        policies.append(Policy.Reliability.BestEffort)
+
+    if deadline is not None:
+        policies.append(Policy.Deadline(duration(seconds=deadline)))
+
+    if latencyBudget is not None:
+        policies.append(Policy.LatencyBudget(duration(seconds=latencyBudget)))
+
+    return Qos(*policies)
+
+
+_channelQosProfiles = {
+    CHANNEL_QOS_SENSOR: ChannelQosCreate(False, 1),
+    CHANNEL_QOS_COMMAND: ChannelQosCreate(True, 10),
+    CHANNEL_QOS_RPC: ChannelQosCreate(True, 32),
+}
+
+
+"""
+" function ChannelQosRegister. add or replace a named profile
+"""
+def ChannelQosRegister(name: str, qos: Qos):
+    _channelQosProfiles[name] = qos
+
+
+"""
+" function ChannelQosGet
+"""
+def ChannelQosGet(name: str):
+    qos = _channelQosProfiles.get(name)
+    if qos is None:
+        raise Exception("unknown channel qos profile: " + str(name))
+    return qos
+
+
+"""
+" function ChannelQosResolve. qos may be None, a Qos or a profile name
+"""
+def ChannelQosResolve(qos: Any):
+    if qos is None or isinstance(qos, Qos):
+        return qos
+    return ChannelQosGet(qos)
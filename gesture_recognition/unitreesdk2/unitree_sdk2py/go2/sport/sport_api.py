@@ -56,6 +56,7 @@ SPORT_API_ID_HEART = 1036
 """
 # client side
 SPORT_ERR_CLIENT_POINT_PATH = 4101
+SPORT_ERR_CLIENT_MOVE_PARAMETER = 4102
 # server side
 SPORT_ERR_SERVER_OVERTIME = 4201
 SPORT_ERR_SERVER_NOT_INIT = 4202
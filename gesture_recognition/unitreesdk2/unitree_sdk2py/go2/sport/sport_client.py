@@ -1,4 +1,5 @@
 import json
+import math
 
 from ...rpc.client import Client
 from .sport_api import *
@@ -9,6 +10,13 @@ from .sport_api import *
 SPORT_PATH_POINT_SIZE = 30
 
 
+"""
+" parameter templates. serialized once and reused on every call.
+"""
+SPORT_PARAMETER_EMPTY = json.dumps({})
+SPORT_PARAMETER_MOVE = '{"x": %s, "y": %s, "z": %s}'
+
+
 """
 " class PathPoint
 """
@@ -75,43 +83,37 @@ class SportClient(Client):
 
     # 1001
     def Damp(self):
-        p = {}
-        parameter = json.dumps(p)
+        parameter = SPORT_PARAMETER_EMPTY
         code, data = self._Call(SPORT_API_ID_DAMP, parameter)
         return code
     
     # 1002
     def BalanceStand(self):
-        p = {}
-        parameter = json.dumps(p)
+        parameter = SPORT_PARAMETER_EMPTY
         code, data = self._Call(SPORT_API_ID_BALANCESTAND, parameter)
         return code
     
     # 1003
     def StopMove(self):
-        p = {}
-        parameter = json.dumps(p)
+        parameter = SPORT_PARAMETER_EMPTY
         code, data = self._Call(SPORT_API_ID_STOPMOVE, parameter)
         return code
 
     # 1004
     def StandUp(self):
-        p = {}
-        parameter = json.dumps(p)
+        parameter = SPORT_PARAMETER_EMPTY
         code, data = self._Call(SPORT_API_ID_STANDUP, parameter)
         return code
 
     # 1005
     def StandDown(self):
-        p = {}
-        parameter = json.dumps(p)
+        parameter = SPORT_PARAMETER_EMPTY
         code, data = self._Call(SPORT_API_ID_STANDDOWN, parameter)
         return code
 
     # 1006
     def RecoveryStand(self):
-        p = {}
-        parameter = json.dumps(p)
+        parameter = SPORT_PARAMETER_EMPTY
         code, data = self._Call(SPORT_API_ID_RECOVERYSTAND, parameter)
         return code
 
@@ -127,25 +129,25 @@ class SportClient(Client):
 
     # 1008
     def Move(self, vx: float, vy: float, vyaw: float):
-        p = {}
-        p["x"] = vx
-        p["y"] = vy
-        p["z"] = vyaw
-        parameter = json.dumps(p)
+        vx, vy, vyaw = float(vx), float(vy), float(vyaw)
+        # nan/inf repr is not json, and a computed velocity that is not finite must not reach the robot
+        if not (math.isfinite(vx) and math.isfinite(vy) and math.isfinite(vyaw)):
+            return SPORT_ERR_CLIENT_MOVE_PARAMETER
+
+        # float repr is what json.dumps emits for finite floats, without the encoder overhead
+        parameter = SPORT_PARAMETER_MOVE % (float.__repr__(vx), float.__repr__(vy), float.__repr__(vyaw))
         code = self._CallNoReply(SPORT_API_ID_MOVE, parameter)
         return code
 
     # 1009
     def Sit(self):
-        p = {}
-        parameter = json.dumps(p)
+        parameter = SPORT_PARAMETER_EMPTY
         code, data = self._Call(SPORT_API_ID_SIT, parameter)
         return code
 
     #1010
     def RiseSit(self):
-        p = {}
-        parameter = json.dumps(p)
+        parameter = SPORT_PARAMETER_EMPTY
         code, data = self._Call(SPORT_API_ID_RISESIT, parameter)
         return code
 
@@ -159,8 +161,7 @@ class SportClient(Client):
 
     # 1012
     def Trigger(self):
-        p = {}
-        parameter = json.dumps(p)
+        parameter = SPORT_PARAMETER_EMPTY
         code, data = self._Call(SPORT_API_ID_TRIGGER, parameter)
         return code
 
@@ -190,15 +191,13 @@ class SportClient(Client):
 
     # 1016
     def Hello(self):
-        p = {}
-        parameter = json.dumps(p)
+        parameter = SPORT_PARAMETER_EMPTY
         code, data = self._Call(SPORT_API_ID_HELLO, parameter)
         return code
 
     # 1017
     def Stretch(self):
-        p = {}
-        parameter = json.dumps(p)
+        parameter = SPORT_PARAMETER_EMPTY
         code, data = self._Call(SPORT_API_ID_STRETCH, parameter)
         return code
 
@@ -242,29 +241,25 @@ class SportClient(Client):
     
     # 1021
     def Wallow(self):
-        p = {}
-        parameter = json.dumps(p)
+        parameter = SPORT_PARAMETER_EMPTY
         code, data = self._Call(SPORT_API_ID_WALLOW, parameter)
         return code
 
     # 1022
     def Dance1(self):
-        p = {}
-        parameter = json.dumps(p)
+        parameter = SPORT_PARAMETER_EMPTY
         code, data = self._Call(SPORT_API_ID_DANCE1, parameter)
         return code
 
     # 1023
     def Dance2(self):
-        p = {}
-        parameter = json.dumps(p)
+        parameter = SPORT_PARAMETER_EMPTY
         code, data = self._Call(SPORT_API_ID_DANCE2, parameter)
         return code
 
     # 1025
     def GetFootRaiseHeight(self):
-        p = {}
-        parameter = json.dumps(p)
+        parameter = SPORT_PARAMETER_EMPTY
         
         code, data = self._Call(SPORT_API_ID_GETFOOTRAISEHEIGHT, parameter)
         
@@ -277,8 +272,7 @@ class SportClient(Client):
 
     # 1026
     def GetSpeedLevel(self):
-        p = {}
-        parameter = json.dumps(p)
+        parameter = SPORT_PARAMETER_EMPTY
         
         code, data = self._Call(SPORT_API_ID_GETSPEEDLEVEL, parameter)
         
@@ -306,36 +300,31 @@ class SportClient(Client):
 
     # 1029
     def Scrape(self):
-        p = {}
-        parameter = json.dumps(p)
+        parameter = SPORT_PARAMETER_EMPTY
         code, data = self._Call(SPORT_API_ID_SCRAPE, parameter)
         return code
 
     # 1030
     def FrontFlip(self):
-        p = {}
-        parameter = json.dumps(p)
+        parameter = SPORT_PARAMETER_EMPTY
         code, data = self._Call(SPORT_API_ID_FRONTFLIP, parameter)
         return code
 
     # 1031
     def FrontJump(self):
-        p = {}
-        parameter = json.dumps(p)
+        parameter = SPORT_PARAMETER_EMPTY
         code, data = self._Call(SPORT_API_ID_FRONTJUMP, parameter)
         return code
 
     # 1032
     def FrontPounce(self):
-        p = {}
-        parameter = json.dumps(p)
+        parameter = SPORT_PARAMETER_EMPTY
         code, data = self._Call(SPORT_API_ID_FRONTPOUNCE, parameter)
         return code
 
     # 1033
     def WiggleHips(self):
-        p = {}
-        parameter = json.dumps(p)
+        parameter = SPORT_PARAMETER_EMPTY
         code, data = self._Call(SPORT_API_ID_WIGGLEHIPS, parameter)
         return code
 
@@ -358,7 +347,6 @@ class SportClient(Client):
 
     # 1036
     def Heart(self):
-        p = {}
-        parameter = json.dumps(p)
+        parameter = SPORT_PARAMETER_EMPTY
         code, data = self._Call(SPORT_API_ID_HEART, parameter)
         return code
\ No newline at end of file
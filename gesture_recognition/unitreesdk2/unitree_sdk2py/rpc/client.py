@@ -18,9 +18,15 @@ class Client(ClientBase):
             self.__leaseClient = LeaseClient(serviceName)
             self.__leaseClient.Init()
 
-    def WaitLeaseApplied(self):
+    def WaitLeaseApplied(self, timeout: float = None):
         if self.__enableLease:
-            self.__leaseClient.WaitApplied()
+            return self.__leaseClient.WaitApplied(timeout)
+
+    def GetLeaseRenewalStats(self):
+        if self.__enableLease:
+            return self.__leaseClient.GetRenewalStats()
+        else:
+            return None
 
     def GetLeaseId(self):
         if self.__enableLease:
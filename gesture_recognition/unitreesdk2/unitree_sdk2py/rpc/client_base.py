@@ -1,4 +1,5 @@
 import time
+import itertools
 
 from ..idl.unitree_api.msg.dds_ import Request_ as Request
 from ..idl.unitree_api.msg.dds_ import RequestHeader_ as RequestHeader
@@ -9,15 +10,26 @@ from ..idl.unitree_api.msg.dds_ import RequestPolicy_ as RequestPolicy
 from ..utils.future import FutureResult
 
 from .client_stub import ClientStub
+from .request_future import RequestFuture
 from .internal import *
 
 
+"""
+" request id generator. shared by all clients of the process, since clients of the
+" same service receive each other's responses. next() on itertools.count is atomic
+" under the GIL; seeding with the monotonic clock keeps ids apart across restarts.
+"""
+_requestIdCounter = itertools.count(time.monotonic_ns())
+
+
 """
 " class ClientBase
 """
 class ClientBase:
     def __init__(self, serviceName: str):
         self.__timeout = 1.0
+        self.__lease = RequestLease(0)
+        self.__policies = {}
         self.__stub = ClientStub(serviceName)
         self.__stub.Init()
 
@@ -47,6 +59,16 @@ class ClientBase:
         else:
             return response.header.status.code, response.data
 
+    def _CallAsyncBase(self, apiId: int, parameter: str, proirity: int = 0, leaseId: int = 0):
+        # send without waiting: the request future (None on send error), its result value is the
+        # Response_. a future given up on must be released with _CancelBase
+        header = self.__SetHeader(apiId, leaseId, proirity, False)
+        request = Request(header, parameter, [])
+        return self.__stub.SendRequest(request, self.__timeout, False)
+
+    def _CancelBase(self, future: RequestFuture):
+        self.__stub.RemoveFuture(future.GetRequestId())
+
     def _CallNoReplyBase(self, apiId: int, parameter: str, proirity: int, leaseId: int):
         header = self.__SetHeader(apiId, leaseId, proirity, True)
         request = Request(header, parameter, [])
@@ -87,7 +109,18 @@ class ClientBase:
             return RPC_ERR_CLIENT_SEND
     
     def __SetHeader(self, apiId: int, leaseId: int, priority: int, noReply: bool):
-        identity = RequestIdentity(time.monotonic_ns(), apiId)
-        lease = RequestLease(leaseId)
-        policy = RequestPolicy(priority, noReply)
+        # lease and policy are constant between calls, only the identity changes.
+        # samples are serialized on write, so sharing them between requests is safe.
+        identity = RequestIdentity(next(_requestIdCounter), apiId)
+
+        lease = self.__lease
+        if lease.id != leaseId:
+            lease = RequestLease(leaseId)
+            self.__lease = lease
+
+        policy = self.__policies.get((priority, noReply))
+        if policy is None:
+            policy = RequestPolicy(priority, noReply)
+            self.__policies[(priority, noReply)] = policy
+
         return RequestHeader(identity, lease, policy)
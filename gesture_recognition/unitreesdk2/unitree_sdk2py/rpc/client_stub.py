@@ -7,10 +7,17 @@ from ..idl.unitree_api.msg.dds_ import Request_ as Request
 from ..idl.unitree_api.msg.dds_ import Response_ as Response
 
 from ..core.channel import ChannelFactory
+from ..core.channel_qos import CHANNEL_QOS_RPC
 from ..core.channel_name import ChannelType, GetClientChannelName
 from .request_future import RequestFuture, RequestFutureQueue
 
 
+"""
+" max seconds ClientStub.Init waits for the server's channels to match
+"""
+CLIENT_STUB_MATCH_TIMEOUT = 0.5
+
+
 """
 " class ClientStub
 """
@@ -27,10 +34,16 @@ class ClientStub:
         self.__futureQueue = RequestFutureQueue()
 
         # create channel
-        self.__sendChannel = factory.CreateSendChannel(GetClientChannelName(self.__serviceName, ChannelType.SEND), Request)
+        self.__sendChannel = factory.CreateSendChannel(GetClientChannelName(self.__serviceName, ChannelType.SEND), Request,
+                                    CHANNEL_QOS_RPC)
         self.__recvChannel = factory.CreateRecvChannel(GetClientChannelName(self.__serviceName, ChannelType.RECV), Response,
-                                    self.__ResponseHandler,10)
-        time.sleep(0.5)
+                                    self.__ResponseHandler, dispatch=True, qos=CHANNEL_QOS_RPC)
+
+        # wait until the server's channels are matched, at most CLIENT_STUB_MATCH_TIMEOUT in total.
+        # without a server this returns after the timeout, calls then fail on their own timeouts
+        deadline = time.monotonic() + CLIENT_STUB_MATCH_TIMEOUT
+        self.__sendChannel.WaitWriterMatched(CLIENT_STUB_MATCH_TIMEOUT)
+        self.__recvChannel.WaitReaderMatched(max(0.0, deadline - time.monotonic()))
 
 
     def Send(self, request: Request, timeout: float):
@@ -40,14 +53,18 @@ class ClientStub:
             print("[ClientStub] send error. id:", request.header.identity.id)
             return False
 
-    def SendRequest(self, request: Request, timeout: float):
+    def SendRequest(self, request: Request, timeout: float, wait: bool = True):
+        # wait False writes without waiting for the server's reader to match
         id = request.header.identity.id
 
         future = RequestFuture()
         future.SetRequestId(id)
+        # registered before the write so a fast response finds it, the expiry starts once the
+        # write returned: Write itself may wait up to timeout for the server's reader
         self.__futureQueue.Set(id, future)
 
-        if self.__sendChannel.Write(request, timeout):
+        if self.__sendChannel.Write(request, timeout if wait else None):
+            self.__futureQueue.SetExpiry(id, timeout)
             return future
         else:
             print("[ClientStub] send request error. id:", request.header.identity.id)
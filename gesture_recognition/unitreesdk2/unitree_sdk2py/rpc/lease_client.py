@@ -3,9 +3,13 @@ import socket
 import os
 import json
 
-from threading import Thread, Lock
+from threading import Lock, Event
 
+from ..utils.future import FutureResult
+from ..utils.hz_sample import HZSample
 from .client_base import ClientBase
+from .request_future import RequestFuture
+from .lease_manager import LeaseManager
 from .internal import *
 
 
@@ -31,28 +35,37 @@ class LeaseContext:
 
 """
 " class LeaseClient
+" applies and renews the lease from the process wide LeaseManager thread instead of one
+" thread per client. requests are sent without waiting, the response handler updates the
+" lease, wakes WaitApplied and records the renewal round trip time (GetRenewalStats).
 """
 class LeaseClient(ClientBase):
     def __init__(self, name: str):
         self.__name = name + "_lease"
         self.__contextName = socket.gethostname() + "/" + name + "/" + str(os.getpid())
         self.__context = LeaseContext()
-        self.__thread = None
         self.__lock = Lock()
+        self.__applied = Event()
+        self.__entry = None
+        self.__pending = None
+        self.__sendTime = 0.0
+        self.__timeout = 1.0
+        self.__rtt = HZSample()
         super().__init__(self.__name)
         print("[LeaseClient] lease name:", self.__name, ", context name:", self.__contextName)
     
     def Init(self):
-        self.SetTimeout(1.0)
-        self.__thread = Thread(target=self.__ThreadFunc, name=self.__name, daemon=True)
-        self.__thread.start()
+        self.SetTimeout(self.__timeout)
+        self.__entry = LeaseManager().Add(self.__Step)
 
-    def WaitApplied(self):
-        while True:
-            with self.__lock:
-                if self.__context.Valid():
-                    break
-            time.sleep(0.1)            
+    def Close(self):
+        if self.__entry is not None:
+            LeaseManager().Remove(self.__entry)
+            self.__entry = None
+
+    def WaitApplied(self, timeout: float = None):
+        # True once a lease is applied, False on timeout
+        return self.__applied.wait(timeout)
     
     def GetId(self):
             with self.__lock:
@@ -61,13 +74,65 @@ class LeaseClient(ClientBase):
     def Applied(self):
             with self.__lock:
                 return self.__context.Valid()
-    
-    def __Apply(self):
-        parameter = {}
-        parameter["name"] = self.__contextName
-        p = json.dumps(parameter)
 
-        c, d = self._CallBase(RPC_API_ID_LEASE_APPLY, p)
+    def GetRenewalStats(self):
+        # renewal round trip times in seconds (count, mean, max, p50, p95, p99) and rate
+        return self.__rtt.GetSummary()
+
+    def __Step(self):
+        # called by the LeaseManager thread, sends apply or renewal and returns the next delay
+        now = time.monotonic()
+        with self.__lock:
+            pending = self.__pending
+            if pending is not None:
+                remain = self.__sendTime + self.__timeout - now
+                if remain > 0.0:
+                    return remain
+                self.__pending = None
+            valid = self.__context.Valid()
+            id = self.__context.id
+
+        if pending is not None:
+            self._CancelBase(pending)
+            print("[LeaseClient] {} lease error. code:".format("renewal" if valid else "apply"), RPC_ERR_CLIENT_API_TIMEOUT)
+
+        if valid:
+            future = self._CallAsyncBase(RPC_API_ID_LEASE_RENEWAL, json.dumps({}), 0, id)
+        else:
+            future = self._CallAsyncBase(RPC_API_ID_LEASE_APPLY, json.dumps({"name": self.__contextName}))
+
+        if future is None:
+            print("[LeaseClient] {} lease error. code:".format("renewal" if valid else "apply"), RPC_ERR_CLIENT_SEND)
+            return self.__GetWaitSec()
+
+        with self.__lock:
+            self.__pending = future
+            self.__sendTime = now
+        future.AddDoneCallback(self.__OnResponse)
+        return self.__GetWaitSec()
+
+    def __OnResponse(self, future: RequestFuture):
+        with self.__lock:
+            if future is not self.__pending:
+                return
+            self.__pending = None
+            rtt = time.monotonic() - self.__sendTime
+
+        result = future.GetResult(0)
+        if result.code != FutureResult.FUTURE_SUCC:
+            return
+
+        response = result.value
+        apiId = response.header.identity.api_id
+        c = response.header.status.code
+
+        if apiId == RPC_API_ID_LEASE_APPLY:
+            self.__Applied(c, response.data)
+        elif apiId == RPC_API_ID_LEASE_RENEWAL:
+            self.__rtt.SampleLatency(rtt)
+            self.__Renewed(c)
+
+    def __Applied(self, c: int, d: str):
         if c != 0:
             print("[LeaseClient] apply lease error. code:", c)
             return
@@ -81,33 +146,23 @@ class LeaseClient(ClientBase):
 
         with self.__lock:
             self.__context.Update(id, float(term/1000000))
+        self.__applied.set()
     
-    def __Renewal(self):
-        parameter = {}
-        p = json.dumps(parameter)
-
-        c, d = self._CallBase(RPC_API_ID_LEASE_RENEWAL, p, 0, self.__context.id)
+    def __Renewed(self, c: int):
         if c != 0:
             print("[LeaseClient] renewal lease error. code:", c)
             if c == RPC_ERR_SERVER_LEASE_NOT_EXIST:
                 with self.__lock:
                     self.__context.Reset()
+                self.__applied.clear()
     
     def __GetWaitSec(self):
         waitsec = 0.0
-        if self.__context.Valid():
-            waitsec = self.__context.term
+        with self.__lock:
+            if self.__context.Valid():
+                waitsec = self.__context.term
 
         if waitsec <= 0:
             waitsec = RPC_LEASE_TERM
 
         return waitsec * 0.3
-
-    def __ThreadFunc(self):
-        while True:
-            if self.__context.Valid():
-                self.__Renewal()
-            else:
-                self.__Apply()
-            # sleep waitsec 
-            time.sleep(self.__GetWaitSec())
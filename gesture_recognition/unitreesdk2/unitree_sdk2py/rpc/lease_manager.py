@@ -0,0 +1,106 @@
+import math
+import time
+
+from threading import Thread, Condition
+
+from ..utils.singleton import Singleton
+
+
+"""
+" lease timer wheel: LEASE_WHEEL_SLOTS slots of LEASE_WHEEL_TICK seconds (2.56s per turn)
+"""
+LEASE_WHEEL_TICK = 0.02
+LEASE_WHEEL_SLOTS = 128
+
+# delay before a step that raised is called again
+LEASE_WHEEL_RETRY = 1.0
+
+
+"""
+" class LeaseManager
+" runs the lease steps of every LeaseClient of the process from one thread. steps sit on a
+" timer wheel and are called when their slot comes round; a step returns the delay to its
+" next call, None to leave the wheel. steps must not block, lease requests are sent
+" without waiting for the response. the thread starts with the first step and sleeps
+" while the wheel is empty.
+"""
+class LeaseManager(Singleton):
+    __cond = Condition()
+    __slots = [[] for i in range(LEASE_WHEEL_SLOTS)]
+    __cursor = 0
+    __count = 0
+    __thread = None
+
+    def __init__(self):
+        super().__init__()
+
+    def Add(self, step, delay: float = 0.0):
+        # returns the entry of step, for Remove
+        entry = [0, step, True]
+        with self.__cond:
+            self.__Insert(entry, delay)
+            if self.__thread is None:
+                LeaseManager.__thread = Thread(target=self.__ThreadFunc, name="lease_manager", daemon=True)
+                self.__thread.start()
+            self.__cond.notify()
+        return entry
+
+    def Remove(self, entry: list):
+        # the step is not called again, it leaves the wheel when its slot comes round
+        entry[2] = False
+
+    def Size(self):
+        with self.__cond:
+            return self.__count
+
+    def __Insert(self, entry: list, delay: float):
+        # entry is [rounds, step, active]; rounds counts the turns left before it is due
+        ticks = max(1, math.ceil(delay / LEASE_WHEEL_TICK))
+        entry[0] = (ticks - 1) // LEASE_WHEEL_SLOTS
+        self.__slots[(self.__cursor + ticks) % LEASE_WHEEL_SLOTS].append(entry)
+        LeaseManager.__count += 1
+
+    def __Advance(self):
+        # move to the next slot, returns its due entries
+        LeaseManager.__cursor = (self.__cursor + 1) % LEASE_WHEEL_SLOTS
+        slot = self.__slots[self.__cursor]
+        due = []
+        wait = []
+        for entry in slot:
+            if entry[0] == 0:
+                due.append(entry)
+            else:
+                entry[0] -= 1
+                wait.append(entry)
+        self.__slots[self.__cursor] = wait
+        LeaseManager.__count -= len(due)
+        return due
+
+    def __ThreadFunc(self):
+        tick = time.monotonic()
+        while True:
+            with self.__cond:
+                while self.__count == 0:
+                    self.__cond.wait()
+                    tick = time.monotonic()
+
+            tick += LEASE_WHEEL_TICK
+            delay = tick - time.monotonic()
+            if delay > 0.0:
+                time.sleep(delay)
+
+            with self.__cond:
+                due = self.__Advance()
+
+            for entry in due:
+                if not entry[2]:
+                    continue
+                try:
+                    delay = entry[1]()
+                except Exception as e:
+                    print("[LeaseManager] lease step raise exception:", e)
+                    delay = LEASE_WHEEL_RETRY
+
+                if delay is not None and entry[2]:
+                    with self.__cond:
+                        self.__Insert(entry, delay)
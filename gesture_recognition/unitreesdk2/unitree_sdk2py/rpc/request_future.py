@@ -1,3 +1,6 @@
+import time
+import heapq
+
 from threading import Condition, Lock
 from enum import Enum
 
@@ -9,6 +12,8 @@ from ..utils.future import Future, FutureResult
 " class RequestFuture
 """
 class RequestFuture(Future):
+    __slots__ = ("__requestId",)
+
     def __init__(self):
         self.__requestId = None
         super().__init__()
@@ -20,27 +25,48 @@ class RequestFuture(Future):
         return self.__requestId
 
 
+"""
+" class RequestFutureQueue
+"""
 class RequestFutureQueue:
     def __init__(self):
         self.__data = {}
+        self.__expiry = []
         self.__lock = Lock()
         
-    def Set(self, requestId: int, future: RequestFuture):
+    def Set(self, requestId: int, future: RequestFuture, timeout: float = None):
         if future is None:
             return False
         with self.__lock:
             self.__data[requestId] = future
+            now = time.monotonic()
+            if timeout is not None:
+                heapq.heappush(self.__expiry, (now + timeout, requestId))
+            self.__Sweep(now)
             return True
 
+    def SetExpiry(self, requestId: int, timeout: float):
+        # deadline counted from now, for futures Set before a write that may itself wait
+        with self.__lock:
+            if timeout is not None and requestId in self.__data:
+                heapq.heappush(self.__expiry, (time.monotonic() + timeout, requestId))
+
     def Get(self, requestId: int):
-        future = None
         with self.__lock:
-            future = self.__data.get(requestId)
-            if future is not None:
-                self.__data.pop(requestId)
-        return future
+            return self.__data.pop(requestId, None)
 
     def Remove(self, requestId: int):
         with self.__lock:
-            if id in self.__data:
-                self.__data.pop(requestId)
\ No newline at end of file
+            self.__data.pop(requestId, None)
+
+    def Size(self):
+        with self.__lock:
+            return len(self.__data)
+
+    def __Sweep(self, now: float):
+        # drop futures whose deadline passed and nobody removed (their waiter already timed out).
+        # entries of futures already answered or removed are discarded lazily here.
+        expiry = self.__expiry
+        while expiry and expiry[0][0] <= now:
+            _, requestId = heapq.heappop(expiry)
+            self.__data.pop(requestId, None)
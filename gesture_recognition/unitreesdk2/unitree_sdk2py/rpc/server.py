@@ -33,9 +33,9 @@ class Server(ServerBase):
         self.__leaseServer.Init()
         self.__leaseServer.Start(False)
 
-    def Start(self, enablePrioQueue: bool = False):
+    def Start(self, enablePrioQueue: bool = False, workerCount: int = 1, keepOrder: bool = False):
         super()._SetServerRequestHandler(self.__ServerRequestHandler)
-        super()._Start(enablePrioQueue)
+        super()._Start(enablePrioQueue, workerCount, keepOrder)
 
     def GetApiVersion(self):
         return self.__apiVersion
@@ -20,9 +20,13 @@ class ServerBase:
     def GetName(self):
         return self.__name
 
-    def _Start(self, enablePrioQueue: bool = False):
-        self.__serverStub.Init(self.__serverRequestHandler, enablePrioQueue)
-        print("[ServerBase] server started. name:", self.__name, ", enable proirity queue:", enablePrioQueue)
+    def GetDroppedCount(self):
+        return self.__serverStub.GetDroppedCount()
+
+    def _Start(self, enablePrioQueue: bool = False, workerCount: int = 1, keepOrder: bool = False):
+        self.__serverStub.Init(self.__serverRequestHandler, enablePrioQueue, workerCount, keepOrder)
+        print("[ServerBase] server started. name:", self.__name, ", enable proirity queue:", enablePrioQueue,
+              ", workers:", workerCount, ", keep order:", keepOrder)
 
     def _SetServerRequestHandler(self, serverRequestHandler: Callable):
         self.__serverRequestHandler = serverRequestHandler
@@ -1,7 +1,7 @@
 import time
 
 from enum import Enum
-from threading import Thread, Condition
+from threading import Thread, Condition, Lock
 from typing import Callable, Any
 
 from ..utils.bqueue import BQueue
@@ -9,11 +9,18 @@ from ..idl.unitree_api.msg.dds_ import Request_ as Request
 from ..idl.unitree_api.msg.dds_ import Response_ as Response
 
 from ..core.channel import ChannelFactory
+from ..core.channel_qos import CHANNEL_QOS_RPC
 from ..core.channel_name import ChannelType, GetServerChannelName
 
 
 """
 " class ServerStub
+" requests are served by a pool of worker threads. with keepOrder each api id is
+" pinned to one worker queue, so requests of the same api are handled in order.
+" the dds listener routes every request straight into its worker queue and never
+" blocks: it holds dds locks the workers need to send their responses, and one
+" saturated api must not hold up the others (priority requests included). a request
+" that finds its queue full is dropped and counted.
 """
 class ServerStub:
     def __init__(self, serviceName: str):
@@ -22,33 +29,44 @@ class ServerStub:
         self.__sendChannel = None
         self.__recvChannel = None
         self.__enablePriority = None
-        self.__queue = None
+        self.__keepOrder = False
+        self.__queues = []
         self.__prioQueue = None
-        self.__queueThread = None
-        self.__prioQueueThread = None
+        self.__threads = []
+        self.__droppedCount = 0
+        self.__droppedLock = Lock()
 
-    def Init(self, serverRequestHander: Callable, enablePriority: bool = False):
+    def Init(self, serverRequestHander: Callable, enablePriority: bool = False, workerCount: int = 1,
+             keepOrder: bool = False, queueLen: int = 10):
         self.__serverRquestHandler = serverRequestHander
         self.__enablePriority = enablePriority
+        self.__keepOrder = keepOrder
+        workerCount = max(1, workerCount)
 
         factory = ChannelFactory()
 
-        # create channel
-        self.__sendChannel = factory.CreateSendChannel(GetServerChannelName(self.__serviceName, ChannelType.SEND), Response)
-        self.__recvChannel = factory.CreateRecvChannel(GetServerChannelName(self.__serviceName, ChannelType.RECV), Request, self.__Enqueue, 10)
+        # create send channel
+        self.__sendChannel = factory.CreateSendChannel(GetServerChannelName(self.__serviceName, ChannelType.SEND), Response,
+                                    CHANNEL_QOS_RPC)
+
+        # start request worker threads
+        if keepOrder:
+            self.__queues = [BQueue(queueLen) for _ in range(workerCount)]
+            for i in range(workerCount):
+                self.__StartWorker(self.__queues[i], "server_queue_" + str(i))
+        else:
+            self.__queues = [BQueue(queueLen * workerCount)]
+            for i in range(workerCount):
+                self.__StartWorker(self.__queues[0], "server_queue_" + str(i))
 
         # start priority request thread
-        self.__queue = BQueue(10)
-        self.__queueThread = Thread(target=self.__QueueThreadFunc, name="server_queue", daemon=True)
-        self.__queueThread.start()
-        
         if enablePriority:
             self.__prioQueue = BQueue(5)
-            self.__prioQueueThread = Thread(target=self.__PrioQueueThreadFunc, name="server_prio_queue", daemon=True)
-            self.__prioQueueThread.start()
+            self.__StartWorker(self.__prioQueue, "server_prio_queue")
 
-        # wait thread started
-        time.sleep(0.5)
+        # create recv channel. the listener enqueues at once, so after the queues
+        self.__recvChannel = factory.CreateRecvChannel(GetServerChannelName(self.__serviceName, ChannelType.RECV), Request, self.__Enqueue,
+                                    qos=CHANNEL_QOS_RPC)
 
     def Send(self, response: Response, timeout: float):
         if self.__sendChannel.Write(response, timeout):
@@ -57,22 +75,31 @@ class ServerStub:
             print("[ServerStub] send error. id:", response.header.identity.id)
             return False
 
+    def GetDroppedCount(self):
+        with self.__droppedLock:
+            return self.__droppedCount
+
+    def __StartWorker(self, queue: BQueue, name: str):
+        thread = Thread(target=self.__QueueThreadFunc, args=(queue,), name=name, daemon=True)
+        thread.start()
+        self.__threads.append(thread)
+
     def __Enqueue(self, request: Request):
         if self.__enablePriority and request.header.policy.priority > 0:
-            self.__prioQueue.Put(request, True)
+            queue = self.__prioQueue
+        elif self.__keepOrder:
+            queue = self.__queues[request.header.identity.api_id % len(self.__queues)]
         else:
-            self.__queue.Put(request, True)
+            queue = self.__queues[0]
 
-    def __QueueThreadFunc(self):
-        while True:
-            request = self.__queue.Get()
-            if request is None:
-                continue
-            self.__serverRquestHandler(request)
+        if not queue.Put(request):
+            with self.__droppedLock:
+                self.__droppedCount += 1
+            print("[ServerStub] request queue full, request dropped. id:", request.header.identity.id)
 
-    def __PrioQueueThreadFunc(self):
+    def __QueueThreadFunc(self, queue: BQueue):
         while True:
-            request = self.__prioQueue.Get()
+            request = queue.Get()
             if request is None:
                 continue
             self.__serverRquestHandler(request)
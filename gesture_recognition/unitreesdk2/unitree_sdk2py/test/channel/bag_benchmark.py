@@ -0,0 +1,104 @@
+import os
+import sys
+import time
+import tempfile
+import threading
+
+from unitree_sdk2py.core.channel import ChannelPublisher, ChannelSubscriber, ChannelFactoryInitialize, ChannelBackend
+from unitree_sdk2py.core.channel_bag import ChannelRecorder, ChannelBagReader, ChannelReplayer
+from unitree_sdk2py.idl.default import unitree_go_msg_dds__LowState_, unitree_go_msg_dds__Go2FrontVideoData_
+from unitree_sdk2py.idl.unitree_go.msg.dds_ import LowState_, Go2FrontVideoData_
+from unitree_sdk2py.utils.thread import RecurrentThread
+
+LOWSTATE_TOPIC = "rt/bench_bag_lowstate"
+VIDEO_TOPIC = "rt/bench_bag_video"
+
+LOWSTATE_INTERVAL = 0.002
+VIDEO_INTERVAL = 1.0 / 30
+VIDEO_FRAME_SIZE = 60000
+DURATION = 5.0
+
+
+def Record(path: str):
+    recorder = ChannelRecorder(path, [(LOWSTATE_TOPIC, LowState_), (VIDEO_TOPIC, Go2FrontVideoData_)])
+    recorder.Start()
+
+    lowstatePub = ChannelPublisher(LOWSTATE_TOPIC, LowState_)
+    lowstatePub.Init()
+    videoPub = ChannelPublisher(VIDEO_TOPIC, Go2FrontVideoData_)
+    videoPub.Init()
+
+    state = unitree_go_msg_dds__LowState_()
+    frame = unitree_go_msg_dds__Go2FrontVideoData_()
+    frame.video720p = list(os.urandom(VIDEO_FRAME_SIZE))
+    sent = {"lowstate": 0, "video": 0}
+
+    def LowStateWrite():
+        state.tick = sent["lowstate"]
+        lowstatePub.Write(state, 1.0)
+        sent["lowstate"] += 1
+
+    def VideoWrite():
+        frame.time_frame = sent["video"]
+        videoPub.Write(frame, 1.0)
+        sent["video"] += 1
+
+    lowstateThread = RecurrentThread(LOWSTATE_INTERVAL, LowStateWrite, "bench_lowstate")
+    videoThread = RecurrentThread(VIDEO_INTERVAL, VideoWrite, "bench_video")
+    lowstateThread.Start()
+    videoThread.Start()
+    time.sleep(DURATION)
+    lowstateThread.Wait()
+    videoThread.Wait()
+
+    # let the last samples arrive
+    time.sleep(0.5)
+    recorder.Stop()
+
+    total = sent["lowstate"] + sent["video"]
+    print("  record: sent {} lowstate, {} video, recorded {}/{} samples, {:.1f} MB".format(
+        sent["lowstate"], sent["video"], recorder.GetRecordCount(), total, recorder.GetByteCount() / 1e6))
+    lowstatePub.Close()
+    videoPub.Close()
+
+
+def Replay(path: str):
+    reader = ChannelBagReader(path)
+    reader.Open()
+    count = reader.GetRecordCount()
+    reader.Close()
+
+    received = {"count": 0}
+    done = threading.Event()
+
+    def Handler(msg):
+        received["count"] += 1
+        if received["count"] == count:
+            done.set()
+
+    lowstateSub = ChannelSubscriber("replay/" + LOWSTATE_TOPIC, LowState_)
+    lowstateSub.Init(Handler, 64)
+    videoSub = ChannelSubscriber("replay/" + VIDEO_TOPIC, Go2FrontVideoData_)
+    videoSub.Init(Handler, 64)
+
+    replayer = ChannelReplayer(path, 0, prefix="replay/")
+    start = time.perf_counter()
+    published = replayer.Run()
+    elapsed = time.perf_counter() - start
+    done.wait(1.0)
+
+    print("  replay: published {} samples in {:.2f} s ({:.0f} samples/s), received {}".format(
+        published, elapsed, published / elapsed, received["count"]))
+    lowstateSub.Close()
+    videoSub.Close()
+
+
+if __name__ == "__main__":
+    backend = ChannelBackend.LOOPBACK if len(sys.argv) > 1 and sys.argv[1] == "loopback" else ChannelBackend.DDS
+    ChannelFactoryInitialize(0, backend=backend)
+
+    print("backend:", backend.name)
+    with tempfile.TemporaryDirectory() as dir:
+        path = os.path.join(dir, "bench.bag")
+        Record(path)
+        Replay(path)
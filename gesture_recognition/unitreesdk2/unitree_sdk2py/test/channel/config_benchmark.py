@@ -0,0 +1,67 @@
+import sys
+import time
+import subprocess
+
+from unitree_sdk2py.core.channel import ChannelPublisher, ChannelSubscriber, ChannelFactoryInitialize
+from unitree_sdk2py.core.channel_config import ChannelConfigCreate
+from unitree_sdk2py.idl.std_msgs.msg.dds_ import String_
+
+TOPIC = "rt/bench_frame"
+INTERFACE = "lo"
+DURATION = 3.0
+
+# about one compressed camera frame
+FRAME_SIZE = 256 * 1024
+
+CONFIGS = {
+    "default": lambda: ChannelConfigCreate(INTERFACE),
+    "tuned": lambda: ChannelConfigCreate(INTERFACE, socketReceiveBufferSize=8 << 20, socketSendBufferSize=8 << 20,
+                                         maxMessageSize=65000, fragmentSize=60000, sharedMemory=None),
+}
+
+
+def Publish():
+    pub = ChannelPublisher(TOPIC, String_)
+    pub.Init()
+    frame = String_("x" * FRAME_SIZE)
+    while True:
+        pub.Write(frame)
+
+
+def Subscribe(name: str):
+    counter = {"frames": 0}
+
+    def Handler(msg: String_):
+        if len(msg.data) == FRAME_SIZE:
+            counter["frames"] += 1
+
+    sub = ChannelSubscriber(TOPIC, String_)
+    sub.Init(Handler)
+    time.sleep(1.0)
+
+    counter["frames"] = 0
+    time.sleep(DURATION)
+    rate = counter["frames"] / DURATION
+    print("{:<8} frames: {:6.0f}/s, {:7.1f} MB/s".format(name, rate, rate * FRAME_SIZE / (1 << 20)))
+    sub.Close()
+
+
+if __name__ == "__main__":
+    name = sys.argv[2] if len(sys.argv) > 2 else None
+
+    if len(sys.argv) > 2 and sys.argv[1] == "pub":
+        ChannelFactoryInitialize(0, config=CONFIGS[name]())
+        Publish()
+        sys.exit(0)
+
+    if name is None:
+        # every config runs in fresh processes, the domain config is fixed once created
+        for name in CONFIGS:
+            subprocess.run([sys.executable, __file__, "sub", name])
+        sys.exit(0)
+
+    ChannelFactoryInitialize(0, config=CONFIGS[name]())
+    pub = subprocess.Popen([sys.executable, __file__, "pub", name])
+    Subscribe(name)
+    pub.kill()
+    pub.wait()
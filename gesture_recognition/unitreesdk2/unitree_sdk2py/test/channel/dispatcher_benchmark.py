@@ -0,0 +1,113 @@
+import sys
+import time
+import threading
+import subprocess
+
+from unitree_sdk2py.core.channel import ChannelPublisher, ChannelSubscriber, ChannelFactoryInitialize
+from unitree_sdk2py.idl.default import unitree_go_msg_dds__LowState_
+from unitree_sdk2py.idl.unitree_go.msg.dds_ import LowState_
+from unitree_sdk2py.utils.thread import RecurrentThread
+
+TOPIC_COUNT = 8
+DURATION = 5.0
+
+# one topic floods, the others publish at a low rate
+FLOOD_TOPIC = "rt/bench_flood"
+FLOOD_RATE = 2000
+SLOW_RATE = 50
+
+# cpu time spent per sample in the handler, makes the flood topic expensive
+HANDLER_WORK = 0.0002
+
+
+def TopicName(index: int):
+    return "rt/bench_topic_" + str(index)
+
+
+def Publish():
+    state = unitree_go_msg_dds__LowState_()
+    flood = ChannelPublisher(FLOOD_TOPIC, LowState_)
+    flood.Init()
+    pubs = [ChannelPublisher(TopicName(i), LowState_) for i in range(TOPIC_COUNT)]
+    for pub in pubs:
+        pub.Init()
+
+    def WriteFlood():
+        state.tick = time.monotonic_ns() & 0xFFFFFFFF
+        flood.Write(state)
+
+    def WriteSlow():
+        state.tick = time.monotonic_ns() & 0xFFFFFFFF
+        for pub in pubs:
+            pub.Write(state)
+
+    RecurrentThread(1.0 / FLOOD_RATE, target=WriteFlood, name="bench_flood").Start()
+    RecurrentThread(1.0 / SLOW_RATE, target=WriteSlow, name="bench_slow").Start()
+    while True:
+        time.sleep(1.0)
+
+
+def Busy(seconds: float):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def Subscribe(name: str, dispatch: bool, floodPriority: int):
+    counts = {"flood": 0, "slow": 0}
+    latency = []
+
+    def FloodHandler(msg):
+        Busy(HANDLER_WORK)
+        counts["flood"] += 1
+
+    def SlowHandler(msg):
+        counts["slow"] += 1
+        latency.append(((time.monotonic_ns() & 0xFFFFFFFF) - msg.tick) & 0xFFFFFFFF)
+
+    threadsBefore = threading.active_count()
+
+    subs = []
+    sub = ChannelSubscriber(FLOOD_TOPIC, LowState_)
+    sub.Init(FloodHandler, 10, dispatch=dispatch, priority=floodPriority)
+    subs.append(sub)
+    for i in range(TOPIC_COUNT):
+        sub = ChannelSubscriber(TopicName(i), LowState_)
+        sub.Init(SlowHandler, 10, dispatch=dispatch)
+        subs.append(sub)
+
+    threads = threading.active_count() - threadsBefore
+    time.sleep(1.0)
+
+    counts["flood"] = counts["slow"] = 0
+    latency.clear()
+    time.sleep(DURATION)
+
+    latency.sort()
+    p50 = latency[len(latency) // 2] / 1e6 if latency else 0.0
+    p99 = latency[len(latency) * 99 // 100] / 1e6 if latency else 0.0
+    print("  {:<24} new threads: {:2}, flood: {:6.0f}/s, slow: {:5.0f}/s, slow latency p50: {:6.2f} ms, p99: {:6.2f} ms".format(
+        name, threads, counts["flood"] / DURATION, counts["slow"] / DURATION, p50, p99))
+
+    for sub in subs:
+        sub.Close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "pub":
+        ChannelFactoryInitialize(0)
+        Publish()
+        sys.exit(0)
+
+    ChannelFactoryInitialize(0)
+
+    # publisher runs in its own process, samples arrive from the network
+    pub = subprocess.Popen([sys.executable, __file__, "pub"])
+    print("{} slow topics at {} Hz, one flood topic at {} Hz".format(TOPIC_COUNT, SLOW_RATE, FLOOD_RATE))
+
+    Subscribe("listener + queue thread", False, 0)
+    Subscribe("dispatcher", True, 0)
+    Subscribe("dispatcher, flood low prio", True, -1)
+
+    pub.kill()
+    pub.wait()
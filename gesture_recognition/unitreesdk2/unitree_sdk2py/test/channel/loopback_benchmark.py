@@ -0,0 +1,106 @@
+import sys
+import time
+import threading
+
+from unitree_sdk2py.core.channel import ChannelPublisher, ChannelSubscriber, ChannelFactoryInitialize, ChannelBackend
+from unitree_sdk2py.idl.default import unitree_go_msg_dds__LowState_
+from unitree_sdk2py.idl.unitree_go.msg.dds_ import LowState_
+from unitree_sdk2py.rpc.server import Server
+from unitree_sdk2py.rpc.client import Client
+
+TOPIC = "rt/bench_loopback"
+COUNT = 20000
+CALL_COUNT = 5000
+
+BENCH_API_ID = 2001
+BENCH_API_VERSION = "1.0.0.1"
+
+
+"""
+" class EchoServer
+"""
+class EchoServer(Server):
+    def __init__(self):
+        super().__init__("bench_loopback")
+
+    def Init(self):
+        self._RegistHandler(BENCH_API_ID, self.Move, 0)
+        self._SetApiVersion(BENCH_API_VERSION)
+
+    def Move(self, parameter: str):
+        return 0, parameter
+
+
+"""
+" class EchoClient
+"""
+class EchoClient(Client):
+    def __init__(self):
+        super().__init__("bench_loopback", False)
+
+    def Init(self):
+        self._RegistApi(BENCH_API_ID, 0)
+        self._SetApiVerson(BENCH_API_VERSION)
+
+    def Move(self):
+        c, d = self._Call(BENCH_API_ID, "{}")
+        return c
+
+
+def PubSub():
+    received = {"count": 0}
+    event = threading.Event()
+
+    def Handler(msg: LowState_):
+        received["count"] += 1
+        event.set()
+
+    sub = ChannelSubscriber(TOPIC, LowState_)
+    sub.Init(Handler)
+    pub = ChannelPublisher(TOPIC, LowState_)
+    pub.Init()
+
+    state = unitree_go_msg_dds__LowState_()
+    pub.Write(state, 1.0)
+    event.wait(1.0)
+
+    # one sample in flight at a time
+    start = time.perf_counter()
+    for i in range(COUNT):
+        event.clear()
+        pub.Write(state)
+        event.wait(1.0)
+    elapsed = time.perf_counter() - start
+
+    print("  pub/sub latency: {:8.2f} us/sample, received: {}".format(elapsed / COUNT * 1e6, received["count"] - 1))
+    sub.Close()
+    pub.Close()
+
+
+def Rpc():
+    server = EchoServer()
+    server.Init()
+    server.Start(False)
+
+    client = EchoClient()
+    client.Init()
+    client.SetTimeout(1.0)
+
+    errors = 0
+    start = time.perf_counter()
+    for i in range(CALL_COUNT):
+        if client.Move() != 0:
+            errors += 1
+    elapsed = time.perf_counter() - start
+
+    print("  rpc call:        {:8.2f} us/call, errors: {}".format(elapsed / CALL_COUNT * 1e6, errors))
+
+
+if __name__ == "__main__":
+    # the factory is initialized once per process, pass "loopback" for the in-process backend
+    backend = ChannelBackend.LOOPBACK if len(sys.argv) > 1 and sys.argv[1] == "loopback" else ChannelBackend.DDS
+    ChannelFactoryInitialize(0, backend=backend)
+
+    print("backend:", backend.name)
+    PubSub()
+    Rpc()
@@ -0,0 +1,117 @@
+import sys
+import time
+import threading
+import subprocess
+
+from unitree_sdk2py.core.channel import ChannelPublisher, ChannelSubscriber, ChannelFactoryInitialize
+from unitree_sdk2py.core.channel_qos import CHANNEL_QOS_SENSOR, CHANNEL_QOS_COMMAND, CHANNEL_QOS_RPC
+from unitree_sdk2py.idl.std_msgs.msg.dds_ import String_
+
+PING_TOPIC = "rt/bench_ping"
+PONG_TOPIC = "rt/bench_pong"
+
+# small payload, so the numbers show dds and not python serialization
+PAYLOAD_SIZE = 64
+
+PING_COUNT = 2000
+PING_TIMEOUT = 0.1
+BURST_DURATION = 3.0
+
+PROFILES = [None, CHANNEL_QOS_SENSOR, CHANNEL_QOS_COMMAND, CHANNEL_QOS_RPC]
+
+
+def Echo(profile: str):
+    # answers every ping with a pong carrying the same tick
+    pub = ChannelPublisher(PONG_TOPIC + "_" + profile, String_)
+    pub.Init(ProfileQos(profile))
+
+    def Handler(msg: String_):
+        pub.Write(msg)
+
+    sub = ChannelSubscriber(PING_TOPIC + "_" + profile, String_)
+    sub.Init(Handler, qos=ProfileQos(profile))
+    while True:
+        time.sleep(1.0)
+
+
+def ProfileQos(profile: str):
+    return None if profile == "default" else profile
+
+
+def Run(profile: str):
+    echo = subprocess.Popen([sys.executable, __file__, "echo", profile])
+
+    received = {"count": 0, "tick": ""}
+    event = threading.Event()
+
+    def Handler(msg: String_):
+        received["count"] += 1
+        received["tick"] = msg.data
+        event.set()
+
+    sub = ChannelSubscriber(PONG_TOPIC + "_" + profile, String_)
+    sub.Init(Handler, qos=ProfileQos(profile))
+    pub = ChannelPublisher(PING_TOPIC + "_" + profile, String_)
+    pub.Init(ProfileQos(profile))
+
+    state = String_("")
+    pad = "x" * PAYLOAD_SIZE
+
+    # wait until the echo answers
+    while received["count"] == 0:
+        state.data = "hello"
+        pub.Write(state)
+        event.wait(PING_TIMEOUT)
+
+    # latency: one ping in flight at a time
+    rtts = []
+    lost = 0
+    for i in range(1, PING_COUNT + 1):
+        event.clear()
+        tick = str(i) + pad
+        state.data = tick
+        start = time.perf_counter()
+        pub.Write(state)
+        while received["tick"] != tick:
+            if not event.wait(PING_TIMEOUT):
+                break
+            event.clear()
+        if received["tick"] == tick:
+            rtts.append(time.perf_counter() - start)
+        else:
+            lost += 1
+
+    rtts.sort()
+    p50 = rtts[len(rtts) // 2] * 1e6 if rtts else 0.0
+    p99 = rtts[len(rtts) * 99 // 100] * 1e6 if rtts else 0.0
+
+    # throughput: write as fast as possible, count the pongs that come back
+    time.sleep(0.2)
+    received["count"] = 0
+    sent = 0
+    deadline = time.monotonic() + BURST_DURATION
+    while time.monotonic() < deadline:
+        sent += 1
+        state.data = pad
+        pub.Write(state)
+    time.sleep(0.5)
+
+    print("{:<8} rtt p50: {:7.1f} us, p99: {:7.1f} us, lost: {:4}, burst sent: {:7.0f}/s, echoed: {:7.0f}/s ({:5.1f}%)".format(
+        profile, p50, p99, lost, sent / BURST_DURATION, received["count"] / BURST_DURATION, received["count"] / sent * 100))
+
+    sub.Close()
+    pub.Close()
+    echo.kill()
+    echo.wait()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "echo":
+        ChannelFactoryInitialize(0)
+        Echo(sys.argv[2])
+        sys.exit(0)
+
+    ChannelFactoryInitialize(0)
+
+    for profile in PROFILES:
+        Run("default" if profile is None else profile)
@@ -0,0 +1,75 @@
+import sys
+import time
+import subprocess
+
+from unitree_sdk2py.core.channel import ChannelPublisher, ChannelSubscriber, ChannelFactoryInitialize
+from unitree_sdk2py.core.channel import ChannelDeliverMode
+from unitree_sdk2py.idl.default import unitree_go_msg_dds__LowState_
+from unitree_sdk2py.idl.unitree_go.msg.dds_ import LowState_
+from unitree_sdk2py.utils.thread import RecurrentThread
+
+TOPIC = "rt/bench_lowstate"
+DURATION = 5.0
+RATES = [500, 1000]
+
+# (name, deliver mode, take max). take max 1 is the previous one-sample-per-callback behaviour
+CASES = [
+    ("take(1) each", ChannelDeliverMode.EACH, 1),
+    ("take(N) each", ChannelDeliverMode.EACH, 32),
+    ("take(N) batch", ChannelDeliverMode.BATCH, 32),
+    ("take(N) latest", ChannelDeliverMode.LATEST, 32),
+]
+
+
+def Publish(rate: float):
+    pub = ChannelPublisher(TOPIC, LowState_)
+    pub.Init()
+    state = unitree_go_msg_dds__LowState_()
+
+    def Write():
+        state.tick += 1
+        pub.Write(state)
+
+    thread = RecurrentThread(1.0 / rate, target=Write, name="bench_pub")
+    thread.Start()
+    while True:
+        time.sleep(1.0)
+
+
+def Subscribe(name: str, mode: ChannelDeliverMode, takeMax: int):
+    counter = {"callbacks": 0, "samples": 0}
+
+    def Handler(msg):
+        counter["callbacks"] += 1
+        counter["samples"] += len(msg) if isinstance(msg, list) else 1
+
+    sub = ChannelSubscriber(TOPIC, LowState_)
+    sub.Init(Handler, 0, mode, takeMax)
+    time.sleep(1.0)
+
+    counter["callbacks"] = counter["samples"] = 0
+    cpu = time.process_time()
+    time.sleep(DURATION)
+    cpu = time.process_time() - cpu
+
+    print("  {:<16} callbacks: {:7.1f}/s, samples: {:7.1f}/s, cpu: {:5.1f}%".format(
+        name, counter["callbacks"] / DURATION, counter["samples"] / DURATION, cpu / DURATION * 100))
+    sub.Close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "pub":
+        ChannelFactoryInitialize(0)
+        Publish(float(sys.argv[2]))
+        sys.exit(0)
+
+    ChannelFactoryInitialize(0)
+
+    for rate in RATES:
+        # publisher runs in its own process, so samples come from the network and can arrive in bursts
+        pub = subprocess.Popen([sys.executable, __file__, "pub", str(rate)])
+        print("publish rate: {} Hz".format(rate))
+        for name, mode, takeMax in CASES:
+            Subscribe(name, mode, takeMax)
+        pub.kill()
+        pub.wait()
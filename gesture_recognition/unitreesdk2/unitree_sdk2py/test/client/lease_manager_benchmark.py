@@ -0,0 +1,44 @@
+import time
+import threading
+
+from unitree_sdk2py.rpc.lease_manager import LeaseManager, LEASE_WHEEL_TICK
+from unitree_sdk2py.utils.thread import TimingHistogram
+
+CLIENTS = 100
+PERIOD = 0.3
+DURATION = 5.0
+
+
+class FakeLease:
+    # a lease step renewing every PERIOD, records how late each call is
+    def __init__(self, lateness: TimingHistogram, lock: threading.Lock):
+        self.due = time.monotonic() + PERIOD
+        self.lateness = lateness
+        self.lock = lock
+
+    def Step(self):
+        now = time.monotonic()
+        with self.lock:
+            self.lateness.Add(max(0.0, now - self.due))
+        self.due = now + PERIOD
+        return PERIOD
+
+
+if __name__ == "__main__":
+    lateness = TimingHistogram()
+    lock = threading.Lock()
+    manager = LeaseManager()
+
+    threads = threading.active_count()
+    cpu = time.process_time()
+    entries = [manager.Add(FakeLease(lateness, lock).Step, PERIOD) for i in range(CLIENTS)]
+    time.sleep(DURATION)
+    cpu = time.process_time() - cpu
+    for entry in entries:
+        manager.Remove(entry)
+
+    summary = lateness.Summary()
+    print("  {} leases, {} renewals, threads added: {} (one per lease before), cpu {:.1f} %".format(
+        CLIENTS, summary["count"], threading.active_count() - threads, cpu / DURATION * 100.0))
+    print("  lateness (tick {:.0f} ms): mean {:.1f} ms, p50 <= {:.1f} ms, p99 <= {:.1f} ms, max {:.1f} ms".format(
+        LEASE_WHEEL_TICK * 1e3, summary["mean"] * 1e3, summary["p50"] * 1e3, summary["p99"] * 1e3, summary["max"] * 1e3))
@@ -0,0 +1,77 @@
+import json
+import time
+import timeit
+
+from unitree_sdk2py.idl.unitree_api.msg.dds_ import Request_ as Request
+from unitree_sdk2py.idl.unitree_api.msg.dds_ import RequestHeader_ as RequestHeader
+from unitree_sdk2py.idl.unitree_api.msg.dds_ import RequestLease_ as RequestLease
+from unitree_sdk2py.idl.unitree_api.msg.dds_ import RequestIdentity_ as RequestIdentity
+from unitree_sdk2py.idl.unitree_api.msg.dds_ import RequestPolicy_ as RequestPolicy
+from unitree_sdk2py.go2.sport.sport_api import SPORT_API_ID_MOVE, SPORT_ERR_CLIENT_MOVE_PARAMETER
+from unitree_sdk2py.go2.sport.sport_client import SportClient
+import unitree_sdk2py.rpc.client_base as client_base
+
+NUMBER = 200000
+
+
+"""
+" previous implementation: parameters and header built from scratch on every call
+"""
+def MoveParameterOld(vx, vy, vyaw):
+    p = {}
+    p["x"] = vx
+    p["y"] = vy
+    p["z"] = vyaw
+    return json.dumps(p)
+
+def HeaderOld(apiId, leaseId, priority, noReply):
+    identity = RequestIdentity(time.monotonic_ns(), apiId)
+    lease = RequestLease(leaseId)
+    policy = RequestPolicy(priority, noReply)
+    return RequestHeader(identity, lease, policy)
+
+def MoveOld(vx, vy, vyaw):
+    # what the old Move handed to the stub
+    return Request(HeaderOld(SPORT_API_ID_MOVE, 0, 0, True), MoveParameterOld(vx, vy, vyaw), [])
+
+
+"""
+" class CaptureStub
+" stands in for ClientStub: no channels, keeps the last request sent
+"""
+class CaptureStub:
+    def __init__(self, serviceName: str):
+        self.request = None
+
+    def Init(self):
+        pass
+
+    def Send(self, request: Request, timeout: float):
+        self.request = request
+        return True
+
+
+def Bench(name, old, new):
+    tOld = timeit.timeit(old, number=NUMBER) / NUMBER * 1e6
+    tNew = timeit.timeit(new, number=NUMBER) / NUMBER * 1e6
+    print("{:<24} before: {:7.3f} us/call, after: {:7.3f} us/call, speedup: {:.2f}x".format(name, tOld, tNew, tOld / tNew))
+
+
+if __name__ == "__main__":
+    # the shipped SportClient and ClientBase, with the channel replaced by the capture stub
+    client_base.ClientStub = CaptureStub
+    client = SportClient()
+    client.Init()
+    stub = client._ClientBase__stub
+    setHeader = client._ClientBase__SetHeader
+
+    client.Move(0.3, -0.1, 0.5)
+    assert stub.request.parameter == MoveParameterOld(0.3, -0.1, 0.5)
+    assert stub.request.header.identity.api_id == SPORT_API_ID_MOVE and stub.request.header.policy.noreply
+    assert client.Move(float("nan"), 0.0, 0.0) == SPORT_ERR_CLIENT_MOVE_PARAMETER
+    assert client.Move(0.0, float("inf"), 0.0) == SPORT_ERR_CLIENT_MOVE_PARAMETER
+
+    Bench("request header", lambda: HeaderOld(SPORT_API_ID_MOVE, 0, 0, True), lambda: setHeader(SPORT_API_ID_MOVE, 0, 0, True))
+    Bench("Move (to the stub)", lambda: MoveOld(0.3, -0.1, 0.5), lambda: client.Move(0.3, -0.1, 0.5))
+    Bench("Move + cdr", lambda: MoveOld(0.3, -0.1, 0.5).serialize(),
+                        lambda: (client.Move(0.3, -0.1, 0.5), stub.request.serialize()))
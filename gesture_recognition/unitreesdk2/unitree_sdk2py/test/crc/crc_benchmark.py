@@ -0,0 +1,55 @@
+import time
+import random
+
+import numpy as np
+
+from unitree_sdk2py.utils.crc import CRC
+
+# word counts crc'd for LowCmd, HG LowCmd, LowState and HG LowState
+LENGTHS = [202, 250, 294, 522]
+MESSAGES = 200
+REPEAT = 2000
+PY_REPEAT = 20
+
+crc = CRC()
+
+
+def CrossCheck(variants: list):
+    # every variant must match crc32_core bit for bit on random messages
+    rand = random.Random(0)
+    for n in [0, 1, 2, 3] + LENGTHS:
+        for i in range(MESSAGES):
+            words = [rand.getrandbits(32) for _ in range(n)]
+            expect = crc._crc_ctypes(words)
+            for name, func in variants:
+                if func(np.array(words, np.uint32) if name == "numpy" else words) != expect:
+                    print("  mismatch: {}, {} words".format(name, n))
+                    return False
+    print("  cross check: {} variants bit exact on {} messages".format(len(variants), MESSAGES * (len(LENGTHS) + 4)))
+    return True
+
+
+def Bench(variants: list):
+    rand = random.Random(1)
+    for n in LENGTHS:
+        words = [rand.getrandbits(32) for _ in range(n)]
+        array = np.array(words, np.uint32)
+        line = []
+        for name, func in variants:
+            arg = array if name in ("numpy", "ctypes") else words
+            repeat = PY_REPEAT if name == "py" else REPEAT
+            start = time.perf_counter()
+            for i in range(repeat):
+                func(arg)
+            line.append("{} {:8.1f} us".format(name, (time.perf_counter() - start) / repeat * 1e6))
+        print("  {:3d} words: {}".format(n, ", ".join(line)))
+
+
+if __name__ == "__main__":
+    variants = [("py", crc._crc_py), ("table", crc._crc_table), ("numpy", crc._crc_numpy)]
+    if crc.crc_lib is not None:
+        CrossCheck(variants)
+        variants.append(("ctypes", crc._crc_ctypes))
+    else:
+        print("  no crc library for this platform, cross check skipped")
+    Bench(variants)
@@ -0,0 +1,48 @@
+import time
+
+import numpy as np
+
+from unitree_sdk2py.idl.default import unitree_go_msg_dds__LowCmd_
+from unitree_sdk2py.utils.crc import CRC
+from unitree_sdk2py.utils.lowcmd import LowCmdBuffer
+
+NUMBER = 20000
+KP = 60.0
+KD = 5.0
+
+
+def BenchSample(target: np.ndarray):
+    # attribute writes per motor and a full crc, the way the stand examples build the command
+    crc = CRC()
+    cmd = unitree_go_msg_dds__LowCmd_()
+    start = time.perf_counter()
+    for n in range(NUMBER):
+        for i in range(12):
+            cmd.motor_cmd[i].q = float(target[i])
+            cmd.motor_cmd[i].dq = 0
+            cmd.motor_cmd[i].kp = KP
+            cmd.motor_cmd[i].kd = KD
+            cmd.motor_cmd[i].tau = 0
+        cmd.crc = crc.Crc(cmd)
+    return (time.perf_counter() - start) / NUMBER, cmd
+
+
+def BenchBuffer(target: np.ndarray):
+    buf = LowCmdBuffer()
+    start = time.perf_counter()
+    for n in range(NUMBER):
+        buf.q[:12] = target
+        buf.dq[:12] = 0
+        buf.kp[:12] = KP
+        buf.kd[:12] = KD
+        buf.tau[:12] = 0
+        cmd = buf.ToLowCmd()
+    return (time.perf_counter() - start) / NUMBER, cmd
+
+
+if __name__ == "__main__":
+    target = np.linspace(-2.65, 1.36, 12)
+    sampleTime, sampleCmd = BenchSample(target)
+    bufferTime, bufferCmd = BenchBuffer(target)
+    print("  LowCmd_ attributes: {:8.2f} us/cycle".format(sampleTime * 1e6))
+    print("  LowCmdBuffer:       {:8.2f} us/cycle, crc match: {}".format(bufferTime * 1e6, sampleCmd.crc == bufferCmd.crc))
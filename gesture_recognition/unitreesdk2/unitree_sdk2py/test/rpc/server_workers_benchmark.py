@@ -0,0 +1,153 @@
+import sys
+import time
+import threading
+
+from unitree_sdk2py.core.channel import ChannelFactoryInitialize
+from unitree_sdk2py.rpc.server import Server
+from unitree_sdk2py.rpc.client import Client
+
+from test_api import *
+
+# simulated handler work (io bound, releases the gil)
+HANDLER_SLEEP = 0.001
+CALLER_THREADS = 16
+DURATION = 3.0
+WORKER_COUNTS = [1, 2, 4, 8]
+
+# callers spread over several apis, so per api ordering can still use all workers
+BENCH_API_IDS = [2001 + i for i in range(8)]
+
+# slow api run: one api saturates its pinned queue, the others must not wait for it
+SLOW_API_ID = 2101
+SLOW_HANDLER_SLEEP = 0.05
+SLOW_CALLER_THREADS = 32
+SLOW_WORKER_COUNT = 4
+
+
+"""
+" class BenchServer
+"""
+class BenchServer(Server):
+    def __init__(self, name: str):
+        super().__init__(name)
+
+    def Init(self):
+        for apiId in BENCH_API_IDS:
+            self._RegistHandler(apiId, self.Move, 0)
+        self._RegistHandler(SLOW_API_ID, self.SlowMove, 0)
+        self._SetApiVersion(TEST_API_VERSION)
+
+    def Move(self, parameter: str):
+        time.sleep(HANDLER_SLEEP)
+        return 0, ""
+
+    def SlowMove(self, parameter: str):
+        time.sleep(SLOW_HANDLER_SLEEP)
+        return 0, ""
+
+
+"""
+" class BenchClient
+"""
+class BenchClient(Client):
+    def __init__(self, name: str):
+        super().__init__(name, False)
+
+    def Init(self):
+        for apiId in BENCH_API_IDS:
+            self._RegistApi(apiId, 0)
+        self._RegistApi(SLOW_API_ID, 0)
+        self._SetApiVerson(TEST_API_VERSION)
+
+    def Move(self, apiId: int):
+        c, d = self._Call(apiId, "{}")
+        return c
+
+
+def Run(workerCount: int, keepOrder: bool):
+    name = "bench_w{}_{}".format(workerCount, int(keepOrder))
+
+    server = BenchServer(name)
+    server.Init()
+    server.Start(False, workerCount, keepOrder)
+
+    client = BenchClient(name)
+    client.Init()
+    client.SetTimeout(5.0)
+
+    calls = [0] * CALLER_THREADS
+    errors = [0] * CALLER_THREADS
+    deadline = time.monotonic() + DURATION
+
+    def Caller(index: int):
+        apiId = BENCH_API_IDS[index % len(BENCH_API_IDS)]
+        while time.monotonic() < deadline:
+            if client.Move(apiId) == 0:
+                calls[index] += 1
+            else:
+                errors[index] += 1
+
+    threads = [threading.Thread(target=Caller, args=(i,)) for i in range(CALLER_THREADS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    print("workers: {}, keep order: {}, rate: {:.0f} req/s, errors: {}, dropped: {}".format(
+        workerCount, keepOrder, sum(calls) / DURATION, sum(errors), server.GetDroppedCount()))
+
+
+def RunSlowApi():
+    # keepOrder pins SLOW_API_ID to one worker queue and floods it. fast apis live on the other
+    # queues, their latency must stay at the handler time while the slow queue drops requests
+    name = "bench_slow"
+
+    server = BenchServer(name)
+    server.Init()
+    server.Start(False, SLOW_WORKER_COUNT, True)
+
+    fastClient = BenchClient(name)
+    fastClient.Init()
+    fastClient.SetTimeout(5.0)
+    slowClient = BenchClient(name)
+    slowClient.Init()
+    slowClient.SetTimeout(0.5)
+
+    fastApiIds = [apiId for apiId in BENCH_API_IDS if apiId % SLOW_WORKER_COUNT != SLOW_API_ID % SLOW_WORKER_COUNT]
+    latencies = []
+    deadline = time.monotonic() + DURATION
+
+    def FastCaller(index: int):
+        apiId = fastApiIds[index % len(fastApiIds)]
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            if fastClient.Move(apiId) == 0:
+                latencies.append(time.perf_counter() - start)
+
+    def SlowCaller():
+        while time.monotonic() < deadline:
+            slowClient.Move(SLOW_API_ID)
+
+    threads = [threading.Thread(target=SlowCaller) for i in range(SLOW_CALLER_THREADS)]
+    threads += [threading.Thread(target=FastCaller, args=(i,)) for i in range(len(fastApiIds))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    latencies.sort()
+    n = len(latencies)
+    print("slow api: fast calls {}, latency p50 {:.1f} ms, p99 {:.1f} ms, max {:.1f} ms (handler {:.0f} ms), dropped: {}".format(
+        n, latencies[n // 2] * 1e3, latencies[n * 99 // 100] * 1e3, latencies[-1] * 1e3, HANDLER_SLEEP * 1e3,
+        server.GetDroppedCount()))
+
+
+if __name__ == "__main__":
+    keepOrder = len(sys.argv) > 1 and sys.argv[1] == "ordered"
+
+    ChannelFactoryInitialize(0)
+
+    for workerCount in WORKER_COUNTS:
+        Run(workerCount, keepOrder)
+
+    RunSlowApi()
@@ -0,0 +1,113 @@
+import sys
+import time
+import resource
+
+from unitree_sdk2py.core.channel import ChannelFactoryInitialize
+from unitree_sdk2py.rpc.server import Server
+from unitree_sdk2py.rpc.client import Client
+from unitree_sdk2py.rpc.internal import RPC_ERR_CLIENT_API_TIMEOUT
+
+from test_api import *
+
+# every SLOW_EVERY call is answered after the client timed out
+SLOW_EVERY = 100
+SLOW_SLEEP = 0.005
+FAST_TIMEOUT = 1.0
+SLOW_TIMEOUT = 0.002
+REPORT_EVERY = 100000
+
+# allowed rss growth after warm up
+RSS_LIMIT_MB = 32
+
+
+"""
+" class SoakServer
+"""
+class SoakServer(Server):
+    def __init__(self):
+        super().__init__("soak")
+
+    def Init(self):
+        self._RegistHandler(TEST_API_ID_MOVE, self.Move, 0)
+        self._RegistHandler(TEST_API_ID_STOP, self.Stop, 0)
+        self._SetApiVersion(TEST_API_VERSION)
+
+    def Move(self, parameter: str):
+        return 0, ""
+
+    def Stop(self, parameter: str):
+        time.sleep(SLOW_SLEEP)
+        return 0, ""
+
+
+"""
+" class SoakClient
+"""
+class SoakClient(Client):
+    def __init__(self):
+        super().__init__("soak", False)
+
+    def Init(self):
+        self._RegistApi(TEST_API_ID_MOVE, 0)
+        self._RegistApi(TEST_API_ID_STOP, 0)
+        self._SetApiVerson(TEST_API_VERSION)
+
+    def Move(self):
+        c, d = self._Call(TEST_API_ID_MOVE, "{}")
+        return c
+
+    def Stop(self):
+        c, d = self._Call(TEST_API_ID_STOP, "{}")
+        return c
+
+
+def RssMB():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * resource.getpagesize() / (1024 * 1024)
+
+
+if __name__ ==  "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+    ChannelFactoryInitialize(0)
+
+    server = SoakServer()
+    server.Init()
+    server.Start(False)
+
+    client = SoakClient()
+    client.Init()
+
+    errors = 0
+    timeouts = 0
+    baseline = None
+    start = time.monotonic()
+
+    for i in range(1, count + 1):
+        if i % SLOW_EVERY == 0:
+            client.SetTimeout(SLOW_TIMEOUT)
+            code = client.Stop()
+            client.SetTimeout(FAST_TIMEOUT)
+        else:
+            code = client.Move()
+
+        if code == RPC_ERR_CLIENT_API_TIMEOUT:
+            timeouts += 1
+        elif code != 0:
+            errors += 1
+
+        if i % REPORT_EVERY == 0:
+            rss = RssMB()
+            if baseline is None:
+                baseline = rss
+            print("calls: {}, rate: {:.0f}/s, timeouts: {}, errors: {}, rss: {:.1f} MB".format(
+                i, i / (time.monotonic() - start), timeouts, errors, rss))
+
+    growth = RssMB() - (baseline if baseline is not None else RssMB())
+    print("rss growth after warm up: {:.1f} MB (limit {} MB)".format(growth, RSS_LIMIT_MB))
+
+    if growth > RSS_LIMIT_MB:
+        print("soak FAILED: memory is not bounded")
+        sys.exit(1)
+
+    print("soak OK")
@@ -0,0 +1,103 @@
+import time
+import queue
+import threading
+
+from threading import Condition
+
+from unitree_sdk2py.utils.future import Future, FutureResult
+
+NUMBER = 100000
+PAIRS = 4
+WAITERS = 8
+
+
+"""
+" class LegacyFuture. the previous Condition based implementation, kept for comparison.
+"""
+class LegacyFuture:
+    def __init__(self):
+        self.__ready = False
+        self.__value = None
+        self.__condition = Condition()
+
+    def GetResult(self, timeout: float = None):
+        with self.__condition:
+            if not self.__ready:
+                if not self.__condition.wait(timeout):
+                    return FutureResult(FutureResult.FUTUTE_ERR_TIMEOUT, "future wait timeout")
+            return FutureResult(FutureResult.FUTURE_SUCC, "success", self.__value)
+
+    def Ready(self, value):
+        with self.__condition:
+            self.__value = value
+            self.__ready = True
+            self.__condition.notify()
+            return True
+
+
+def BenchSingle(futureType):
+    start = time.perf_counter()
+    for i in range(NUMBER):
+        f = futureType()
+        f.Ready(i)
+        f.GetResult(1.0)
+    return NUMBER / (time.perf_counter() - start)
+
+
+def BenchPairs(futureType):
+    # each pair: a requester creates a future and waits, a responder completes it
+    count = NUMBER // PAIRS
+
+    def Pair():
+        posted = queue.SimpleQueue()
+
+        def Responder():
+            for i in range(count):
+                posted.get().Ready(i)
+
+        t = threading.Thread(target=Responder, daemon=True)
+        t.start()
+        for i in range(count):
+            f = futureType()
+            posted.put(f)
+            f.GetResult(1.0)
+        t.join()
+
+    threads = [threading.Thread(target=Pair) for _ in range(PAIRS)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return count * PAIRS / (time.perf_counter() - start)
+
+
+def BenchWaiters(futureType):
+    # several waiters on one future, count how many wake up on completion
+    f = futureType()
+    woken = []
+
+    def Waiter():
+        if f.GetResult(0.5).code == FutureResult.FUTURE_SUCC:
+            woken.append(1)
+
+    threads = [threading.Thread(target=Waiter) for _ in range(WAITERS)]
+    for t in threads:
+        t.start()
+    time.sleep(0.1)
+    f.Ready(True)
+    for t in threads:
+        t.join()
+    return len(woken)
+
+
+if __name__ == "__main__":
+    for name, futureType in (("condition (old)", LegacyFuture), ("event (new)", Future)):
+        print("{:<16} single thread: {:9.0f} ops/s, {} pairs: {:9.0f} ops/s, waiters woken: {}/{}".format(
+            name, BenchSingle(futureType), PAIRS, BenchPairs(futureType), BenchWaiters(futureType), WAITERS))
+
+    # chaining
+    f = Future()
+    cf = f.ToConcurrentFuture()
+    f.Ready(42)
+    print("concurrent.futures result:", cf.result(1.0))
@@ -0,0 +1,62 @@
+import time
+import random
+from threading import Lock, Thread
+
+from unitree_sdk2py.utils.hz_sample import HZSample
+
+NUMBER = 200000
+THREADS = 4
+
+
+class LockedCounter:
+    # the previous Sample: one counter behind a lock
+    def __init__(self):
+        self.__count = 0
+        self.__lock = Lock()
+
+    def Sample(self):
+        with self.__lock:
+            self.__count += 1
+
+
+def Bench(name: str, func, *args):
+    start = time.perf_counter()
+    for i in range(NUMBER):
+        func(*args)
+    print("  {:<26} {:6.3f} us/call".format(name, (time.perf_counter() - start) / NUMBER * 1e6))
+
+
+def BenchThreads(meter: HZSample):
+    # THREADS threads sampling at once, merged count must be exact
+    rand = random.Random(0)
+    latencies = [rand.lognormvariate(-9.0, 1.0) for i in range(1000)]
+
+    def Loop():
+        for i in range(NUMBER // THREADS):
+            meter.SampleLatency(latencies[i % 1000])
+
+    meter.Clear()
+    threads = [Thread(target=Loop) for i in range(THREADS)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    summary = meter.GetSummary()
+    print("  {} threads: {} events ({} expected), {:.0f}/s, p50 <= {:.1f} us, p95 <= {:.1f} us, p99 <= {:.1f} us".format(
+        THREADS, summary["events"], NUMBER // THREADS * THREADS, summary["events"] / elapsed,
+        summary["p50"] * 1e6, summary["p95"] * 1e6, summary["p99"] * 1e6))
+    latencies.sort()
+    print("  exact:     p50 {:.1f} us, p95 {:.1f} us, p99 {:.1f} us".format(
+        latencies[500] * 1e6, latencies[950] * 1e6, latencies[990] * 1e6))
+
+
+if __name__ == "__main__":
+    meter = HZSample()
+    Bench("locked counter", LockedCounter().Sample)
+    Bench("HZSample.Sample", meter.Sample)
+    Bench("HZSample.SampleLatency", meter.SampleLatency, 0.0001)
+    Bench("HZSample.Wrap", meter.Wrap(lambda: None))
+    BenchThreads(meter)
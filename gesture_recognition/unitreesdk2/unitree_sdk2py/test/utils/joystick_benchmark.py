@@ -0,0 +1,84 @@
+import time
+import random
+import struct
+
+from unitree_sdk2py.utils.joystick import Joystick
+
+NUMBER = 20000
+MESSAGES = 1000
+
+
+def OldDecode(wireless_remote):
+    # the previous bit string decode, buttons in _BUTTON_BITS order and the raw axes
+    button1 = [int(data) for data in f'{wireless_remote[2]:08b}']
+    button2 = [int(data) for data in f'{wireless_remote[3]:08b}']
+    buttons = button1[2:8] + button2[0:8]
+    axes = [struct.unpack('f', bytes(wireless_remote[i:i + 4]))[0] for i in (4, 8, 12, 20)]
+    return buttons, axes
+
+
+def OldExtract(joystick: Joystick, wireless_remote):
+    # the previous extract body, without the activity check
+    buttons, axes = OldDecode(wireless_remote)
+    for button, data in zip([joystick.LT, joystick.RT, joystick.back, joystick.start, joystick.LB, joystick.RB,
+                             joystick.left, joystick.down, joystick.right, joystick.up,
+                             joystick.Y, joystick.X, joystick.B, joystick.A], buttons):
+        button(data)
+    for axis, data in zip([joystick.lx, joystick.rx, joystick.ry, joystick.ly], axes):
+        axis(data)
+
+
+def OldCombine(buttons, axes):
+    wireless_remote = [0 for _ in range(40)]
+    wireless_remote[2] = int(''.join([f'{key}' for key in [0, 0] + buttons[0:6]]), 2)
+    wireless_remote[3] = int(''.join([f'{key}' for key in buttons[6:14]]), 2)
+    packs = list(map(lambda x: struct.pack('f', x), axes))
+    wireless_remote[4:8] = packs[0]
+    wireless_remote[8:12] = packs[1]
+    wireless_remote[12:16] = packs[2]
+    wireless_remote[20:24] = packs[3]
+    return wireless_remote
+
+
+def RandomRemote(rand: random.Random):
+    remote = [rand.getrandbits(8) for i in range(40)]
+    for i in (4, 8, 12, 16, 20):
+        remote[i:i + 4] = struct.pack('<f', rand.uniform(-1.0, 1.0))
+    return remote
+
+
+def CrossCheck(joystick: Joystick):
+    # buttons and combine must match the old string based code
+    rand = random.Random(0)
+    names = ["LT", "RT", "back", "start", "LB", "RB", "left", "down", "right", "up", "Y", "X", "B", "A"]
+    for n in range(MESSAGES):
+        remote = RandomRemote(rand)
+        joystick.extract(remote)
+        buttons, axes = OldDecode(remote)
+        if [getattr(joystick, name).data for name in names] != buttons:
+            return False
+        for axis, value in zip([joystick.lx, joystick.rx, joystick.ry, joystick.ly], axes):
+            axis.data = value
+        if joystick.combine() != OldCombine(buttons, axes):
+            return False
+    return True
+
+
+def Bench(name: str, func, *args):
+    start = time.perf_counter()
+    for i in range(NUMBER):
+        func(*args)
+    print("  {:<20} {:6.2f} us/call".format(name, (time.perf_counter() - start) / NUMBER * 1e6))
+
+
+if __name__ == "__main__":
+    joystick = Joystick()
+    print("  cross check: {}".format(CrossCheck(joystick)))
+
+    remote = RandomRemote(random.Random(1))
+    buttons, axes = OldDecode(remote)
+    Bench("old decode", OldDecode, remote)
+    Bench("old extract", OldExtract, joystick, remote)
+    Bench("extract", joystick.extract, remote)
+    Bench("old combine", OldCombine, buttons, axes)
+    Bench("combine", joystick.combine)
@@ -0,0 +1,67 @@
+import time
+import struct
+
+import numpy as np
+
+from unitree_sdk2py.idl.default import std_msgs_msg_dds__Header_
+from unitree_sdk2py.idl.sensor_msgs.msg.dds_ import PointCloud2_, PointField_
+from unitree_sdk2py.idl.unitree_go.msg.dds_ import HeightMap_
+from unitree_sdk2py.utils.pointcloud import PointCloudArray, PointCloudXYZ, HeightMapGrid
+
+POINTS = 200000
+REPEAT = 20
+
+
+def MakeCloud():
+    # x, y, z, intensity float32 + ring uint16, padded to 24 bytes, like the lidar cloud
+    fields = [PointField_("x", 0, 7, 1), PointField_("y", 4, 7, 1), PointField_("z", 8, 7, 1),
+              PointField_("intensity", 12, 7, 1), PointField_("ring", 16, 4, 1)]
+    dtype = np.dtype({"names": ["x", "y", "z", "intensity", "ring"], "formats": ["<f4"] * 4 + ["<u2"],
+                      "offsets": [0, 4, 8, 12, 16], "itemsize": 24})
+    points = np.zeros(POINTS, dtype)
+    points["x"] = np.random.rand(POINTS)
+    points["y"] = np.random.rand(POINTS)
+    points["z"] = np.random.rand(POINTS)
+    data = points.tobytes()
+    return PointCloud2_(std_msgs_msg_dds__Header_(), 1, POINTS, fields, False, 24, 24 * POINTS, data, True)
+
+
+def BenchLoop(msg: PointCloud2_):
+    # struct.unpack per point, the way the data is decoded without numpy
+    data = bytes(msg.data)
+    start = time.perf_counter()
+    xyz = [struct.unpack_from("<3f", data, i * msg.point_step) for i in range(msg.width)]
+    elapsed = time.perf_counter() - start
+    print("  loop:       {:10.0f} points/s".format(len(xyz) / elapsed))
+
+
+def BenchView(msg: PointCloud2_):
+    start = time.perf_counter()
+    for i in range(REPEAT):
+        xyz = PointCloudXYZ(msg)
+        intensity = PointCloudArray(msg)["intensity"]
+    elapsed = time.perf_counter() - start
+    print("  view:       {:10.0f} points/s".format(POINTS * REPEAT / elapsed))
+
+    start = time.perf_counter()
+    for i in range(REPEAT):
+        xyz = PointCloudXYZ(msg, removeNan=True)
+    elapsed = time.perf_counter() - start
+    print("  nan filter: {:10.0f} points/s".format(POINTS * REPEAT / elapsed))
+
+
+def BenchHeightMap():
+    msg = HeightMap_(0.0, "odom", 0.06, 128, 128, [-3.84, -3.84], list(np.random.rand(128 * 128).astype(np.float32)))
+    start = time.perf_counter()
+    for i in range(REPEAT):
+        grid = HeightMapGrid(msg)
+        heights = grid.HeightAt(np.random.rand(1000), np.random.rand(1000))
+    elapsed = time.perf_counter() - start
+    print("  heightmap:  {:10.2f} ms/map".format(elapsed / REPEAT * 1e3))
+
+
+if __name__ == "__main__":
+    msg = MakeCloud()
+    BenchLoop(msg)
+    BenchView(msg)
+    BenchHeightMap()
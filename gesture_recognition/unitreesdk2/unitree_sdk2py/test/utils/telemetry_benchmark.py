@@ -0,0 +1,79 @@
+import time
+
+import numpy as np
+
+from unitree_sdk2py.idl.default import unitree_go_msg_dds__LowState_, unitree_go_msg_dds__SportModeState_
+from unitree_sdk2py.idl.default import unitree_hg_msg_dds__LowState_
+from unitree_sdk2py.utils.telemetry import LowStateRing, SportModeStateRing
+
+NUMBER = 5000
+BATCH = 500
+
+
+def MakeLowStates(factory, motorCount: int):
+    samples = []
+    for i in range(NUMBER):
+        state = factory()
+        state.tick = i
+        for j in range(motorCount):
+            state.motor_state[j].q = i * 0.001 + j
+        samples.append(state)
+    return samples
+
+
+def BenchLoop(samples: list, motorCount: int):
+    # per attribute python, the way analysis code walks motor_state today
+    start = time.perf_counter()
+    q = np.zeros((len(samples), motorCount), np.float32)
+    dq = np.zeros((len(samples), motorCount), np.float32)
+    tau = np.zeros((len(samples), motorCount), np.float32)
+    for i, state in enumerate(samples):
+        for j in range(motorCount):
+            motor = state.motor_state[j]
+            q[i, j] = motor.q
+            dq[i, j] = motor.dq
+            tau[i, j] = motor.tau_est
+    return time.perf_counter() - start, q
+
+
+def BenchRing(samples: list, ring, batch: int):
+    start = time.perf_counter()
+    for i in range(0, len(samples), batch):
+        ring.Extend(samples[i:i + batch])
+    return time.perf_counter() - start
+
+
+def BenchLowState(name: str, factory, motorCount: int):
+    samples = MakeLowStates(factory, motorCount)
+
+    loopElapsed, q = BenchLoop(samples, motorCount)
+    print("  {} loop:        {:8.2f} us/sample".format(name, loopElapsed / NUMBER * 1e6))
+
+    for batch in (1, BATCH):
+        ring = LowStateRing(NUMBER, motorCount)
+        elapsed = BenchRing(samples, ring, batch)
+        ok = np.array_equal(ring.Get("q"), q)
+        print("  {} ring[{:3d}]:   {:8.2f} us/sample, match: {}".format(name, batch, elapsed / NUMBER * 1e6, ok))
+
+    # batched, the ring has to beat the loop it replaces (it also keeps ddq, imu and tick)
+    assert elapsed < loopElapsed, "{} ring[{}] slower than the loop".format(name, BATCH)
+
+
+def BenchSportModeState():
+    samples = []
+    for i in range(NUMBER):
+        state = unitree_go_msg_dds__SportModeState_()
+        state.position[0] = i
+        samples.append(state)
+
+    for batch in (1, BATCH):
+        ring = SportModeStateRing(NUMBER)
+        elapsed = BenchRing(samples, ring, batch)
+        ok = np.array_equal(ring.Get("position")[:, 0], np.arange(NUMBER, dtype=np.float32))
+        print("  sport ring[{:3d}]:     {:8.2f} us/sample, match: {}".format(batch, elapsed / NUMBER * 1e6, ok))
+
+
+if __name__ == "__main__":
+    BenchLowState("go2", unitree_go_msg_dds__LowState_, 20)
+    BenchLowState("hg ", unitree_hg_msg_dds__LowState_, 35)
+    BenchSportModeState()
@@ -0,0 +1,37 @@
+import time
+
+from unitree_sdk2py.utils.thread import RecurrentThread
+
+DURATION = 3.0
+INTERVALS = [0.001, 0.0005, 0.0002, 0.0001]
+
+
+def Work():
+    # a small target, the loop overhead dominates
+    return sum(range(20))
+
+
+def Run(name: str, thread: RecurrentThread):
+    # iterations per second and process cpu seconds per wall second while the loop runs
+    cpu = time.process_time()
+    start = time.monotonic()
+    thread.Start()
+    time.sleep(DURATION)
+    thread.Wait()
+    wall = time.monotonic() - start
+    cpu = time.process_time() - cpu
+    stats = thread.GetStats()
+    print("  {:<24} {:10.0f} it/s, cpu {:5.1f} %, missed {}".format(
+        name, stats["iterations"] / wall, cpu / wall * 100.0, stats["missed"]))
+
+
+if __name__ == "__main__":
+    print("timerfd:")
+    for interval in INTERVALS:
+        Run("interval {:.1f} ms".format(interval * 1e3), RecurrentThread(interval, Work))
+
+    print("as fast as possible:")
+    Run("no yield", RecurrentThread(0, Work, yieldEvery=0))
+    Run("yield every 1", RecurrentThread(0, Work, yieldEvery=1))
+    Run("yield every 100", RecurrentThread(0, Work, yieldEvery=100))
+    Run("spin budget 1 ms", RecurrentThread(0, Work, spinBudget=0.001))
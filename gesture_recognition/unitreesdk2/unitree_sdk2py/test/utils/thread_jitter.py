@@ -0,0 +1,44 @@
+import sys
+import time
+
+from unitree_sdk2py.utils.thread import RecurrentThread
+
+INTERVAL = 0.002
+DURATION = 10.0
+
+
+def PrintHistogram(name: str, summary: dict):
+    print("  {}: mean {:7.1f} us, p50 <= {:7.1f} us, p99 <= {:7.1f} us, max {:7.1f} us".format(
+        name, summary["mean"] * 1e6, summary["p50"] * 1e6, summary["p99"] * 1e6, summary["max"] * 1e6))
+    lower = 0.0
+    for edge, count in zip(list(summary["edges"]) + [float("inf")], summary["counts"]):
+        if count:
+            print("    {:>8.0f} .. {:>8.0f} us: {}".format(lower * 1e6, edge * 1e6, count))
+        lower = edge
+
+
+def Work():
+    # a little python work, like a control loop building one command
+    x = 0.0
+    for i in range(200):
+        x += i * 0.5
+    return x
+
+
+if __name__ == "__main__":
+    # usage: thread_jitter.py [SCHED_FIFO priority] [cpu]
+    priority = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    cpus = [int(sys.argv[2])] if len(sys.argv) > 2 else None
+
+    thread = RecurrentThread(INTERVAL, Work, "jitter", priority=priority, cpus=cpus)
+    thread.Start()
+    time.sleep(DURATION)
+    thread.Wait()
+
+    stats = thread.GetStats()
+    expected = int(DURATION / INTERVAL)
+    print("interval {:.1f} ms, priority {}, cpus {}".format(INTERVAL * 1e3, priority, cpus))
+    print("  iterations: {} (~{} expected), missed ticks: {}, exceptions: {}".format(
+        stats["iterations"], expected, stats["missed"], stats["exceptions"]))
+    PrintHistogram("lateness ", stats["lateness"])
+    PrintHistogram("execution", stats["execution"])
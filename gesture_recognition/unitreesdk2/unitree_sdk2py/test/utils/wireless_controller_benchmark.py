@@ -0,0 +1,65 @@
+import time
+import random
+
+from unitree_sdk2py.idl.default import unitree_go_msg_dds__WirelessController_
+from unitree_sdk2py.utils.wireless_controller import WirelessControllerState, WIRELESS_CONTROLLER_KEYS
+
+NUMBER = 50000
+PRESS_EVERY = 100
+
+key_state = [[name, 0] for name in WIRELESS_CONTROLLER_KEYS]
+
+
+def OldHandler(msg):
+    # the previous example decode without the prints
+    for i in range(16):
+        key_state[i][1] = (msg.keys & (1 << i)) >> i
+
+
+def Messages():
+    # sticks move every message, a key changes every PRESS_EVERY messages like a real controller
+    rand = random.Random(0)
+    msgs = []
+    keys = 0
+    for n in range(NUMBER):
+        if n % PRESS_EVERY == 0:
+            keys ^= 1 << rand.randrange(16)
+        msg = unitree_go_msg_dds__WirelessController_()
+        msg.lx, msg.ly, msg.rx, msg.ry = [rand.uniform(-1.0, 1.0) for i in range(4)]
+        msg.keys = keys
+        msgs.append(msg)
+    return msgs
+
+
+def Bench(name: str, handler, msgs: list):
+    start = time.perf_counter()
+    for msg in msgs:
+        handler(msg)
+    print("  {:<28} {:6.3f} us/msg".format(name, (time.perf_counter() - start) / len(msgs) * 1e6))
+
+
+if __name__ == "__main__":
+    msgs = Messages()
+    edges = {"pressed": 0, "released": 0}
+
+    def Pressed(state, mask):
+        edges["pressed"] += 1
+
+    def Released(state, mask):
+        edges["released"] += 1
+
+    Bench("old 16 bit loop", OldHandler, msgs)
+    Bench("state, no callbacks", WirelessControllerState().Update, msgs)
+
+    state = WirelessControllerState()
+    state.OnPressed(["A", "B"], Pressed)
+    state.OnReleased("A", Released)
+    Bench("state, A/B callbacks", state.Update, msgs)
+
+    state = WirelessControllerState()
+    state.OnPressed(0xFFFF, Pressed)
+    state.OnReleased(0xFFFF, Released)
+    edges = {"pressed": 0, "released": 0}
+    Bench("state, all keys callbacks", state.Update, msgs)
+    print("  edges: {} pressed, {} released, {} key changes".format(
+        edges["pressed"], edges["released"], NUMBER // PRESS_EVERY))
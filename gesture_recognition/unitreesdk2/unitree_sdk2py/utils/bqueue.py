@@ -1,17 +1,22 @@
 from typing import Any
 from collections import deque
-from threading import Condition
+from threading import Condition, Lock
 
 class BQueue:
     def __init__(self, maxLen: int = 10):
         self.__curLen = 0
         self.__maxLen = maxLen
         self.__queue = deque()
-        self.__condition = Condition()
+        self.__lock = Lock()
+        self.__condition = Condition(self.__lock)
+        self.__notFull = Condition(self.__lock)
 
-    def Put(self, x: Any, replace: bool = False):
+    def Put(self, x: Any, replace: bool = False, block: bool = False, timeout: float = None):
         noReplaced = True
         with self.__condition:
+            if self.__curLen >= self.__maxLen and block:
+                self.__notFull.wait_for(lambda: self.__curLen < self.__maxLen, timeout)
+
             if self.__curLen >= self.__maxLen:
                 if not replace:
                     return False
@@ -38,6 +43,7 @@ class BQueue:
                     return None
     
             self.__curLen -= 1
+            self.__notFull.notify()
             return self.__queue.popleft()
 
     def Clear(self):
@@ -45,6 +51,7 @@ class BQueue:
             if self.__queue:
                 self.__queue.clear()
                 self.__curLen = 0
+                self.__notFull.notify_all()
 
     def Size(self):
         with self.__condition:
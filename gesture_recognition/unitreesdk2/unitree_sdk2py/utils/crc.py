@@ -1,4 +1,6 @@
 import struct
+import numpy as np
+from itertools import chain
 import cyclonedds
 import cyclonedds.idl as idl
 
@@ -12,185 +14,153 @@ import ctypes
 import os
 import platform
 
+
+"""
+" word based crc32: msb first, polynomial 0x04c11db7, init 0xFFFFFFFF, no final xor.
+" each 32 bit word is xored into the register and the register is advanced by 32 bits.
+"""
+CRC32_POLYNOMIAL = 0x04c11db7
+CRC32_INIT = 0xFFFFFFFF
+
+
+def _Crc32Advance8(crc: int):
+    for b in range(8):
+        crc = ((crc << 1) ^ CRC32_POLYNOMIAL if crc & 0x80000000 else crc << 1) & 0xFFFFFFFF
+    return crc
+
+
+def _Crc32Tables():
+    # byte table, then slice-by-4 tables (register advanced 32 bits) and slice-by-8 tables (64 bits).
+    # table[lane][b] is the advanced register for byte b at lane (0 is the low byte)
+    byte = [_Crc32Advance8(b << 24) for b in range(256)]
+
+    def Advance(crc: int, bytes: int):
+        for i in range(bytes):
+            crc = ((crc << 8) & 0xFFFFFFFF) ^ byte[crc >> 24]
+        return crc
+
+    table32 = [[Advance(b << (8 * lane), 4) for b in range(256)] for lane in range(4)]
+    table64 = [[Advance(table32[lane][b], 4) for b in range(256)] for lane in range(4)]
+    return table32, table64
+
+
+_crc32Table32, _crc32Table64 = _Crc32Tables()
+_crc32Numpy32 = np.array(_crc32Table32, np.uint32)
+
+"""
+" numpy tables by word position: _crc32Position[j][lane][b] is byte b at lane advanced j words,
+" _crc32Init[j] the init value advanced j words. crc words are linear, so a message crc is the
+" xor of one lookup per byte. grown on demand.
+"""
+_crc32Position = np.array([[np.arange(256, dtype=np.uint32) << np.uint32(8 * lane) for lane in range(4)]])
+_crc32Init = np.array([CRC32_INIT], np.uint32)
+
+
+def _Crc32Advance32(crc: np.ndarray):
+    t = _crc32Numpy32
+    return t[3][crc >> 24] ^ t[2][(crc >> 16) & 0xFF] ^ t[1][(crc >> 8) & 0xFF] ^ t[0][crc & 0xFF]
+
+
+def _Crc32PositionTables(count: int):
+    global _crc32Position, _crc32Init
+    position, init = _crc32Position, _crc32Init
+    if len(position) <= count:
+        size = max(count + 1, 2 * len(position))
+        grownPosition = np.empty((size, 4, 256), np.uint32)
+        grownInit = np.empty(size, np.uint32)
+        grownPosition[:len(position)] = position
+        grownInit[:len(init)] = init
+        for j in range(len(position), size):
+            grownPosition[j] = _Crc32Advance32(grownPosition[j - 1])
+            grownInit[j] = _Crc32Advance32(grownInit[j - 1:j])[0]
+        # replaced, never changed, so concurrent callers keep a consistent pair
+        _crc32Position, _crc32Init = position, init = grownPosition, grownInit
+    return position, init
+
+
 class CRC(Singleton):
     def __init__(self):
-        #4 bytes aligned, little-endian format.
+        #4 bytes aligned, little-endian format. compiled once, not re-parsed per pack
         #size 812
-        self.__packFmtLowCmd = '<4B4IH2x' + 'B3x5f3I' * 20 + '4B' + '55Bx2I'
+        self.__packLowCmd = struct.Struct('<4B4IH2x' + 'B3x5f3I' * 20 + '4B' + '55Bx2I')
         #size 1180
-        self.__packFmtLowState = '<4B4IH2x' + '13fb3x' + 'B3x7fb3x3I' * 20 + '4BiH4b15H' + '8hI41B3xf2b2x2f4h2I'
+        self.__packLowState = struct.Struct('<4B4IH2x' + '13fb3x' + 'B3x7fb3x3I' * 20 + '4BiH4b15H' + '8hI41B3xf2b2x2f4h2I')
         #size 1004
-        self.__packFmtHGLowCmd = '<2B2x' + 'B3x5fI' * 35 + '5I'
+        self.__packHGLowCmd = struct.Struct('<2B2x' + 'B3x5fI' * 35 + '5I')
         #size 2092
-        self.__packFmtHGLowState = '<2I2B2xI' + '13fh2x' + 'B3x4f2hf7I' * 35 + '40B5I'
+        self.__packHGLowState = struct.Struct('<2I2B2xI' + '13fh2x' + 'B3x4f2hf7I' * 35 + '40B5I')
 
         
+        # bundled library when there is one for this platform, table driven crc otherwise
         script_dir = os.path.dirname(os.path.abspath(__file__))
         self.platform = platform.system()
+        self.crc_lib = None
         if self.platform == "Linux":
             if platform.machine()=="x86_64":
                 self.crc_lib = ctypes.CDLL(script_dir + '/lib/crc_amd64.so')
             elif platform.machine()=="aarch64":
                 self.crc_lib = ctypes.CDLL(script_dir + '/lib/crc_aarch64.so')
 
+        if self.crc_lib is not None:
             self.crc_lib.crc32_core.argtypes = (ctypes.POINTER(ctypes.c_uint32), ctypes.c_uint32)
             self.crc_lib.crc32_core.restype = ctypes.c_uint32
     
     def Crc(self, msg: idl.IdlStruct):
         if msg.__idl_typename__ == 'unitree_go.msg.dds_.LowCmd_':
-            return self.__Crc32(self.__PackLowCmd(msg))
+            return self.__Crc32(self.__Trans(self.__PackLowCmd(msg)))
         elif msg.__idl_typename__ == 'unitree_go.msg.dds_.LowState_':
-            return self.__Crc32(self.__PackLowState(msg))
+            return self.__Crc32(self.__Trans(self.__PackLowState(msg)))
         if msg.__idl_typename__ == 'unitree_hg.msg.dds_.LowCmd_':
-            return self.__Crc32(self.__PackHGLowCmd(msg))
+            return self.__Crc32(self.__Trans(self.__PackHGLowCmd(msg)))
         elif msg.__idl_typename__ == 'unitree_hg.msg.dds_.LowState_':
-            return self.__Crc32(self.__PackHGLowState(msg))
+            return self.__Crc32(self.__Trans(self.__PackHGLowState(msg)))
         else:
             raise TypeError('unknown IDL message type to crc')
 
+    def CrcWords(self, words):
+        # crc of an already packed message: its little endian words without the trailing crc word
+        return self.__Crc32(words)
+
     def __PackLowCmd(self, cmd: LowCmd_):
-        origData = []
-        origData.extend(cmd.head)
-        origData.append(cmd.level_flag)
-        origData.append(cmd.frame_reserve)
-        origData.extend(cmd.sn)
-        origData.extend(cmd.version)
-        origData.append(cmd.bandwidth)
-
-        for i in range(20):
-            origData.append(cmd.motor_cmd[i].mode)
-            origData.append(cmd.motor_cmd[i].q)
-            origData.append(cmd.motor_cmd[i].dq)
-            origData.append(cmd.motor_cmd[i].tau)
-            origData.append(cmd.motor_cmd[i].kp)
-            origData.append(cmd.motor_cmd[i].kd)
-            origData.extend(cmd.motor_cmd[i].reserve)
-
-        origData.append(cmd.bms_cmd.off)
-        origData.extend(cmd.bms_cmd.reserve)
-
-        origData.extend(cmd.wireless_remote)
-        origData.extend(cmd.led)
-        origData.extend(cmd.fan)
-        origData.append(cmd.gpio)
-        origData.append(cmd.reserve)
-        origData.append(cmd.crc)
-
-        return self.__Trans(struct.pack(self.__packFmtLowCmd, *origData))
+        bms = cmd.bms_cmd
+        return self.__packLowCmd.pack(
+            *cmd.head, cmd.level_flag, cmd.frame_reserve, *cmd.sn, *cmd.version, cmd.bandwidth,
+            *chain.from_iterable((m.mode, m.q, m.dq, m.tau, m.kp, m.kd, *m.reserve) for m in cmd.motor_cmd[:20]),
+            bms.off, *bms.reserve,
+            *cmd.wireless_remote, *cmd.led, *cmd.fan, cmd.gpio, cmd.reserve, cmd.crc)
 
     def __PackLowState(self, state: LowState_):
-        origData = []
-        origData.extend(state.head)
-        origData.append(state.level_flag)
-        origData.append(state.frame_reserve)
-        origData.extend(state.sn)
-        origData.extend(state.version)
-        origData.append(state.bandwidth)
-        
-        origData.extend(state.imu_state.quaternion)
-        origData.extend(state.imu_state.gyroscope)
-        origData.extend(state.imu_state.accelerometer)
-        origData.extend(state.imu_state.rpy)
-        origData.append(state.imu_state.temperature)
-        
-        for i in range(20):
-            origData.append(state.motor_state[i].mode)
-            origData.append(state.motor_state[i].q)
-            origData.append(state.motor_state[i].dq)
-            origData.append(state.motor_state[i].ddq)
-            origData.append(state.motor_state[i].tau_est)
-            origData.append(state.motor_state[i].q_raw)
-            origData.append(state.motor_state[i].dq_raw)
-            origData.append(state.motor_state[i].ddq_raw)
-            origData.append(state.motor_state[i].temperature)
-            origData.append(state.motor_state[i].lost)
-            origData.extend(state.motor_state[i].reserve)
-
-        origData.append(state.bms_state.version_high)
-        origData.append(state.bms_state.version_low)
-        origData.append(state.bms_state.status)
-        origData.append(state.bms_state.soc)
-        origData.append(state.bms_state.current)
-        origData.append(state.bms_state.cycle)
-        origData.extend(state.bms_state.bq_ntc)
-        origData.extend(state.bms_state.mcu_ntc)
-        origData.extend(state.bms_state.cell_vol)
-        
-        origData.extend(state.foot_force)
-        origData.extend(state.foot_force_est)
-        origData.append(state.tick)
-        origData.extend(state.wireless_remote)
-        origData.append(state.bit_flag)
-        origData.append(state.adc_reel)
-        origData.append(state.temperature_ntc1)
-        origData.append(state.temperature_ntc2)
-        origData.append(state.power_v)
-        origData.append(state.power_a)
-        origData.extend(state.fan_frequency)
-        origData.append(state.reserve)
-        origData.append(state.crc)
-
-        return self.__Trans(struct.pack(self.__packFmtLowState, *origData))
+        imu = state.imu_state
+        bms = state.bms_state
+        return self.__packLowState.pack(
+            *state.head, state.level_flag, state.frame_reserve, *state.sn, *state.version, state.bandwidth,
+            *imu.quaternion, *imu.gyroscope, *imu.accelerometer, *imu.rpy, imu.temperature,
+            *chain.from_iterable((m.mode, m.q, m.dq, m.ddq, m.tau_est, m.q_raw, m.dq_raw, m.ddq_raw, m.temperature,
+                                  m.lost, *m.reserve) for m in state.motor_state[:20]),
+            bms.version_high, bms.version_low, bms.status, bms.soc, bms.current, bms.cycle,
+            *bms.bq_ntc, *bms.mcu_ntc, *bms.cell_vol,
+            *state.foot_force, *state.foot_force_est, state.tick, *state.wireless_remote, state.bit_flag,
+            state.adc_reel, state.temperature_ntc1, state.temperature_ntc2, state.power_v, state.power_a,
+            *state.fan_frequency, state.reserve, state.crc)
 
     def __PackHGLowCmd(self, cmd: HGLowCmd_):
-        origData = []
-        origData.append(cmd.mode_pr)
-        origData.append(cmd.mode_machine)
-
-        for i in range(35):
-            origData.append(cmd.motor_cmd[i].mode)
-            origData.append(cmd.motor_cmd[i].q)
-            origData.append(cmd.motor_cmd[i].dq)
-            origData.append(cmd.motor_cmd[i].tau)
-            origData.append(cmd.motor_cmd[i].kp)
-            origData.append(cmd.motor_cmd[i].kd)
-            origData.append(cmd.motor_cmd[i].reserve)
-
-        origData.extend(cmd.reserve)
-        origData.append(cmd.crc)
-
-        return self.__Trans(struct.pack(self.__packFmtHGLowCmd, *origData))
+        return self.__packHGLowCmd.pack(
+            cmd.mode_pr, cmd.mode_machine,
+            *chain.from_iterable((m.mode, m.q, m.dq, m.tau, m.kp, m.kd, m.reserve) for m in cmd.motor_cmd[:35]),
+            *cmd.reserve, cmd.crc)
 
     def __PackHGLowState(self, state: HGLowState_):
-        origData = []
-        origData.extend(state.version)
-        origData.append(state.mode_pr)
-        origData.append(state.mode_machine)
-        origData.append(state.tick)
-        
-        origData.extend(state.imu_state.quaternion)
-        origData.extend(state.imu_state.gyroscope)
-        origData.extend(state.imu_state.accelerometer)
-        origData.extend(state.imu_state.rpy)
-        origData.append(state.imu_state.temperature)
-        
-        for i in range(35):
-            origData.append(state.motor_state[i].mode)
-            origData.append(state.motor_state[i].q)
-            origData.append(state.motor_state[i].dq)
-            origData.append(state.motor_state[i].ddq)
-            origData.append(state.motor_state[i].tau_est)
-            origData.extend(state.motor_state[i].temperature)
-            origData.append(state.motor_state[i].vol)
-            origData.extend(state.motor_state[i].sensor)
-            origData.append(state.motor_state[i].motorstate)
-            origData.extend(state.motor_state[i].reserve)
-
-        origData.extend(state.wireless_remote)
-        origData.extend(state.reserve)
-        origData.append(state.crc)
-
-        return self.__Trans(struct.pack(self.__packFmtHGLowState, *origData))
+        imu = state.imu_state
+        return self.__packHGLowState.pack(
+            *state.version, state.mode_pr, state.mode_machine, state.tick,
+            *imu.quaternion, *imu.gyroscope, *imu.accelerometer, *imu.rpy, imu.temperature,
+            *chain.from_iterable((m.mode, m.q, m.dq, m.ddq, m.tau_est, *m.temperature, m.vol, *m.sensor,
+                                  m.motorstate, *m.reserve) for m in state.motor_state[:35]),
+            *state.wireless_remote, *state.reserve, state.crc)
 
     def __Trans(self, packData):
-        calcData = []
-        calcLen = ((len(packData)>>2)-1)
-
-        for i in range(calcLen):
-            d = ((packData[i*4+3] << 24) | (packData[i*4+2] << 16) | (packData[i*4+1] << 8) | (packData[i*4]))
-            calcData.append(d)
-
-        return calcData
+        # little endian words of the packed struct without the trailing crc word, no copy
+        return np.frombuffer(packData, '<u4', (len(packData) >> 2) - 1)
 
     def _crc_py(self, data):
         bit = 0
@@ -215,14 +185,41 @@ class CRC(Singleton):
         
         return crc
 
+    def _crc_table(self, data):
+        # slice-by-8: two words per step, the last odd word slice-by-4
+        a0, a1, a2, a3 = _crc32Table32
+        b0, b1, b2, b3 = _crc32Table64
+        crc = CRC32_INIT
+
+        it = iter(data)
+        for w0, w1 in zip(it, it):
+            x = crc ^ w0
+            crc = (b3[x >> 24] ^ b2[(x >> 16) & 0xFF] ^ b1[(x >> 8) & 0xFF] ^ b0[x & 0xFF] ^
+                   a3[w1 >> 24] ^ a2[(w1 >> 16) & 0xFF] ^ a1[(w1 >> 8) & 0xFF] ^ a0[w1 & 0xFF])
+
+        if len(data) & 1:
+            x = crc ^ data[-1]
+            crc = a3[x >> 24] ^ a2[(x >> 16) & 0xFF] ^ a1[(x >> 8) & 0xFF] ^ a0[x & 0xFF]
+
+        return crc
+
+    def _crc_numpy(self, data):
+        # word i of n is advanced n - i words: one table lookup per byte and one xor reduce
+        words = np.ascontiguousarray(data, '<u4')
+        n = len(words)
+        position, init = _Crc32PositionTables(n)
+        lanes = words.view(np.uint8).reshape(n, 4)
+        values = position[np.arange(n, 0, -1)[:, None], np.arange(4), lanes]
+        return int(np.bitwise_xor.reduce(values.ravel(), initial=init[n]))
+
     def _crc_ctypes(self, data):
-        uint32_array = (ctypes.c_uint32 * len(data))(*data)
-        length = len(data)
-        crc=self.crc_lib.crc32_core(uint32_array, length)
+        # the word buffer is passed to crc32_core as is, lists are converted once
+        words = np.ascontiguousarray(data, np.uint32)
+        crc=self.crc_lib.crc32_core(words.ctypes.data_as(ctypes.POINTER(ctypes.c_uint32)), len(words))
         return crc
 
     def __Crc32(self, data):
-        if self.platform == "Linux":
+        if self.crc_lib is not None:
             return self._crc_ctypes(data)
         else:
-            return self._crc_py(data)
+            return self._crc_numpy(data)
@@ -1,5 +1,8 @@
-from threading import Condition
-from typing import Any
+import asyncio
+import concurrent.futures
+
+from threading import Lock
+from typing import Any, Callable
 from enum import Enum
 
 """
@@ -27,78 +30,127 @@ class FutureResult:
     def __str__(self):
         return f"FutureResult(code={str(self.code)}, msg='{self.msg}', value={self.value})"
 
+"""
+" class Future
+" state changes are serialized by a lock; completed futures are read without locking.
+" waiters block on a one-shot event, a raw lock created held only when someone has to
+" wait and released on completion. each woken waiter releases it again, so all
+" waiters wake (threading.Event does the same but costs a Condition per future).
+"""
 class Future:
+    __slots__ = ("__state", "__value", "__msg", "__event", "__lock", "__callbacks")
+
     def __init__(self):
         self.__state = FutureState.DEFER
+        self.__value = None
         self.__msg = None
-        self.__condition = Condition()
+        self.__event = None
+        self.__lock = Lock()
+        self.__callbacks = None
     
     def GetResult(self, timeout: float = None):
-        with self.__condition:
-            return self.__WaitResult(timeout)
+        if not self.__Wait(timeout):
+            return FutureResult(FutureResult.FUTUTE_ERR_TIMEOUT, "future wait timeout")
+
+        state = self.__state
+        if state is FutureState.READY:
+            return FutureResult(FutureResult.FUTURE_SUCC, "success", self.__value)
+        elif state is FutureState.FAILED:
+            return FutureResult(FutureResult.FUTURE_ERR_FAILED, self.__msg)
+        else:
+            return FutureResult(FutureResult.FUTURE_ERR_UNKNOWN, "future state error:" + str(state))
 
     def Wait(self, timeout: float = None):
-        with self.__condition:
-            return self.__Wait(timeout)
+        return self.__Wait(timeout)
+
+    def Done(self):
+        return self.__state is not FutureState.DEFER
 
     def Ready(self, value):
-        with self.__condition:
-            ready = self.__Ready(value)
-            self.__condition.notify()
-            return ready
+        with self.__lock:
+            if self.__state is not FutureState.DEFER:
+                print("[Future] futrue state is not defer")
+                return False
+            self.__value = value
+            self.__state = FutureState.READY
+            callbacks = self.__callbacks
+            self.__callbacks = None
+            event = self.__event
+
+        if event is not None:
+            event.release()
+        self.__RunCallbacks(callbacks)
+        return True
 
     def Fail(self, reason: str):
-        with self.__condition:
-            fail = self.__Fail(reason)
-            self.__condition.notify()
-            return fail
+        with self.__lock:
+            if self.__state is not FutureState.DEFER:
+                print("[Future] futrue state is not DEFER")
+                return False
+            self.__msg = reason
+            self.__state = FutureState.FAILED
+            callbacks = self.__callbacks
+            self.__callbacks = None
+            event = self.__event
 
-    def __Wait(self, timeout: float = None):
-        if not self.__IsDeferred():
-            return True
-        try:
-            if timeout is None:
-                return self.__condition.wait()
+        if event is not None:
+            event.release()
+        self.__RunCallbacks(callbacks)
+        return True
+
+    def AddDoneCallback(self, callback: Callable):
+        # callback(future) runs in the thread completing the future, or immediately if already done
+        with self.__lock:
+            if self.__state is FutureState.DEFER:
+                if self.__callbacks is None:
+                    self.__callbacks = []
+                self.__callbacks.append(callback)
+                return
+        self.__RunCallbacks((callback,))
+
+    def ToConcurrentFuture(self):
+        cfuture = concurrent.futures.Future()
+        cfuture.set_running_or_notify_cancel()
+
+        def done(future: Future):
+            result = future.GetResult(0)
+            if result.code == FutureResult.FUTURE_SUCC:
+                cfuture.set_result(result.value)
             else:
-                return self.__condition.wait(timeout)
-        except:
-            print("[Future] future wait error")
-            return False
+                cfuture.set_exception(RuntimeError(result.msg))
 
-    def __WaitResult(self, timeout: float = None):
-        if not self.__Wait(timeout):
-            return FutureResult(FutureResult.FUTUTE_ERR_TIMEOUT, "future wait timeout")
+        self.AddDoneCallback(done)
+        return cfuture
 
-        if self.__IsReady():
-            return FutureResult(FutureResult.FUTURE_SUCC, "success", self.__value)
-        elif self.__IsFailed():
-            return FutureResult(FutureResult.FUTURE_ERR_FAILED, self.__msg)
-        else:
-            return FutureResult(FutureResult.FUTURE_ERR_UNKNOWN, "future state error:" + str(self.__state))
+    def ToAsyncioFuture(self, loop: asyncio.AbstractEventLoop = None):
+        if loop is None:
+            loop = asyncio.get_event_loop()
+        return asyncio.wrap_future(self.ToConcurrentFuture(), loop=loop)
 
-    def __Ready(self, value):
-        if not self.__IsDeferred():
-            print("[Future] futrue state is not defer")
-            return False
-        else:
-            self.__value = value
-            self.__state = FutureState.READY
+    def __Wait(self, timeout: float = None):
+        if self.__state is not FutureState.DEFER:
             return True
 
-    def __Fail(self, message: str):
-        if not self.__IsDeferred():
-            print("[Future] futrue state is not DEFER")
-            return False
-        else:
-            self.__msg = message
-            self.__state = FutureState.FAILED
+        with self.__lock:
+            if self.__state is not FutureState.DEFER:
+                return True
+            event = self.__event
+            if event is None:
+                event = Lock()
+                event.acquire()
+                self.__event = event
+
+        # callers pass deadlines already run out as negative timeouts, Lock.acquire rejects them
+        if event.acquire(True, -1 if timeout is None else max(0.0, timeout)):
+            event.release()
             return True
+        return False
 
-    def __IsDeferred(self):
-        return self.__state == FutureState.DEFER
-    
-    def __IsReady(self):
-        return self.__state == FutureState.READY
-    
-    def __IsFailed(self):
-        return self.__state == FutureState.FAILED
\ No newline at end of file
+    def __RunCallbacks(self, callbacks):
+        if not callbacks:
+            return
+        for callback in callbacks:
+            try:
+                callback(self)
+            except Exception as e:
+                print("[Future] done callback raise exception:", e)
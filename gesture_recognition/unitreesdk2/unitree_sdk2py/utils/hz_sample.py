@@ -1,24 +1,120 @@
 import time
+import threading
 from threading import Lock
-from .thread import RecurrentThread
+from .thread import RecurrentThread, TimingHistogram
 
+
+"""
+" log spaced latency bins in seconds, 8 per decade (x1.33), 1us .. 10s
+"""
+HZ_SAMPLE_LATENCY_EDGES = tuple(1e-6 * 10 ** (i / 8) for i in range(57))
+
+
+"""
+" class HZSample
+" event rate and latency meter for hot paths (channel handlers, rpc calls, frame loops).
+" every thread counts into its own cell, so Sample is one increment without a lock and
+" the cells are merged when read. Clear never writes the cells: it records a baseline
+" per cell that reads subtract. Sample counts an event, SampleLatency counts it and adds
+" its duration to a log histogram, Wrap times every call of a function.
+" GetRate, GetCount and GetSummary read on demand without a background thread. Start keeps
+" the old behaviour of printing the rate every interval from a RecurrentThread.
+"""
 class HZSample:
-    def __init__(self, interval: float = 1.0):
-        self.__count = 0
+    def __init__(self, interval: float = 1.0, edges: tuple = HZ_SAMPLE_LATENCY_EDGES):
         self.__inter = interval if interval > 0.0 else 1.0
-        self.__lock = Lock()
-        self.__thread = RecurrentThread(self.__inter, target=self.TimerFunc)
+        self.__edges = edges
+        self.__local = threading.local()
+        self.__cells = []
+        self.__cellsLock = Lock()
+        self.__thread = None
+
+        self.__rateTime = time.monotonic()
+        self.__rateCount = 0
 
     def Start(self):
-        self.__thread.Start()
+        if self.__thread is None:
+            self.GetRate()
+            self.__thread = RecurrentThread(self.__inter, target=self.TimerFunc)
+            self.__thread.Start()
+
+    def Stop(self):
+        if self.__thread is not None:
+            self.__thread.Wait()
+            self.__thread = None
 
     def Sample(self):
-        with self.__lock:
-            self.__count += 1
+        try:
+            self.__local.cell[0] += 1
+        except AttributeError:
+            self.__NewCell()[0] += 1
+
+    def SampleLatency(self, seconds: float):
+        try:
+            cell = self.__local.cell
+        except AttributeError:
+            cell = self.__NewCell()
+        cell[0] += 1
+        cell[1].Add(seconds)
+
+    def Wrap(self, func):
+        # func timed on every call, e.g. as a channel handler: ChannelSubscriber(...).Init(meter.Wrap(handler))
+        def Timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.SampleLatency(time.perf_counter() - start)
+        return Timed
+
+    def GetCount(self):
+        with self.__cellsLock:
+            return sum(cell[0] - cell[2] for cell in self.__cells)
+
+    def GetRate(self):
+        # events per second since the previous GetRate call (or since construction)
+        now = time.monotonic()
+        count = self.GetCount()
+        with self.__cellsLock:
+            elapsed = now - self.__rateTime
+            rate = (count - self.__rateCount) / elapsed if elapsed > 0.0 else 0.0
+            self.__rateTime = now
+            self.__rateCount = count
+        return rate
+
+    def GetSummary(self):
+        # merged latency histogram (seconds) with the total count and the current rate
+        histogram = TimingHistogram(self.__edges)
+        with self.__cellsLock:
+            for cell in self.__cells:
+                if cell[3] is None:
+                    histogram.Merge(cell[1])
+                else:
+                    since = cell[1].Copy()
+                    since.Subtract(cell[3])
+                    histogram.Merge(since)
+        summary = histogram.Summary()
+        summary["events"] = self.GetCount()
+        summary["rate"] = self.GetRate()
+        return summary
+
+    def Clear(self):
+        # owner threads keep counting into their cells, only the baselines move
+        with self.__cellsLock:
+            for cell in self.__cells:
+                cell[2] = cell[0]
+                cell[3] = cell[1].Copy()
+            self.__rateTime = time.monotonic()
+            self.__rateCount = 0
 
     def TimerFunc(self):
-        count = 0
-        with self.__lock:
-            count = self.__count
-            self.__count = 0
-        print("HZ: {}".format(count/self.__inter))
+        print("HZ: {}".format(self.GetRate()))
+
+    def __NewCell(self):
+        # [count, latency histogram, count at Clear, histogram at Clear]. the owner thread
+        # writes the first two, the baselines are written under the cells lock
+        cell = [0, TimingHistogram(self.__edges), 0, None]
+        self.__local.cell = cell
+        with self.__cellsLock:
+            self.__cells.append(cell)
+        return cell
@@ -5,6 +5,18 @@ os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = "hide" # Disable pygame welcome messa
 import pygame
 import time
 
+"""
+" wireless_remote uint8_t[40]: head[2], buttons uint16 (btn1, btn2), lx, rx, ry, L2, ly float, idle[16]
+"""
+_wirelessRemote = struct.Struct("<2xBB5f16x")
+
+# button bits of (btn2 << 8 | btn1), in the order of the old bit string decode
+_BUTTON_BITS = (
+  ("LT", 5), ("RT", 4), ("back", 3), ("start", 2), ("LB", 1), ("RB", 0),
+  ("left", 15), ("down", 14), ("right", 13), ("up", 12), ("Y", 11), ("X", 10), ("B", 9), ("A", 8),
+)
+_BUTTON_MASK = sum(1 << shift for name, shift in _BUTTON_BITS)
+
 class Button:
   def __init__(self) -> None:
     self.pressed = False
@@ -15,7 +27,6 @@ class Button:
     self.last_pressed_time = 0  # 上次按下时间
 
   def __call__(self, data) -> None:
-    current_time = time.perf_counter()
     # print('before',self.data)
 
     self.pressed = (data != 0)
@@ -25,6 +36,7 @@ class Button:
     # print('after',self.data)
             # 处理连续点击
     if self.on_pressed:
+        current_time = time.perf_counter()
         # print('on_pressed')
         # print('on_pressed current_time',current_time)
         # print('on_pressed last_pressed_time',self.last_pressed_time)
@@ -94,6 +106,10 @@ class Joystick:
     
     self.last_active_time = time.perf_counter()  # 最后一次活动时间
     self.inactive_timeout = 0.5  # 超时时间（单位：秒）
+
+    self._buttonBits = tuple((getattr(self, name), shift) for name, shift in _BUTTON_BITS)
+    self._remoteBytes = bytearray(_wirelessRemote.size)
+    self._remote = [0] * _wirelessRemote.size
   def update(self):
     """
     Update the current handle key based on the original data
@@ -110,37 +126,22 @@ class Joystick:
     Extract data from unitree_joystick
     wireless_remote: uint8_t[40]
     """
+    if not isinstance(wireless_remote, (bytes, bytearray, memoryview)):
+      wireless_remote = bytes(wireless_remote)
+    btn1, btn2, lx, rx, ry, l2, ly = _wirelessRemote.unpack(wireless_remote)
+
     # Buttons
-    button1 = [int(data) for data in f'{wireless_remote[2]:08b}']
-    button2 = [int(data) for data in f'{wireless_remote[3]:08b}']
-    self.LT(button1[2])
-    self.RT(button1[3])
-    self.back(button1[4])
-    self.start(button1[5])
-    self.LB(button1[6])
-    self.RB(button1[7])
-    self.left(button2[0])    
-    self.down(button2[1])
-    self.right(button2[2])
-    self.up(button2[3])
-    self.Y(button2[4])
-    self.X(button2[5])
-    self.B(button2[6])
-    self.A(button2[7])
+    keys = btn2 << 8 | btn1
+    for button, shift in self._buttonBits:
+      button((keys >> shift) & 1)
     # Axes
-    self.lx( struct.unpack('f', bytes(wireless_remote[4:8]))[0] )
-    self.rx( struct.unpack('f', bytes(wireless_remote[8:12]))[0] )
-    self.ry( struct.unpack('f', bytes(wireless_remote[12:16]))[0] )
-    self.ly( struct.unpack('f', bytes(wireless_remote[20:24]))[0] )
-    
-    
+    self.lx(lx)
+    self.rx(rx)
+    self.ry(ry)
+    self.ly(ly)
+
     # 检查是否有按键按下
-    if any([
-        self.LT.pressed, self.RT.pressed, self.back.pressed, self.start.pressed,
-        self.LB.pressed, self.RB.pressed, self.left.pressed, self.down.pressed,
-        self.right.pressed, self.up.pressed, self.Y.pressed, self.X.pressed,
-        self.B.pressed, self.A.pressed
-    ]):
+    if keys & _BUTTON_MASK:
         self.last_active_time = time.perf_counter()  # 更新最后一次活动时间
     elif time.perf_counter() - self.last_active_time > self.inactive_timeout:
         # 超过设定的超时时间未按下任何键，重置所有按键的点击计数
@@ -157,29 +158,19 @@ class Joystick:
         
   def combine(self):
     """
-    Merge data from Joystick to wireless_remote    
+    Merge data from Joystick to wireless_remote
+    Returns one persistent list, refilled by every call
     """
-    # prepare an empty list
-    wireless_remote = [0 for _ in range(40)]
-
     # Buttons
-    wireless_remote[2] = int(''.join([f'{key}' for key in [
-      0, 0, round(self.LT.data), round(self.RT.data), 
-      self.back.data, self.start.data, self.LB.data, self.RB.data,
-    ]]), 2)
-    wireless_remote[3] = int(''.join([f'{key}' for key in [
-      self.left.data, self.down.data, self.right.data, 
-      self.up.data, self.Y.data, self.X.data, self.B.data, self.A.data,
-    ]]), 2)
-
-    # Axes
-    sticks = [self.lx.data, self.rx.data, self.ry.data, self.ly.data]
-    packs = list(map(lambda x: struct.pack('f', x), sticks))
-    wireless_remote[4:8] = packs[0]
-    wireless_remote[8:12] = packs[1]
-    wireless_remote[12:16] = packs[2]
-    wireless_remote[20:24] = packs[3]
-    return wireless_remote
+    keys = 0
+    for button, shift in self._buttonBits:
+      keys |= (round(button.data) & 1) << shift
+
+    # Axes, L2 and the rest stay zero
+    _wirelessRemote.pack_into(self._remoteBytes, 0, keys & 0xFF, keys >> 8,
+                              self.lx.data, self.rx.data, self.ry.data, 0.0, self.ly.data)
+    self._remote[:] = self._remoteBytes
+    return self._remote
 
 class PyGameJoystick(Joystick):
   def __init__(self) -> None:
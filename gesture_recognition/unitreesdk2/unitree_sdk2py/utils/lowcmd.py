@@ -0,0 +1,188 @@
+import numpy as np
+
+from .crc import CRC
+from ..idl.default import unitree_go_msg_dds__LowCmd_, unitree_hg_msg_dds__LowCmd_
+from ..idl.unitree_go.msg.dds_ import LowCmd_
+from ..idl.unitree_hg.msg.dds_ import LowCmd_ as HGLowCmd_
+
+
+"""
+" numpy mirrors of the packed crc layouts in CRC (4 bytes aligned, little endian)
+"""
+#size 36
+MOTOR_CMD_DTYPE = np.dtype({
+    "names": ["mode", "q", "dq", "tau", "kp", "kd", "reserve"],
+    "formats": ["u1", "<f4", "<f4", "<f4", "<f4", "<f4", ("<u4", (3,))],
+    "offsets": [0, 4, 8, 12, 16, 20, 24],
+    "itemsize": 36})
+
+#size 812
+LOWCMD_DTYPE = np.dtype({
+    "names": ["head", "level_flag", "frame_reserve", "sn", "version", "bandwidth", "motor_cmd",
+              "bms_off", "bms_reserve", "wireless_remote", "led", "fan", "gpio", "reserve", "crc"],
+    "formats": [("u1", (2,)), "u1", "u1", ("<u4", (2,)), ("<u4", (2,)), "<u2", (MOTOR_CMD_DTYPE, (20,)),
+                "u1", ("u1", (3,)), ("u1", (40,)), ("u1", (12,)), ("u1", (2,)), "u1", "<u4", "<u4"],
+    "offsets": [0, 2, 3, 4, 12, 20, 24, 744, 745, 748, 788, 800, 802, 804, 808],
+    "itemsize": 812})
+
+#size 28
+HG_MOTOR_CMD_DTYPE = np.dtype({
+    "names": ["mode", "q", "dq", "tau", "kp", "kd", "reserve"],
+    "formats": ["u1", "<f4", "<f4", "<f4", "<f4", "<f4", "<u4"],
+    "offsets": [0, 4, 8, 12, 16, 20, 24],
+    "itemsize": 28})
+
+#size 1004
+HG_LOWCMD_DTYPE = np.dtype({
+    "names": ["mode_pr", "mode_machine", "motor_cmd", "reserve", "crc"],
+    "formats": ["u1", "u1", (HG_MOTOR_CMD_DTYPE, (35,)), ("<u4", (4,)), "<u4"],
+    "offsets": [0, 1, 4, 984, 1000],
+    "itemsize": 1004})
+
+
+"""
+" class LowCmdBuffer
+" persistent LowCmd_ kept as its packed crc image in one numpy buffer. the motor
+" fields are (20,) views into it, so commands are set with vector assignment:
+"     buf.q[:12] = target; buf.kp[:12] = 60.0
+" other fields through buf.data, e.g. buf.data["level_flag"] = 0xFF.
+" Crc runs over the buffer as is, ToLowCmd fills one persistent LowCmd_ for publishing.
+" ToLowCmd copies the motor commands every call, the other fields only when their bytes changed.
+"""
+class LowCmdBuffer:
+    def __init__(self, dtype: np.dtype = LOWCMD_DTYPE, sample=None):
+        self.__crc = CRC()
+        self.__raw = np.zeros(dtype.itemsize, np.uint8)
+        self.__words = self.__raw.view("<u4")[:-1]
+        self.__sample = unitree_go_msg_dds__LowCmd_() if sample is None else sample
+
+        self.data = self.__raw.view(dtype)
+        motor = self.data["motor_cmd"][0]
+        self.mode = motor["mode"]
+        self.q = motor["q"]
+        self.dq = motor["dq"]
+        self.tau = motor["tau"]
+        self.kp = motor["kp"]
+        self.kd = motor["kd"]
+
+        # bytes outside the per cycle motor fields and the crc, compared to skip unchanged fields
+        cycle = np.zeros(dtype.itemsize, bool)
+        motorDtype, motorOffset = dtype.fields["motor_cmd"][:2]
+        motorType = motorDtype.base
+        for i in range(len(self.q)):
+            for name in ("mode", "q", "dq", "tau", "kp", "kd"):
+                type, offset = motorType.fields[name][:2]
+                start = motorOffset + i * motorType.itemsize + offset
+                cycle[start:start + type.itemsize] = True
+        crcOffset = dtype.fields["crc"][1]
+        cycle[crcOffset:crcOffset + 4] = True
+        self.__otherIndex = np.flatnonzero(~cycle)
+        self.__otherBytes = None
+
+    def FromLowCmd(self, cmd: LowCmd_):
+        # load every field of a LowCmd_ into the buffer
+        self._Load(cmd, self.data[0])
+
+    def Crc(self):
+        # crc over the packed buffer, also stored in its crc field
+        crc = self.__crc.CrcWords(self.__words)
+        self.data["crc"] = crc
+        return crc
+
+    def ToLowCmd(self):
+        # the persistent LowCmd_ updated from the buffer, crc included. publish it as is
+        crc = self.Crc()
+        other = self.__raw[self.__otherIndex].tobytes()
+        if other != self.__otherBytes:
+            self._Fill(self.__sample, self.data[0])
+            self.__otherBytes = other
+        else:
+            self._ToMotors(self.__sample.motor_cmd)
+            self.__sample.crc = crc
+        return self.__sample
+
+    def GetBuffer(self):
+        # the packed image, 812 bytes for LowCmd_
+        return self.__raw
+
+    def _Load(self, cmd: LowCmd_, d: np.void):
+        d["head"] = cmd.head
+        d["level_flag"] = cmd.level_flag
+        d["frame_reserve"] = cmd.frame_reserve
+        d["sn"] = cmd.sn
+        d["version"] = cmd.version
+        d["bandwidth"] = cmd.bandwidth
+        self._FromMotors(cmd.motor_cmd)
+        d["motor_cmd"]["reserve"] = [m.reserve for m in cmd.motor_cmd]
+        d["bms_off"] = cmd.bms_cmd.off
+        d["bms_reserve"] = cmd.bms_cmd.reserve
+        d["wireless_remote"] = cmd.wireless_remote
+        d["led"] = cmd.led
+        d["fan"] = cmd.fan
+        d["gpio"] = cmd.gpio
+        d["reserve"] = cmd.reserve
+        d["crc"] = cmd.crc
+
+    def _Fill(self, cmd: LowCmd_, d: np.void):
+        cmd.head = d["head"].tolist()
+        cmd.level_flag = int(d["level_flag"])
+        cmd.frame_reserve = int(d["frame_reserve"])
+        cmd.sn = d["sn"].tolist()
+        cmd.version = d["version"].tolist()
+        cmd.bandwidth = int(d["bandwidth"])
+        self._ToMotors(cmd.motor_cmd)
+        for m, reserve in zip(cmd.motor_cmd, d["motor_cmd"]["reserve"].tolist()):
+            m.reserve = reserve
+        cmd.bms_cmd.off = int(d["bms_off"])
+        cmd.bms_cmd.reserve = d["bms_reserve"].tolist()
+        cmd.wireless_remote = d["wireless_remote"].tolist()
+        cmd.led = d["led"].tolist()
+        cmd.fan = d["fan"].tolist()
+        cmd.gpio = int(d["gpio"])
+        cmd.reserve = int(d["reserve"])
+        cmd.crc = int(d["crc"])
+
+    def _FromMotors(self, motors: list):
+        count = len(self.q)
+        self.mode[:] = [m.mode for m in motors[:count]]
+        self.q[:] = [m.q for m in motors[:count]]
+        self.dq[:] = [m.dq for m in motors[:count]]
+        self.tau[:] = [m.tau for m in motors[:count]]
+        self.kp[:] = [m.kp for m in motors[:count]]
+        self.kd[:] = [m.kd for m in motors[:count]]
+
+    def _ToMotors(self, motors: list):
+        # one tolist per field, values are the float32 ones the crc was computed over
+        for m, mode, q, dq, tau, kp, kd in zip(motors, self.mode.tolist(), self.q.tolist(), self.dq.tolist(),
+                                                self.tau.tolist(), self.kp.tolist(), self.kd.tolist()):
+            m.mode = mode
+            m.q = q
+            m.dq = dq
+            m.tau = tau
+            m.kp = kp
+            m.kd = kd
+
+
+"""
+" class HGLowCmdBuffer. LowCmdBuffer for unitree_hg LowCmd_ (35 motors, 1004 bytes)
+"""
+class HGLowCmdBuffer(LowCmdBuffer):
+    def __init__(self):
+        super().__init__(HG_LOWCMD_DTYPE, unitree_hg_msg_dds__LowCmd_())
+
+    def _Load(self, cmd: HGLowCmd_, d: np.void):
+        d["mode_pr"] = cmd.mode_pr
+        d["mode_machine"] = cmd.mode_machine
+        self._FromMotors(cmd.motor_cmd)
+        d["motor_cmd"]["reserve"] = [m.reserve for m in cmd.motor_cmd]
+        d["reserve"] = cmd.reserve
+        d["crc"] = cmd.crc
+
+    def _Fill(self, cmd: HGLowCmd_, d: np.void):
+        cmd.mode_pr = int(d["mode_pr"])
+        cmd.mode_machine = int(d["mode_machine"])
+        self._ToMotors(cmd.motor_cmd)
+        for m, reserve in zip(cmd.motor_cmd, d["motor_cmd"]["reserve"].tolist()):
+            m.reserve = reserve
+        cmd.reserve = d["reserve"].tolist()
+        cmd.crc = int(d["crc"])
@@ -0,0 +1,119 @@
+from typing import Any, List
+
+import numpy as np
+
+
+"""
+" PointField_ datatype (sensor_msgs PointField_Constants) -> numpy type
+"""
+POINT_FIELD_TYPES = {
+    1: "i1",    # INT8_
+    2: "u1",    # UINT8_
+    3: "i2",    # INT16_
+    4: "u2",    # UINT16_
+    5: "i4",    # INT32_
+    6: "u4",    # UINT32_
+    7: "f4",    # FLOAT32_
+    8: "f8",    # FLOAT64_
+}
+
+
+def _Buffer(data: Any, dtype: Any):
+    # bytes-like sequences are wrapped without a copy, python lists are converted once in C
+    if isinstance(data, np.ndarray):
+        return data.view(dtype) if data.dtype != dtype else data
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return np.frombuffer(data, dtype)
+    return np.asarray(data, dtype)
+
+
+"""
+" function PointCloudDtype. numpy structured dtype of one point, built from the
+" PointField_ descriptors. fields with count > 1 become subarrays.
+"""
+def PointCloudDtype(fields: List[Any], pointStep: int, bigEndian: bool = False):
+    order = ">" if bigEndian else "<"
+    names, formats, offsets = [], [], []
+    for field in fields:
+        type = POINT_FIELD_TYPES.get(field.datatype)
+        if type is None:
+            raise Exception("unknown point field datatype: " + str(field.datatype))
+        names.append(field.name)
+        formats.append((order + type, (field.count,)) if field.count > 1 else order + type)
+        offsets.append(field.offset)
+    return np.dtype({"names": names, "formats": formats, "offsets": offsets, "itemsize": pointStep})
+
+
+"""
+" function PointCloudArray. structured view of PointCloud2_ data, shape (height, width).
+" access fields by name: points["x"], points["intensity"]. row_step padding is
+" skipped by strides, nothing is copied when data is bytes-like.
+"""
+def PointCloudArray(msg: Any):
+    dtype = PointCloudDtype(msg.fields, msg.point_step, msg.is_bigendian)
+    data = _Buffer(msg.data, np.uint8)
+    if msg.height == 0 or msg.width == 0:
+        return np.zeros((msg.height, msg.width), dtype)
+
+    return np.ndarray((msg.height, msg.width), dtype, data, 0, (msg.row_step, msg.point_step))
+
+
+"""
+" function PointCloudXYZ. (N, 3) array of the named coordinate fields.
+" a view when they are adjacent fields of the same type and rows are unpadded,
+" a copy otherwise. removeNan drops points with a nan coordinate (copy).
+"""
+def PointCloudXYZ(msg: Any, names: tuple = ("x", "y", "z"), removeNan: bool = False):
+    points = PointCloudArray(msg)
+    fields = points.dtype.fields
+    types = [fields[name][0] for name in names]
+    offsets = [fields[name][1] for name in names]
+    size = types[0].itemsize
+
+    adjacent = all(t == types[0] and o == offsets[0] + i * size for i, (t, o) in enumerate(zip(types, offsets)))
+    unpadded = msg.row_step == msg.width * msg.point_step or msg.height <= 1
+    count = msg.height * msg.width
+
+    if adjacent and unpadded and count > 0:
+        xyz = np.ndarray((count, len(names)), types[0], _Buffer(msg.data, np.uint8), offsets[0], (msg.point_step, size))
+    else:
+        flat = points.reshape(-1)
+        xyz = np.stack([flat[name] for name in names], axis=1)
+
+    if removeNan:
+        xyz = xyz[~np.isnan(xyz).any(axis=1)]
+    return xyz
+
+
+"""
+" class HeightMapGrid
+" HeightMap_ as a (height, width) float32 grid. cell (row, col) covers
+" x = origin[0] + col * resolution, y = origin[1] + row * resolution.
+"""
+class HeightMapGrid:
+    def __init__(self, msg: Any):
+        self.stamp = msg.stamp
+        self.frameId = msg.frame_id
+        self.resolution = float(msg.resolution)
+        self.origin = np.asarray(msg.origin, np.float32)
+        self.grid = _Buffer(msg.data, np.float32)[:msg.height * msg.width].reshape(msg.height, msg.width)
+
+    def CellToWorld(self, rows: Any, cols: Any):
+        # cell index -> (x, y) of the cell corner, vectorized
+        x = self.origin[0] + np.asarray(cols) * self.resolution
+        y = self.origin[1] + np.asarray(rows) * self.resolution
+        return x, y
+
+    def WorldToCell(self, x: Any, y: Any):
+        # (x, y) -> (row, col) index arrays, -1 outside the map, vectorized
+        cols = np.floor((np.asarray(x) - self.origin[0]) / self.resolution).astype(np.int64)
+        rows = np.floor((np.asarray(y) - self.origin[1]) / self.resolution).astype(np.int64)
+        outside = (rows < 0) | (rows >= self.grid.shape[0]) | (cols < 0) | (cols >= self.grid.shape[1])
+        return np.where(outside, -1, rows), np.where(outside, -1, cols)
+
+    def HeightAt(self, x: Any, y: Any):
+        # heights at world points, nan outside the map
+        rows, cols = self.WorldToCell(x, y)
+        outside = rows < 0
+        heights = self.grid[np.where(outside, 0, rows), np.where(outside, 0, cols)]
+        return np.where(outside, np.float32(np.nan), heights)
@@ -0,0 +1,204 @@
+import time
+from operator import attrgetter
+from typing import Any, List
+
+import numpy as np
+
+
+"""
+" imu fields of IMUState_ (unitree_go and unitree_hg), packed into one float32 row of 13
+"""
+IMU_FIELDS = [("quaternion", (4,)), ("gyroscope", (3,)), ("accelerometer", (3,)), ("rpy", (3,))]
+
+"""
+" float fields of MotorState_ kept by LowStateRing by default. both unitree_go and unitree_hg have them
+"""
+MOTOR_FIELDS = ("q", "dq", "ddq", "tau_est")
+
+"""
+" float fields of SportModeState_, packed into one float32 row
+"""
+SPORT_FIELDS = [("position", (3,)), ("velocity", (3,)), ("yaw_speed", ()), ("body_height", ()), ("progress", ()),
+                ("foot_raise_height", ()), ("range_obstacle", (4,)), ("foot_position_body", (4, 3)),
+                ("foot_speed_body", (4, 3))]
+
+
+def _ImuRow(imu: Any):
+    return (*imu.quaternion, *imu.gyroscope, *imu.accelerometer, *imu.rpy)
+
+
+"""
+" class TelemetryRing
+" preallocated struct-of-arrays ring buffer. every column is one numpy array with
+" the sample index first, e.g. q[T,20]. subclasses convert a batch of samples into
+" whole column blocks, so the per-sample python is one tuple per struct and the
+" copy into the ring is one numpy assignment per column.
+"
+" fields are named slices of a column (q is motor[..., 0], gyroscope is imu[:, 4:7]).
+" Get returns a chronological copy, oldest first.
+"""
+class TelemetryRing:
+    def __init__(self, capacity: int, columns: dict, fields: dict = None):
+        # columns: name -> (shape of one sample, dtype). fields: name -> (column, index, shape)
+        self.__capacity = max(1, capacity)
+        self.__columns = {"time": np.zeros(self.__capacity, np.float64)}
+        for name, (shape, dtype) in columns.items():
+            self.__columns[name] = np.zeros((self.__capacity,) + tuple(shape), dtype)
+        self.__fields = {} if fields is None else fields
+        self.__next = 0
+        self.__count = 0
+
+    def Append(self, sample: Any, stamp: float = None):
+        self.Extend([sample], None if stamp is None else [stamp])
+
+    def Extend(self, samples: List[Any], stamps: List[float] = None):
+        # stamps default to the current time.time() for the whole batch
+        n = len(samples)
+        if n == 0:
+            return
+
+        blocks = self._Convert(samples)
+        if stamps is None:
+            blocks["time"] = np.full(n, time.time())
+        else:
+            blocks["time"] = np.asarray(stamps, np.float64)
+
+        # a batch larger than the ring keeps its newest samples
+        if n > self.__capacity:
+            blocks = {name: block[n - self.__capacity:] for name, block in blocks.items()}
+            n = self.__capacity
+
+        rows = (self.__next + np.arange(n)) % self.__capacity
+        for name, block in blocks.items():
+            self.__columns[name][rows] = block
+
+        self.__next = (self.__next + n) % self.__capacity
+        self.__count = min(self.__capacity, self.__count + n)
+
+    def Get(self, name: str, last: int = None):
+        # column or field of the last samples (all by default), oldest first
+        count = self.__count if last is None else min(last, self.__count)
+        rows = (self.__next - count + np.arange(count)) % self.__capacity
+
+        field = self.__fields.get(name)
+        if field is None:
+            return self.__columns[name][rows]
+
+        column, index, shape = field
+        return self.__columns[column][rows][index].reshape((count,) + tuple(shape))
+
+    def GetNames(self):
+        return list(self.__columns) + list(self.__fields)
+
+    def GetCount(self):
+        return self.__count
+
+    def GetCapacity(self):
+        return self.__capacity
+
+    def Clear(self):
+        self.__next = 0
+        self.__count = 0
+
+    def _Convert(self, samples: List[Any]):
+        # dict column name -> block with len(samples) rows
+        raise NotImplementedError
+
+
+"""
+" function TelemetryFields. named slices of a packed row column, see TelemetryRing
+"""
+def TelemetryFields(column: str, layout: list, fields: dict = None):
+    fields = {} if fields is None else fields
+    start = 0
+    for name, shape in layout:
+        width = int(np.prod(shape, dtype=np.int64))
+        fields[name] = (column, np.s_[:, start:start + width], shape)
+        start += width
+    return fields, start
+
+
+"""
+" class IMUStateRing. IMUState_ of unitree_go or unitree_hg
+"""
+class IMUStateRing(TelemetryRing):
+    def __init__(self, capacity: int):
+        fields, width = TelemetryFields("imu", IMU_FIELDS)
+        super().__init__(capacity, {"imu": ((width,), np.float32)}, fields)
+
+    def _Convert(self, samples: List[Any]):
+        return {"imu": np.array([_ImuRow(s) for s in samples], np.float32)}
+
+
+"""
+" class LowStateRing
+" LowState_ of unitree_go (motorCount 20) or unitree_hg (motorCount 35).
+" columns: tick[T], motor[T,motorCount,len(motorFields)], imu[T,13]
+" fields: q[T,motorCount], dq, ddq, tau_est (the motorFields), quaternion[T,4], gyroscope, accelerometer, rpy
+"""
+class LowStateRing(TelemetryRing):
+    def __init__(self, capacity: int, motorCount: int = 20, motorFields: tuple = MOTOR_FIELDS):
+        self.__motorCount = motorCount
+        self.__motorFieldCount = len(motorFields)
+        self.__motorGetters = [attrgetter(name) for name in motorFields]
+
+        fields, width = TelemetryFields("imu", IMU_FIELDS)
+        for i, name in enumerate(motorFields):
+            fields[name] = ("motor", np.s_[..., i], (motorCount,))
+
+        super().__init__(capacity, {
+            "tick": ((), np.uint32),
+            "motor": ((motorCount, len(motorFields)), np.float32),
+            "imu": ((width,), np.float32),
+        }, fields)
+
+    def _Convert(self, samples: List[Any]):
+        n = len(samples)
+        count = self.__motorCount
+
+        # one field at a time: a tuple per motor (20-35 per sample) costs more in gc than the
+        # ring saves. fromiter into float64 (python floats as they are), cast in the assignment
+        motors = [m for s in samples for m in s.motor_state[:count]]
+        motor = np.empty((n, count, self.__motorFieldCount), np.float32)
+        for i, getter in enumerate(self.__motorGetters):
+            motor[..., i] = np.fromiter(map(getter, motors), np.float64, n * count).reshape(n, count)
+        return {
+            "tick": np.fromiter((s.tick for s in samples), np.uint32, n),
+            "motor": motor,
+            "imu": np.array([_ImuRow(s.imu_state) for s in samples], np.float32),
+        }
+
+
+"""
+" class SportModeStateRing
+" SportModeState_ of unitree_go.
+" columns: stamp[T] (seconds), mode[T], gait_type[T], foot_force[T,4], sport[T,38], imu[T,13]
+" fields: position[T,3], velocity[T,3], yaw_speed[T], body_height, progress, foot_raise_height,
+"         range_obstacle[T,4], foot_position_body[T,4,3], foot_speed_body[T,4,3], plus the imu fields
+"""
+class SportModeStateRing(TelemetryRing):
+    def __init__(self, capacity: int):
+        fields, imuWidth = TelemetryFields("imu", IMU_FIELDS)
+        fields, sportWidth = TelemetryFields("sport", SPORT_FIELDS, fields)
+
+        super().__init__(capacity, {
+            "stamp": ((), np.float64),
+            "mode": ((), np.uint8),
+            "gait_type": ((), np.uint8),
+            "foot_force": ((4,), np.int16),
+            "sport": ((sportWidth,), np.float32),
+            "imu": ((imuWidth,), np.float32),
+        }, fields)
+
+    def _Convert(self, samples: List[Any]):
+        n = len(samples)
+        sport = [(*s.position, *s.velocity, s.yaw_speed, s.body_height, s.progress, s.foot_raise_height,
+                  *s.range_obstacle, *s.foot_position_body, *s.foot_speed_body) for s in samples]
+        return {
+            "stamp": np.fromiter((s.stamp.sec + s.stamp.nanosec * 1e-9 for s in samples), np.float64, n),
+            "mode": np.fromiter((s.mode for s in samples), np.uint8, n),
+            "gait_type": np.fromiter((s.gait_type for s in samples), np.uint8, n),
+            "foot_force": np.array([s.foot_force for s in samples], np.int16),
+            "sport": np.array(sport, np.float32),
+            "imu": np.array([_ImuRow(s.imu_state) for s in samples], np.float32),
+        }
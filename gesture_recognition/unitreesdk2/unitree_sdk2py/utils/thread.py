@@ -3,11 +3,108 @@ import os
 import errno
 import ctypes
 import struct
+import time
 import threading
+from bisect import bisect_right
+from threading import Lock
 
 from .future import Future
 from .timerfd import *
 
+
+"""
+" default histogram bin edges in seconds: 10us .. 50ms
+"""
+TIMING_HISTOGRAM_EDGES = (0.00001, 0.00002, 0.00005, 0.0001, 0.0002, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05)
+
+_timerfdExpirations = struct.Struct("=Q")
+
+
+"""
+" class TimingHistogram
+" counts durations into fixed bins, counts[i] is the count below edges[i] and the last
+" bin everything above. count, mean and max are exact, percentiles are bin upper edges.
+"""
+class TimingHistogram:
+    def __init__(self, edges: tuple = TIMING_HISTOGRAM_EDGES):
+        self.__edges = tuple(edges)
+        self.__counts = [0] * (len(self.__edges) + 1)
+        self.__count = 0
+        self.__sum = 0.0
+        self.__max = 0.0
+
+    def Add(self, value: float):
+        self.__counts[bisect_right(self.__edges, value)] += 1
+        self.__count += 1
+        self.__sum += value
+        if value > self.__max:
+            self.__max = value
+
+    def Clear(self):
+        self.__counts = [0] * (len(self.__edges) + 1)
+        self.__count = 0
+        self.__sum = 0.0
+        self.__max = 0.0
+
+    def Merge(self, other: "TimingHistogram"):
+        # add the counts of a histogram with the same edges
+        for i, count in enumerate(other.__counts):
+            self.__counts[i] += count
+        self.__count += other.__count
+        self.__sum += other.__sum
+        if other.__max > self.__max:
+            self.__max = other.__max
+
+    def Copy(self):
+        # snapshot, safe against the owner's Add up to a sample in flight
+        other = TimingHistogram(self.__edges)
+        other.__counts = list(self.__counts)
+        other.__count = self.__count
+        other.__sum = self.__sum
+        other.__max = self.__max
+        return other
+
+    def Subtract(self, other: "TimingHistogram"):
+        # remove an earlier snapshot of this histogram (same edges), leaves what was added since.
+        # the max is only known when it came after the snapshot, else the top bin's upper edge
+        top = -1
+        for i, count in enumerate(other.__counts):
+            self.__counts[i] = max(0, self.__counts[i] - count)
+        for i, count in enumerate(self.__counts):
+            if count > 0:
+                top = i
+        self.__count = max(0, self.__count - other.__count)
+        self.__sum = max(0.0, self.__sum - other.__sum)
+        if top < 0:
+            self.__max = 0.0
+        elif top < len(self.__edges) and bisect_right(self.__edges, self.__max) != top:
+            self.__max = self.__edges[top]
+
+    def Percentile(self, percent: float):
+        # upper edge of the bin holding the percentile, max for the last bin
+        if self.__count == 0:
+            return 0.0
+        rank = self.__count * percent / 100.0
+        seen = 0
+        for i, count in enumerate(self.__counts):
+            seen += count
+            if count > 0 and seen >= rank:
+                return min(self.__edges[i], self.__max) if i < len(self.__edges) else self.__max
+        return self.__max
+
+    def Summary(self):
+        return {
+            "count": self.__count,
+            "mean": self.__sum / self.__count if self.__count else 0.0,
+            "max": self.__max,
+            "p50": self.Percentile(50),
+            "p95": self.Percentile(95),
+            "p99": self.Percentile(99),
+            "edges": self.__edges,
+            "counts": list(self.__counts),
+        }
+
+
 class Thread(Future):
     def __init__(self, target = None, name = None, args = (), kwargs = None):
         super().__init__()
@@ -34,13 +131,39 @@ class Thread(Future):
             info = sys.exc_info() 
             self.Fail(f"[Thread] target func raise exception: name={info[0].__name__}, args={str(info[1].args)}")
 
+"""
+" class RecurrentThread
+" calls target every interval seconds on a CLOCK_MONOTONIC timerfd. the start lateness of
+" every iteration (against its ideal tick) and its execution time go into histograms, timer
+" expirations beyond one per iteration are counted as missed ticks, see GetStats.
+" priority sets SCHED_FIFO with that priority, cpus pins the thread to these cpus. both are
+" applied by the thread itself and only warned about when not permitted.
+"
+" interval None or <= 0 calls target as fast as possible. the loop yields the gil and cpu
+" (sched_yield) every yieldEvery iterations, or with spinBudget after spinning that many
+" seconds. yieldEvery 0 without spinBudget never yields. Wait stops it after the current
+" call. only iterations and exceptions are counted in this mode.
+"""
 class RecurrentThread(Thread):
-    def __init__(self, interval: float = 1.0, target = None, name = None, args = (), kwargs = None):
+    def __init__(self, interval: float = 1.0, target = None, name = None, args = (), kwargs = None,
+                 priority: int = None, cpus: list = None, yieldEvery: int = 1, spinBudget: float = None):
         self.__quit = False
         self.__inter = interval
         self.__loopTarget = target
         self.__loopArgs = args
         self.__loopKwargs = {} if kwargs is None else kwargs
+        self.__priority = priority
+        self.__cpus = cpus
+        self.__yieldEvery = yieldEvery
+        self.__spinBudget = spinBudget
+
+        self.__statsLock = Lock()
+        self.__lateness = TimingHistogram()
+        self.__execution = TimingHistogram()
+        self.__iterations = 0
+        self.__missed = 0
+        self.__exceptions = 0
+        self.__lastException = None
 
         if interval is None or interval <= 0.0:
             super().__init__(target=self.__LoopFunc_0, name=name)
@@ -51,33 +174,110 @@ class RecurrentThread(Thread):
         self.__quit = True
         super().Wait(timeout)
 
+    def GetStats(self):
+        # lateness and execution in seconds
+        with self.__statsLock:
+            return {
+                "interval": self.__inter,
+                "iterations": self.__iterations,
+                "missed": self.__missed,
+                "exceptions": self.__exceptions,
+                "last_exception": self.__lastException,
+                "lateness": self.__lateness.Summary(),
+                "execution": self.__execution.Summary(),
+            }
+
+    def ClearStats(self):
+        with self.__statsLock:
+            self.__lateness.Clear()
+            self.__execution.Clear()
+            self.__iterations = 0
+            self.__missed = 0
+            self.__exceptions = 0
+            self.__lastException = None
+
+    def __SetScheduling(self):
+        # pid 0 is the calling thread
+        if self.__cpus is not None:
+            try:
+                os.sched_setaffinity(0, self.__cpus)
+            except (OSError, AttributeError) as e:
+                print("[RecurrentThread] set cpu affinity error:", e)
+
+        if self.__priority is not None:
+            try:
+                os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(self.__priority))
+            except (OSError, AttributeError) as e:
+                print("[RecurrentThread] set SCHED_FIFO error:", e)
+
+    def __RunTarget(self):
+        try:
+            self.__loopTarget(*self.__loopArgs, **self.__loopKwargs)
+        except:
+            info = sys.exc_info()
+            msg = f"name={info[0].__name__}, args={str(info[1].args)}"
+            with self.__statsLock:
+                self.__exceptions += 1
+                self.__lastException = msg
+            print(f"[RecurrentThread] target func raise exception: {msg}")
+
     def __LoopFunc(self):
-        # clock type CLOCK_MONOTONIC = 1
+        self.__SetScheduling()
+
+        # clock type CLOCK_MONOTONIC = 1, the clock of time.monotonic
         tfd = timerfd_create(1, 0)
         spec = itimerspec.from_seconds(self.__inter, self.__inter)
+        start = time.monotonic()
         timerfd_settime(tfd, 0, ctypes.byref(spec), None)
 
+        inter = self.__inter
+        tick = 0
         while not self.__quit:
-            try:
-                self.__loopTarget(*self.__loopArgs, **self.__loopKwargs)
-            except:
-                info = sys.exc_info()
-                print(f"[RecurrentThread] target func raise exception: name={info[0].__name__}, args={str(info[1].args)}")
+            begin = time.monotonic()
+            self.__RunTarget()
+            end = time.monotonic()
 
             try:
-                buf = os.read(tfd, 8)
-                # print(struct.unpack("Q", buf)[0])
+                expirations = _timerfdExpirations.unpack(os.read(tfd, 8))[0]
             except OSError as e:
                 if e.errno != errno.EAGAIN:
                     raise e
+                expirations = 1
+
+            with self.__statsLock:
+                self.__lateness.Add(max(0.0, begin - (start + tick * inter)))
+                self.__execution.Add(end - begin)
+                self.__iterations += 1
+                self.__missed += expirations - 1
+            tick += expirations
 
         os.close(tfd)
     
     def __LoopFunc_0(self):
+        self.__SetScheduling()
+
+        yieldEvery = self.__yieldEvery
+        spinBudget = self.__spinBudget
+        monotonic = time.monotonic
+
+        count = 0
+        spinStart = monotonic()
         while not self.__quit:
-            try:
-                self.__loopTarget(*self.__args, **self.__kwargs)
-            except:
-                info = sys.exc_info() 
-                print(f"[RecurrentThread] target func raise exception: name={info[0].__name__}, args={str(info[1].args)}")
+            self.__RunTarget()
+
+            count += 1
+            if spinBudget is not None:
+                if monotonic() - spinStart >= spinBudget:
+                    os.sched_yield()
+                    spinStart = monotonic()
+            elif yieldEvery and count % yieldEvery == 0:
+                os.sched_yield()
+
+            # publish the count in batches, keeps the tight loop free of the stats lock
+            if count & 0xFF == 0:
+                with self.__statsLock:
+                    self.__iterations += 0x100
+
+        with self.__statsLock:
+            self.__iterations += count & 0xFF
 
@@ -0,0 +1,107 @@
+import time
+
+import numpy as np
+
+from ..idl.unitree_go.msg.dds_ import WirelessController_
+
+
+"""
+" WirelessController_.keys bit order, bit i is WIRELESS_CONTROLLER_KEYS[i]
+"""
+WIRELESS_CONTROLLER_KEYS = ("R1", "L1", "start", "select", "R2", "L2", "F1", "F2",
+                            "A", "B", "X", "Y", "up", "right", "down", "left")
+WIRELESS_CONTROLLER_KEY_MASK = {name: 1 << i for i, name in enumerate(WIRELESS_CONTROLLER_KEYS)}
+
+# axes vector order
+WIRELESS_CONTROLLER_AXES = ("lx", "ly", "rx", "ry")
+
+
+def KeyMask(keys):
+    # int mask, a key name or an iterable of key names to a keys bitmask
+    if isinstance(keys, int):
+        return keys
+    if isinstance(keys, str):
+        return WIRELESS_CONTROLLER_KEY_MASK[keys]
+    mask = 0
+    for name in keys:
+        mask |= WIRELESS_CONTROLLER_KEY_MASK[name]
+    return mask
+
+
+def KeyNames(mask: int):
+    # key names of the bits set in mask
+    return [name for i, name in enumerate(WIRELESS_CONTROLLER_KEYS) if mask >> i & 1]
+
+
+"""
+" class WirelessControllerState
+" latest WirelessController_ as a keys bitmask and a float32 axes vector (lx, ly, rx, ry).
+" Update computes the pressed and released edges against the previous keys in one xor and
+" calls only the callbacks registered for keys with an edge, as callback(state, edges) with
+" edges the pressed (or released) bits of its mask. Update is usable as a ChannelSubscriber
+" handler, callbacks then run in the channel thread.
+"""
+class WirelessControllerState:
+    def __init__(self):
+        self.keys = 0
+        self.pressed = 0
+        self.released = 0
+        self.axes = np.zeros(len(WIRELESS_CONTROLLER_AXES), np.float32)
+        self.stamp = 0.0
+
+        # (mask, callback) tuples, replaced as a whole so Update never sees a partial list
+        self.__onPressed = ()
+        self.__onReleased = ()
+        self.__mask = 0
+
+    def OnPressed(self, keys, callback):
+        self.__onPressed = self.__onPressed + ((KeyMask(keys), callback),)
+        self.__UpdateMask()
+
+    def OnReleased(self, keys, callback):
+        self.__onReleased = self.__onReleased + ((KeyMask(keys), callback),)
+        self.__UpdateMask()
+
+    def Remove(self, callback):
+        self.__onPressed = tuple(item for item in self.__onPressed if item[1] != callback)
+        self.__onReleased = tuple(item for item in self.__onReleased if item[1] != callback)
+        self.__UpdateMask()
+
+    def Update(self, msg: WirelessController_):
+        keys = msg.keys
+        changed = keys ^ self.keys
+        self.pressed = pressed = changed & keys
+        self.released = released = changed & self.keys
+        self.keys = keys
+
+        axes = self.axes
+        axes[0] = msg.lx
+        axes[1] = msg.ly
+        axes[2] = msg.rx
+        axes[3] = msg.ry
+        self.stamp = time.monotonic()
+
+        if changed & self.__mask:
+            if pressed:
+                for mask, callback in self.__onPressed:
+                    if pressed & mask:
+                        callback(self, pressed & mask)
+            if released:
+                for mask, callback in self.__onReleased:
+                    if released & mask:
+                        callback(self, released & mask)
+
+    def IsDown(self, keys):
+        # True when all keys are held
+        mask = KeyMask(keys)
+        return self.keys & mask == mask
+
+    def GetKeys(self):
+        # names of the held keys
+        return KeyNames(self.keys)
+
+    def __UpdateMask(self):
+        mask = 0
+        for item in self.__onPressed + self.__onReleased:
+            mask |= item[0]
+        self.__mask = mask